@@ -0,0 +1,1037 @@
+"""Benchmarks for the internship search tracking tool.
+
+Run from the session_1 directory:
+
+    python benchmarks.py ingest --rows 10000
+    python benchmarks.py analytics --rows 1000 10000 100000
+    python benchmarks.py startup --runs 5
+    python benchmarks.py memory --rows 100000 --chunksize 10000
+    python benchmarks.py concurrency --processes 8 --rows 200
+    python benchmarks.py updates --rows 50000 --updates 200
+    python benchmarks.py enrichment --rows 2000 --concurrency 16
+    python benchmarks.py metrics --rows 20000 --updates 200 --runs 5
+    python benchmarks.py snapshot --rows 100000 --updates 200
+    python benchmarks.py entities --rows 100000 --companies 20000
+    python benchmarks.py service --rows 100000 --students 4
+    python benchmarks.py batch --rows 20000 --students 8 --processes 4
+    python benchmarks.py queries --rows 300000
+    python benchmarks.py reports --rows 100000
+
+The suite runs the main tracker operations on seeded synthetic data at
+several scales, stores the results and compares them with an earlier run:
+
+    python benchmarks.py suite --scales 1k 100k --save baseline
+    python benchmarks.py suite --scales 1k 100k --save candidate --compare baseline
+"""
+import argparse
+import datetime
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+
+from tracker_synthetic import SyntheticData, populate
+from tracking_tool import InternshipSearchTracker
+
+def engagement_keys(rows, count, seed=0):
+    """Return the (contact name, company) of the first ``count`` of ``rows`` synthetic engagements."""
+    engagements = itertools.islice(SyntheticData(seed).engagements(rows), count)
+    return [(engagement["Contact Name"], engagement["Company"]) for engagement in engagements]
+
+
+def quiet_tracker(data_dir, backend="csv", **storage_options):
+    """Create a tracker that doesn't render console output."""
+    tracker = InternshipSearchTracker(data_dir=data_dir, backend=backend, **storage_options)
+    tracker.console.quiet = True
+    return tracker
+
+
+def bench_ingest(rows, backend="csv"):
+    """Compare per-row add_engagement against the add_engagements bulk API.
+
+    Returns:
+        dict: Rows per second for each approach
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        tracker = quiet_tracker(os.path.join(tmp, "single"), backend)
+        start = time.perf_counter()
+        for engagement in SyntheticData().engagements(rows):
+            tracker.add_engagement(engagement)
+        results["add_engagement"] = rows / (time.perf_counter() - start)
+
+        tracker = quiet_tracker(os.path.join(tmp, "bulk"), backend)
+        start = time.perf_counter()
+        tracker.add_engagements(SyntheticData().engagements(rows))
+        results["add_engagements"] = rows / (time.perf_counter() - start)
+    return results
+
+
+def bench_analytics(row_counts, backend="csv"):
+    """Time compute_analytics for engagement tables of increasing size.
+
+    Companies are generated at a fifth of the engagement count (see ``populate``).
+
+    Returns:
+        dict: Seconds per compute_analytics call, keyed by engagement row count
+    """
+    results = {}
+    for rows in row_counts:
+        with tempfile.TemporaryDirectory() as tmp:
+            tracker = quiet_tracker(tmp, backend)
+            populate(tracker, rows)
+            start = time.perf_counter()
+            tracker.compute_analytics()
+            results[rows] = time.perf_counter() - start
+    return results
+
+
+def bench_memory(rows, chunksize, backend="csv"):
+    """Compare peak traced memory of in-memory and chunked analytics over the same data.
+
+    Raises AssertionError if the chunked result differs from the in-memory
+    one, or if its peak doesn't stay below the in-memory peak
+    (``tests/test_memory.py`` checks the same on a small dataset).
+
+    Returns:
+        dict: Peak bytes and seconds for each mode
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        tracker = quiet_tracker(tmp, backend)
+        populate(tracker, rows)
+        # Warm up, so neither peak includes the imports
+        tracker.compute_analytics(use_cache=False, chunksize=chunksize)
+        outputs = {}
+        for mode, size in (("in-memory", None), ("chunked", chunksize)):
+            tracemalloc.start()
+            start = time.perf_counter()
+            outputs[mode] = tracker.compute_analytics(use_cache=False, chunksize=size).to_dict()
+            seconds = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            results[mode] = {"peak_bytes": peak, "seconds": seconds}
+
+    # Float sums are added up in a different order, so they may differ in the last bits
+    for key, value in outputs["in-memory"].items():
+        chunked = outputs["chunked"][key]
+        same = math.isclose(chunked, value) if isinstance(value, float) else chunked == value
+        assert same, f"chunked analytics differ from in-memory analytics in {key}"
+    if rows > chunksize:
+        assert results["chunked"]["peak_bytes"] < results["in-memory"]["peak_bytes"], \
+            "chunked analytics didn't lower peak memory"
+    return results
+
+
+def _concurrent_writer(data_dir, worker, rows, backend):
+    """Process body for bench_concurrency: interleave appends, bulk appends and rewrites."""
+    tracker = quiet_tracker(data_dir, backend)
+    for i, engagement in enumerate(SyntheticData(worker).engagements(rows)):
+        # Start without a response, so a lost one shows
+        engagement.update({"Contact Name": f"Worker {worker} Contact {i}", "Response Received": ""})
+        if i % 10 == 9:
+            # Bulk append of two rows through the batched writer
+            second = dict(engagement, **{"Contact Name": f"Worker {worker} Contact {i}b"})
+            tracker.add_engagements([engagement, second])
+        else:
+            tracker.add_engagement(engagement)
+        if i % 10 == 5:
+            # Whole-file rewrite racing the other processes' appends
+            tracker.update_engagement_response(f"Worker {worker} Contact {i}", engagement["Company"], "Replied")
+
+
+def bench_concurrency(processes, rows, backend="csv"):
+    """Stress test: ``processes`` processes write to one data directory at once.
+
+    Each process appends ``rows`` engagements (every tenth as a two-row bulk
+    append) and records a response on every tenth, which rewrites the file.
+    Raises AssertionError if any row or response is lost or duplicated
+    (``tests/test_concurrency.py`` runs a smaller version).
+
+    Returns:
+        dict: Total rows written, seconds and rows per second
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        quiet_tracker(tmp, backend)
+        workers = [
+            multiprocessing.Process(target=_concurrent_writer, args=(tmp, worker, rows, backend))
+            for worker in range(processes)
+        ]
+        start = time.perf_counter()
+        for process in workers:
+            process.start()
+        for process in workers:
+            process.join()
+        seconds = time.perf_counter() - start
+        assert all(process.exitcode == 0 for process in workers), "a writer process failed"
+
+        engagements = quiet_tracker(tmp, backend).storage.read_rows("engagements")
+
+    contacts = [engagement["Contact Name"] for engagement in engagements]
+    expected = set()
+    for worker in range(processes):
+        for i in range(rows):
+            expected.add(f"Worker {worker} Contact {i}")
+            if i % 10 == 9:
+                expected.add(f"Worker {worker} Contact {i}b")
+    assert len(contacts) == len(expected) and set(contacts) == expected, \
+        f"expected {len(expected)} distinct rows, found {len(contacts)} ({len(set(contacts))} distinct)"
+    responded = {engagement["Contact Name"] for engagement in engagements if engagement["Response Received"]}
+    updated = {f"Worker {worker} Contact {i}" for worker in range(processes) for i in range(rows) if i % 10 == 5}
+    assert updated <= responded, f"{len(updated - responded)} responses were lost"
+    return {"rows": len(contacts), "seconds": seconds, "rows_per_second": len(contacts) / seconds}
+
+
+def bench_updates(rows, updates):
+    """Compare logged updates with compacting (rewriting the file) on every update.
+
+    Each mode records ``updates`` responses against a table of ``rows``
+    engagements; the logged mode then compacts the pending events in one go.
+
+    Returns:
+        dict: Median and 95th percentile update latency in seconds per mode,
+        plus the time to compact the logged updates
+    """
+    results = {}
+    modes = {"logged": {}, "rewrite each": {"compact_after_bytes": 0}}
+    for mode, options in modes.items():
+        with tempfile.TemporaryDirectory() as tmp:
+            tracker = quiet_tracker(tmp, **options)
+            tracker.add_engagements(SyntheticData().engagements(rows))
+            timings = []
+            for contact, company in engagement_keys(rows, updates):
+                start = time.perf_counter()
+                tracker.update_engagement_response(contact, company, "Thanks!", 12)
+                timings.append(time.perf_counter() - start)
+            results[mode] = {
+                "p50": statistics.median(timings),
+                "p95": statistics.quantiles(timings, n=20)[-1]
+            }
+            if mode == "logged":
+                start = time.perf_counter()
+                tracker.storage.compact()
+                results["compaction"] = time.perf_counter() - start
+    return results
+
+
+def bench_enrichment(rows, concurrency=16, latency=0.02):
+    """Enrich ``rows`` companies twice, cold and then from the response cache.
+
+    Runs once against the in-process mock provider and once over HTTP against
+    a local mock server (``latency`` seconds per lookup in both), so the
+    numbers include connection pooling but need no network access.
+
+    Returns:
+        dict: Per provider and run: seconds, profiles per second, requests and cache hit ratio
+    """
+    from tracker_enrichment import CONTACT_COLUMNS, HttpProvider, MockProfileServer, MockProvider
+
+    def companies():
+        for i, company in enumerate(SyntheticData().companies(rows)):
+            # Contacts are shared between a few companies, as in real data;
+            # their names and connection counts are left for the enrichment
+            company["Mutual Connections"] = ""
+            for role, (name_column, url_column) in enumerate(CONTACT_COLUMNS):
+                company[name_column] = ""
+                company[url_column] = f"https://www.linkedin.com/in/contact-{role}-{i % (rows // 2 or 1)}"
+            yield company
+
+    results = {}
+    with MockProfileServer(latency=latency) as server:
+        providers = {
+            "mock": lambda: MockProvider(latency=latency),
+            "http": lambda: HttpProvider(server.base_url, pool_size=concurrency)
+        }
+        for name, make_provider in providers.items():
+            with tempfile.TemporaryDirectory() as tmp:
+                tracker = quiet_tracker(tmp)
+                tracker.add_companies(companies())
+                for run in ("cold", "warm"):
+                    stats = tracker.enrich_contacts(make_provider(), concurrency=concurrency)
+                    assert stats is not None and not stats["failures"], f"{name} {run} enrichment failed"
+                    looked_up = stats["requests"] + stats["cache_hits"]
+                    results[f"{name} {run}"] = {
+                        "seconds": stats["seconds"],
+                        "profiles_per_second": stats["profiles"] / stats["seconds"],
+                        "requests": stats["requests"],
+                        "hit_ratio": stats["cache_hits"] / looked_up if looked_up else 0.0
+                    }
+                company = tracker.storage.read_rows("companies")[0]
+                assert company["Recruiter Name"], "enriched fields were not written back"
+    return results
+
+
+def bench_metrics(rows, updates, runs=5):
+    """Measure the cost of instrumentation on a mixed workload.
+
+    Each run ingests ``rows`` engagements, records ``updates`` responses and
+    computes the analytics, with metrics disabled (the default) and enabled.
+    An untimed warmup run pays for the imports first, and the two modes
+    alternate which goes first over ``runs`` repetitions, so neither is
+    favoured by warm caches.
+
+    Returns:
+        dict: Median seconds per mode, the relative overhead of enabled
+        metrics, the samples per mode, and the metrics of the last enabled run
+    """
+    keys = engagement_keys(rows, updates)
+
+    def workload(enabled):
+        with tempfile.TemporaryDirectory() as tmp:
+            tracker = quiet_tracker(tmp)
+            if enabled:
+                tracker.enable_metrics()
+            start = time.perf_counter()
+            tracker.add_engagements(SyntheticData().engagements(rows))
+            for contact, company in keys:
+                tracker.update_engagement_response(contact, company, "Thanks!", 12)
+            tracker.compute_analytics()
+            return time.perf_counter() - start, tracker.metrics
+
+    workload(False)
+    samples = {"disabled": [], "enabled": []}
+    metrics = None
+    for run in range(runs):
+        modes = ("disabled", "enabled") if run % 2 == 0 else ("enabled", "disabled")
+        for mode in modes:
+            seconds, collected = workload(mode == "enabled")
+            samples[mode].append(seconds)
+            if mode == "enabled":
+                metrics = collected
+    results = {mode: statistics.median(seconds) for mode, seconds in samples.items()}
+    results["overhead"] = results["enabled"] / results["disabled"] - 1
+    results["samples"] = samples
+    results["metrics"] = metrics.to_dict()
+    return results
+
+
+def bench_snapshot(rows, updates):
+    """Compare loading tables from the columnar snapshot with parsing the CSV files.
+
+    Times parsing every table, building the snapshot, and mapping it again
+    (all columns, and only the columns the analytics read). Then records
+    ``updates`` responses, compacts them (a rewrite of the engagements file)
+    and times recomputing the analytics with and without the snapshot, whose
+    results must be identical.
+
+    Returns:
+        dict: Seconds per step
+    """
+    from tracker_analytics import TrackerAggregates
+    from tracker_schema import TABLES
+    from tracker_snapshot import ColumnarSnapshot
+
+    def timed(function):
+        start = time.perf_counter()
+        function()
+        return time.perf_counter() - start
+
+    results = {}
+    aggregates = {}
+    for mode, options in {"csv": {}, "snapshot": {"snapshot": True}}.items():
+        with tempfile.TemporaryDirectory() as tmp:
+            tracker = quiet_tracker(tmp, **options)
+            populate(tracker, rows)
+            storage = tracker.storage
+            if mode == "csv":
+                results["csv parse"] = timed(lambda: [storage.read_frame(table) for table in TABLES])
+            else:
+                results["snapshot build"] = timed(lambda: [storage.snapshot.refresh(table) for table in TABLES])
+                snapshot = ColumnarSnapshot(storage)
+                results["snapshot load (all columns)"] = timed(lambda: [snapshot.load(table) for table in TABLES])
+                results["snapshot load (analytics columns)"] = timed(
+                    lambda: [snapshot.load(table, TrackerAggregates.COLUMNS[table]) for table in TABLES]
+                )
+            tracker.compute_analytics()
+            for i in range(updates):
+                tracker.update_engagement_response(f"Contact {i}-0", f"Company {i:06d}", "Thanks!", 12)
+            results[f"compact ({mode})"] = timed(tracker.compact)
+            start = time.perf_counter()
+            aggregates[mode] = tracker.compute_analytics().to_dict()
+            results[f"analytics after updates ({mode})"] = time.perf_counter() - start
+    assert aggregates["csv"] == aggregates["snapshot"], "snapshot analytics differ from the CSV analytics"
+    return results
+
+
+def bench_entities(rows, companies, variants=0.05, updates=200):
+    """Resolve synthetic engagements whose company and contact names are partly misspelled.
+
+    ``variants`` of the ``rows`` engagements spell their names differently
+    (legal suffixes, case, typos) from the ``companies`` companies. Times
+    building the canonical-id mapping, reloading it, resolving ``updates``
+    responses logged under variant spellings and the suggestions that use
+    the per-industry analysis, and checks the resolutions against the
+    generator's original names.
+
+    Returns:
+        dict: Seconds per step, and the share of variant spellings resolved
+        correctly, wrongly and not at all
+    """
+    from tracker_entities import EntityResolver
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        tracker = quiet_tracker(tmp)
+        data = populate(tracker, rows, companies=companies, variants=variants)
+
+        start = time.perf_counter()
+        tracker.entities.refresh()
+        results["build"] = time.perf_counter() - start
+        start = time.perf_counter()
+        EntityResolver(tracker.storage).refresh()
+        results["reload"] = time.perf_counter() - start
+
+        resolver = tracker.entities
+        outcomes = Counter()
+        pairs = zip(data.engagements(rows, companies, variants), data.engagements(rows, companies))
+        variant_pairs = [(row, original) for row, original in pairs if row["Company"] != original["Company"]]
+        for row, original in variant_pairs:
+            canonical = resolver.companies.get(row["Company"])
+            if canonical == resolver.companies.get(original["Company"]):
+                outcomes["correct"] += 1
+            elif canonical in resolver.tracked:
+                outcomes["wrong"] += 1
+            else:
+                outcomes["unresolved"] += 1
+        for outcome in ("correct", "wrong", "unresolved"):
+            results[outcome] = outcomes[outcome] / len(variant_pairs) if variant_pairs else 0.0
+        results["merged companies"] = companies - len({resolver.companies[data.company_name(i)] for i in range(companies)})
+
+        rng = random.Random(0)
+        start = time.perf_counter()
+        for row, _ in variant_pairs[:updates]:
+            contact = data.contact_variant(rng, row["Contact Name"])
+            company = data.company_variant(rng, row["Company"])
+            tracker.update_engagement_response(contact, company, "Thanks!", 12)
+        results["variant updates"] = (time.perf_counter() - start) / max(1, min(updates, len(variant_pairs)))
+        start = time.perf_counter()
+        tracker.suggest_optimizations()
+        results["suggestions"] = time.perf_counter() - start
+    return results
+
+
+def _service_load(address, data_dir, rows, batch, seed):
+    """Add ``rows`` engagements to one data directory through a service, ``batch`` per request."""
+    import threading
+
+    from tracker_service import ServiceClient
+    from tracker_synthetic import SyntheticData
+
+    client = ServiceClient(*address)
+    latencies = []
+    engagements = list(SyntheticData(seed).engagements(rows))
+    for i in range(0, rows, batch):
+        start = time.perf_counter()
+        client.request("POST", "/engagements", data_dir, engagements[i:i + batch])
+        latencies.append(time.perf_counter() - start)
+    client.close()
+    return threading.current_thread().name, latencies
+
+
+def bench_service(rows, students=4, requests=50, batch=10):
+    """Compare cold CLI runs with requests to a warm tracker service.
+
+    Each of ``students`` data directories is populated with ``rows``
+    synthetic engagements. Times the ``upcoming`` and ``analytics`` CLI
+    subcommands as fresh processes, then the same reports and a response
+    update as ``requests`` calls each to a service holding the directories
+    open; then adds rows to every directory concurrently, ``batch`` per
+    request, and finally cycles through the directories with room for half
+    of them open to measure evictions.
+
+    Returns:
+        dict: p50/p95 seconds per cold command and service request, add
+        throughput and pool statistics
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    import threading
+
+    from tracker_service import ServiceClient, TrackerPool, TrackerService, make_server
+
+    tool = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tracking_tool.py")
+    results = {}
+    with tempfile.TemporaryDirectory() as root:
+        names = [f"student{i}" for i in range(students)]
+        datasets = {}
+        for seed, name in enumerate(names):
+            tracker = quiet_tracker(os.path.join(root, name))
+            datasets[name] = populate(tracker, rows, seed=seed)
+            tracker.storage.close()
+
+        def summarize(timings):
+            return {"p50": percentile(timings, 50), "p95": percentile(timings, 95)}
+
+        for command in ("upcoming", "analytics"):
+            timings = []
+            for name in names[:3]:
+                start = time.perf_counter()
+                subprocess.run([sys.executable, tool, "--data-dir", os.path.join(root, name), command],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+                timings.append(time.perf_counter() - start)
+            results[f"cli {command}"] = summarize(timings)
+
+        def serve(pool):
+            service = TrackerService(pool)
+            server = make_server(service, port=0)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            return service, server
+
+        service, server = serve(TrackerPool(root))
+        address = server.server_address[:2]
+        client = ServiceClient(*address)
+        name = names[0]
+        # The first request opens the tracker; time the warm ones
+        start = time.perf_counter()
+        client.request("GET", "/analytics", name)
+        results["service first request"] = time.perf_counter() - start
+        engagements = list(datasets[name].engagements(requests))
+        calls = {
+            "service upcoming": lambda i: client.request("GET", "/upcoming", name, days=7),
+            "service analytics": lambda i: client.request("GET", "/analytics", name),
+            "service response": lambda i: client.request("POST", "/response", name, {
+                "contact": engagements[i]["Contact Name"], "company": engagements[i]["Company"],
+                "response": "Thanks!", "response_time": 12
+            }),
+        }
+        for label, call in calls.items():
+            timings = []
+            for i in range(requests):
+                start = time.perf_counter()
+                call(i)
+                timings.append(time.perf_counter() - start)
+            results[label] = summarize(timings)
+
+        added = requests * batch
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=students) as executor:
+            loads = list(executor.map(lambda n: _service_load(address, n, added, batch, 1000), names))
+        client.request("POST", "/flush")
+        elapsed = time.perf_counter() - start
+        results["service concurrent add"] = summarize([t for _, timings in loads for t in timings])
+        results["concurrent rows/sec"] = added * students / elapsed
+        client.close()
+        server.shutdown()
+        server.server_close()
+        service.close()
+
+        # Room for half the directories: every pass reopens each of them
+        service, server = serve(TrackerPool(root, max_trackers=max(1, students // 2)))
+        client = ServiceClient(*server.server_address[:2])
+        for _ in range(3):
+            for name in names:
+                client.request("GET", "/upcoming", name)
+        results["pool"] = client.request("GET", "/stats")[1]
+        client.close()
+        server.shutdown()
+        server.server_close()
+        service.close()
+    return results
+
+
+def bench_queries(rows, appended=1000, k=10):
+    """Time the search query index over ``rows`` logged query runs.
+
+    Times building the index from the CSV file, reloading it, folding in
+    ``appended`` new runs and answering top-``k`` with the heap compared
+    with sorting every distinct query. Raises AssertionError if the two
+    rankings differ or respelled queries don't share a key.
+
+    Returns:
+        dict: Seconds per step, and the number of distinct query spellings and canonical queries
+    """
+    from tracker_queries import QueryIndex, canonicalize_query
+    from tracker_synthetic import SyntheticData
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        tracker = quiet_tracker(tmp)
+        populate(tracker, 100, queries=rows)
+        storage = tracker.storage
+
+        start = time.perf_counter()
+        stats = QueryIndex(storage).current()
+        results["build"] = time.perf_counter() - start
+        start = time.perf_counter()
+        QueryIndex(storage).current()
+        results["reload"] = time.perf_counter() - start
+
+        index = QueryIndex(storage)
+        index.current()
+        tracker.add_search_queries(SyntheticData(1).queries(appended))
+        start = time.perf_counter()
+        stats = index.current()
+        results[f"fold in {appended} runs"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        best = stats.best(k)
+        results[f"top {k} (heap)"] = time.perf_counter() - start
+        start = time.perf_counter()
+        ranked = sorted(
+            (entry for entry in stats.entries.values() if entry[7]),
+            key=lambda entry: (entry[6] / entry[7], entry[3]), reverse=True
+        )[:k]
+        results[f"top {k} (sort)"] = time.perf_counter() - start
+        assert [query["canonical"] for query in best] == [entry[2] for entry in ranked], "heap and sort rankings differ"
+
+        spellings = {row["Query"] for row in storage.read_rows("queries")}
+        for query in list(spellings)[:1000]:
+            respelled = " && ".join(reversed(query.lower().split(" AND ")))
+            assert canonicalize_query(respelled) == canonicalize_query(query), f"{respelled!r} != {query!r}"
+        results["spellings"] = len(spellings)
+        results["canonical queries"] = len({entry[2] for entry in stats.entries.values()})
+
+        rng = random.Random(0)
+        start = time.perf_counter()
+        for query in rng.sample(sorted(spellings), 100):
+            tracker.add_search_query({"Platform": "LinkedIn", "Query": query, "Results Count": "10", "Effectiveness Rating": "3"})
+        results["add_search_query"] = (time.perf_counter() - start) / 100
+    return results
+
+
+def bench_batch(rows, students=4, workers=None):
+    """Time the scheduled batch runner over ``students`` populated data directories.
+
+    Runs the reports serially in one process, then in a process pool of
+    ``workers`` (a fresh copy of the data, so nothing is reused), then again
+    with nothing changed.
+
+    Returns:
+        dict: Seconds per run
+    """
+    from rich.console import Console
+
+    from tracker_batch import run_batch
+
+    results = {}
+    console = Console(quiet=True)
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ("serial", "pool"):
+            root = os.path.join(tmp, mode)
+            for seed in range(students):
+                tracker = quiet_tracker(os.path.join(root, f"student{seed}"))
+                populate(tracker, rows, seed=seed)
+                tracker.storage.close()
+            start = time.perf_counter()
+            run_batch(root, workers=1 if mode == "serial" else workers, console=console)
+            results[mode] = time.perf_counter() - start
+        start = time.perf_counter()
+        run_batch(root, workers=workers, console=console)
+        results["unchanged"] = time.perf_counter() - start
+    return results
+
+
+# Suite scale name -> engagement rows (companies are a fifth of that, queries a tenth)
+SUITE_SCALES = {"1k": 1000, "100k": 100000, "1m": 1000000}
+
+# Suite operations, in the order they run, with the number of timed calls of each
+SUITE_OPERATIONS = {
+    "add_company": 200,
+    "update_engagement_response": 200,
+    "get_upcoming_actions": 20,
+    "generate_analytics": 5,
+    "suggest_optimizations": 5,
+}
+
+# Where suite results are stored, one JSON file per label
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_results")
+
+
+def percentile(samples, q):
+    """Return the ``q``-th percentile (0-100) of a list of samples, by the nearest-rank method."""
+    ordered = sorted(samples)
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+def _suite_calls(tracker, data, rows):
+    """Return operation name -> function of the call index, for the suite."""
+    # Existing (contact, company) pairs, taken from the start of the generated engagements
+    contacts = [(row["Contact Name"], row["Company"]) for row in data.engagements(min(rows, 10000))]
+    return {
+        "add_company": lambda i: tracker.add_company({
+            "Company Name": f"Benchmark Company {i}", "Industry": "Software", "Technologies": "Python, AWS"
+        }),
+        "update_engagement_response": lambda i: tracker.update_engagement_response(
+            *contacts[i * 7919 % len(contacts)], "Thanks for reaching out!", 12
+        ),
+        "get_upcoming_actions": lambda i: tracker.get_upcoming_actions(days=7),
+        "generate_analytics": lambda i: tracker.generate_analytics(),
+        "suggest_optimizations": lambda i: tracker.suggest_optimizations(),
+    }
+
+
+def bench_suite(scales, seed=0, backend="csv", operations=None, samples=None):
+    """Time the main tracker operations on synthetic data at several scales.
+
+    Each scale gets a fresh data directory filled by ``populate``. The
+    operations then run in ``SUITE_OPERATIONS`` order against it, so costs
+    deferred by one operation (e.g. compacting logged updates) show up in
+    the next one that reads the data, as they would in real use. Each
+    operation is timed over its samples, then called once more under
+    tracemalloc for its peak memory.
+
+    Args:
+        scales (list): Names from ``SUITE_SCALES``
+        seed (int): Synthetic data seed
+        backend (str): Storage backend
+        operations (list, optional): Subset of ``SUITE_OPERATIONS``
+        samples (int, optional): Timed calls per operation, overriding ``SUITE_OPERATIONS``
+
+    Returns:
+        dict: Scale -> {"setup_seconds", "operations": operation -> statistics}
+    """
+    results = {}
+    for scale in scales:
+        rows = SUITE_SCALES[scale]
+        with tempfile.TemporaryDirectory() as tmp:
+            tracker = quiet_tracker(tmp, backend)
+            start = time.perf_counter()
+            data = populate(tracker, rows, seed=seed)
+            scale_results = {"rows": rows, "setup_seconds": time.perf_counter() - start, "operations": {}}
+            calls = _suite_calls(tracker, data, rows)
+
+            for operation, count in SUITE_OPERATIONS.items():
+                if operations and operation not in operations:
+                    continue
+                call = calls[operation]
+                count = samples or count
+                timings = []
+                for i in range(count):
+                    start = time.perf_counter()
+                    call(i)
+                    timings.append(time.perf_counter() - start)
+
+                tracemalloc.start()
+                call(count)
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+
+                total = sum(timings)
+                scale_results["operations"][operation] = {
+                    "samples": count,
+                    "first": timings[0],
+                    "p50": percentile(timings, 50),
+                    "p95": percentile(timings, 95),
+                    "p99": percentile(timings, 99),
+                    "mean": total / count,
+                    "ops_per_second": count / total if total else None,
+                    "peak_bytes": peak
+                }
+        results[scale] = scale_results
+    return results
+
+
+def _git_commit():
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        )
+        return output.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _results_path(label, directory=None):
+    """Return the file of a stored run: ``label`` may also be a path to a JSON file."""
+    if label.endswith(".json") or os.sep in label:
+        return label
+    return os.path.join(directory or RESULTS_DIR, f"{label}.json")
+
+
+def save_results(results, label, directory=None, **settings):
+    """Store suite results with the environment they were measured in.
+
+    Args:
+        results (dict): Output of ``bench_suite``
+        label (str): Name of the run, e.g. a version number
+        directory (str, optional): Results directory, ``RESULTS_DIR`` by default
+        **settings: Suite settings to record (seed, backend, ...)
+
+    Returns:
+        str: Path of the stored file
+    """
+    path = _results_path(label, directory)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    document = {
+        "label": label,
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "settings": settings,
+        "results": results
+    }
+    with open(path, 'w') as file:
+        json.dump(document, file, indent=2)
+        file.write("\n")
+    return path
+
+
+def load_results(label, directory=None):
+    """Load a stored run by label or path."""
+    with open(_results_path(label, directory), 'r') as file:
+        return json.load(file)
+
+
+# Smallest absolute increase counted as a regression, so timer noise on
+# sub-millisecond operations isn't reported
+REGRESSION_FLOORS = {"p50": 0.001, "p95": 0.001, "p99": 0.001, "mean": 0.001, "first": 0.001, "peak_bytes": 1 << 20}
+
+
+def compare_results(baseline, current, threshold=0.10, metrics=("p50", "p95", "peak_bytes")):
+    """Compare two suite runs operation by operation.
+
+    A measurement regressed if it grew by more than ``threshold`` and by more
+    than its ``REGRESSION_FLOORS`` entry.
+
+    Args:
+        baseline (dict): Stored run (``load_results``) or ``bench_suite`` output to compare against
+        current (dict): Stored run or ``bench_suite`` output
+        threshold (float): Relative increase that counts as a regression
+        metrics (tuple): Statistics to compare (lower is better for each)
+
+    Returns:
+        list: (scale, operation, metric, baseline value, current value, relative change, regressed)
+        tuples for every measurement present in both runs
+    """
+    baseline = baseline.get("results", baseline)
+    current = current.get("results", current)
+    rows = []
+    for scale, scale_results in current.items():
+        if scale not in baseline:
+            continue
+        for operation, stats in scale_results["operations"].items():
+            before = baseline[scale]["operations"].get(operation)
+            if before is None:
+                continue
+            for metric in metrics:
+                old, new = before.get(metric), stats.get(metric)
+                if not old or new is None:
+                    continue
+                change = new / old - 1
+                regressed = change > threshold and new - old > REGRESSION_FLOORS.get(metric, 0)
+                rows.append((scale, operation, metric, old, new, change, regressed))
+    return rows
+
+
+def _format_value(metric, value):
+    if metric == "peak_bytes":
+        return f"{value / 2**20:.1f} MiB"
+    return f"{value * 1000:.2f} ms"
+
+
+# CLI invocations timed by bench_startup, in the order they are run
+STARTUP_COMMANDS = [
+    ["add-company", "--name", "Startup Co", "--industry", "Software", "--technologies", "Python, AWS"],
+    ["add-engagement", "--contact", "Jane Smith", "--company", "Startup Co", "--platform", "LinkedIn", "--type", "Comment"],
+    ["update-status", "Startup Co", "In Conversation"],
+    ["upcoming"],
+    ["analytics"],
+    ["suggest"],
+]
+
+
+def bench_startup(runs=5):
+    """Time each CLI subcommand as a fresh process, including interpreter startup and imports.
+
+    Returns:
+        dict: Median wall-clock seconds per subcommand
+    """
+    tool = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tracking_tool.py")
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for command in STARTUP_COMMANDS:
+            timings = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                subprocess.run(
+                    [sys.executable, tool, "--data-dir", tmp] + command,
+                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False
+                )
+                timings.append(time.perf_counter() - start)
+            results[command[0]] = statistics.median(timings)
+    return results
+
+
+def bench_reports(rows, backend="csv", page=50):
+    """Compare presenting the upcoming actions report as a rich table and streaming it.
+
+    Every engagement's follow-up falls in the window, so the report has one
+    row per engagement. The rich table is rendered into a string (not
+    suppressed) so its layout cost counts; the streams are written to
+    ``os.devnull``. Also times returning the data only and one page of
+    ``page`` rows. Memory is measured on a second, traced run.
+
+    Returns:
+        dict: Seconds and peak traced bytes per presentation, and the number of rows
+    """
+    import io
+
+    from rich.console import Console
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        tracker = quiet_tracker(tmp, backend)
+        populate(tracker, rows)
+        window = {"start": "2000-01-01", "end": "2100-12-31"}
+        report = tracker.get_upcoming_actions(output=None, **window)
+        results["rows"] = len(report.rows("actions"))
+
+        runs = {
+            "rich table": {"output": "rich"},
+            "data only": {"output": None},
+            "jsonl": {"output": "jsonl"},
+            "csv": {"output": "csv"},
+            f"jsonl, {page} rows": {"output": "jsonl", "limit": page},
+        }
+        with open(os.devnull, "w") as devnull:
+            for label, options in runs.items():
+                tracker.console = Console(file=io.StringIO(), width=120)
+                start = time.perf_counter()
+                tracker.get_upcoming_actions(file=devnull, **window, **options)
+                seconds = time.perf_counter() - start
+                tracker.console = Console(file=io.StringIO(), width=120)
+                tracemalloc.start()
+                tracker.get_upcoming_actions(file=devnull, **window, **options)
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                results[label] = {"seconds": seconds, "peak_bytes": peak}
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("benchmark", choices=["ingest", "analytics", "startup", "memory", "concurrency", "updates", "enrichment", "metrics", "snapshot", "entities", "service", "batch", "queries", "reports", "suite"])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000])
+    parser.add_argument("--backend", default="csv", choices=["csv", "sqlite"])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--chunksize", type=int, default=10000)
+    parser.add_argument("--processes", type=int, default=8)
+    parser.add_argument("--updates", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--companies", type=int, default=20000)
+    parser.add_argument("--students", type=int, default=4)
+    parser.add_argument("--scales", nargs="+", default=["1k", "100k"], choices=list(SUITE_SCALES))
+    parser.add_argument("--operations", nargs="+", choices=list(SUITE_OPERATIONS))
+    parser.add_argument("--samples", type=int, help="Timed calls per suite operation")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", metavar="LABEL", help="Store the suite results under this label")
+    parser.add_argument("--compare", metavar="LABEL", help="Compare the suite results with a stored run")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative slowdown reported as a regression")
+    args = parser.parse_args(argv)
+
+    if args.benchmark == "ingest":
+        for name, rate in bench_ingest(args.rows[0], args.backend).items():
+            print(f"{name:<20} {rate:>12,.0f} rows/sec")
+    elif args.benchmark == "analytics":
+        for rows, seconds in bench_analytics(args.rows, args.backend).items():
+            print(f"{rows:>10,} rows {seconds * 1000:>10.1f} ms")
+    elif args.benchmark == "startup":
+        for command, seconds in bench_startup(args.runs).items():
+            print(f"{command:<20} {seconds * 1000:>10.1f} ms")
+    elif args.benchmark == "memory":
+        for mode, result in bench_memory(args.rows[0], args.chunksize, args.backend).items():
+            print(f"{mode:<20} {result['peak_bytes'] / 2**20:>10.1f} MiB peak {result['seconds'] * 1000:>10.1f} ms")
+    elif args.benchmark == "concurrency":
+        result = bench_concurrency(args.processes, args.rows[0], args.backend)
+        print(f"{result['rows']:,} rows from {args.processes} processes, no rows lost "
+              f"({result['seconds']:.2f}s, {result['rows_per_second']:,.0f} rows/sec)")
+    elif args.benchmark == "updates":
+        results = bench_updates(args.rows[0], args.updates)
+        compaction = results.pop("compaction")
+        for mode, result in results.items():
+            print(f"{mode:<20} p50 {result['p50'] * 1000:>8.2f} ms  p95 {result['p95'] * 1000:>8.2f} ms")
+        print(f"{'compaction':<20} {compaction * 1000:>12.1f} ms for {args.updates} logged updates")
+    elif args.benchmark == "enrichment":
+        for run, result in bench_enrichment(args.rows[0], args.concurrency).items():
+            print(f"{run:<20} {result['seconds'] * 1000:>10.1f} ms {result['profiles_per_second']:>10,.0f} profiles/sec "
+                  f"{result['requests']:>8,} requests {result['hit_ratio']:>7.1%} cached")
+    elif args.benchmark == "metrics":
+        results = bench_metrics(args.rows[0], args.updates, args.runs)
+        for mode in ("disabled", "enabled"):
+            print(f"metrics {mode:<12} {results[mode] * 1000:>10.1f} ms median of {args.runs}")
+        print(f"{'overhead':<20} {results['overhead']:>10.1%}")
+        for name, timer in results["metrics"]["timers"].items():
+            print(f"  {name:<28} {timer['calls']:>6} calls {timer['total_seconds'] * 1000:>10.1f} ms")
+    elif args.benchmark == "snapshot":
+        for step, seconds in bench_snapshot(args.rows[0], args.updates).items():
+            print(f"{step:<40} {seconds * 1000:>10.1f} ms")
+    elif args.benchmark == "entities":
+        results = bench_entities(args.rows[0], args.companies)
+        for step in ("build", "reload", "variant updates", "suggestions"):
+            print(f"{step:<20} {results[step] * 1000:>10.1f} ms")
+        for outcome in ("correct", "wrong", "unresolved"):
+            print(f"{outcome:<20} {results[outcome]:>10.1%} of variant spellings")
+        print(f"{'merged companies':<20} {results['merged companies']:>10}")
+    elif args.benchmark == "service":
+        results = bench_service(args.rows[0], args.students)
+        for label, result in results.items():
+            if isinstance(result, dict) and "p50" in result:
+                print(f"{label:<24} p50 {result['p50'] * 1000:>9.2f} ms  p95 {result['p95'] * 1000:>9.2f} ms")
+        print(f"{'service first request':<24} {results['service first request'] * 1000:>13.1f} ms")
+        print(f"{'concurrent add':<24} {results['concurrent rows/sec']:>13,.0f} rows/sec")
+        pool = results["pool"]
+        print(f"{'pool':<24} {pool['hits']} hits, {pool['misses']} opens, {pool['evictions']} evictions")
+    elif args.benchmark == "batch":
+        for mode, seconds in bench_batch(args.rows[0], args.students, args.processes).items():
+            print(f"batch {mode:<14} {seconds * 1000:>10.1f} ms")
+    elif args.benchmark == "queries":
+        for step, value in bench_queries(args.rows[0]).items():
+            if isinstance(value, int):
+                print(f"{step:<24} {value:>10,}")
+            else:
+                print(f"{step:<24} {value * 1000:>10.2f} ms")
+    elif args.benchmark == "reports":
+        results = bench_reports(args.rows[0], args.backend)
+        print(f"{'actions':<20} {results.pop('rows'):>10,}")
+        for label, result in results.items():
+            print(f"{label:<20} {result['seconds'] * 1000:>10.1f} ms {result['peak_bytes'] / 2**20:>10.1f} MiB peak")
+    elif args.benchmark == "suite":
+        return run_suite(args)
+
+
+def run_suite(args):
+    """Run, print, store and compare the suite for the command line.
+
+    Returns:
+        int: 1 if the comparison found regressions, else 0
+    """
+    results = bench_suite(args.scales, seed=args.seed, backend=args.backend,
+                          operations=args.operations, samples=args.samples)
+    for scale, scale_results in results.items():
+        print(f"{scale} ({scale_results['rows']:,} engagements, setup {scale_results['setup_seconds']:.1f}s)")
+        for operation, stats in scale_results["operations"].items():
+            print(f"  {operation:<28} p50 {stats['p50'] * 1000:>9.2f} ms  p95 {stats['p95'] * 1000:>9.2f} ms  "
+                  f"p99 {stats['p99'] * 1000:>9.2f} ms  {stats['ops_per_second'] or 0:>9,.1f} ops/sec  "
+                  f"peak {stats['peak_bytes'] / 2**20:>7.1f} MiB")
+    if args.save:
+        path = save_results(results, args.save, seed=args.seed, backend=args.backend, samples=args.samples)
+        print(f"Saved results to {path}")
+    if args.compare:
+        rows = compare_results(load_results(args.compare), results, args.threshold)
+        regressions = [row for row in rows if row[-1]]
+        print(f"Compared with {args.compare}:")
+        for scale, operation, metric, old, new, change, regressed in rows:
+            flag = "  REGRESSION" if regressed else ""
+            print(f"  {scale:<5} {operation:<28} {metric:<10} {_format_value(metric, old):>12} -> "
+                  f"{_format_value(metric, new):>12} {change:>+8.1%}{flag}")
+        if regressions:
+            print(f"{len(regressions)} regressions over {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The tracker modules import each other as top-level modules from session_1
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,46 @@
+import os
+
+from tracker_analytics import stage_timings
+from tracker_cache import AnalyticsCache
+from tracker_synthetic import populate
+from tracking_tool import InternshipSearchTracker
+
+
+def engagement_event(time, status, previous=None):
+    event = {"time": time, "table": "engagements", "key": ["Jane Smith", "Example Tech"], "changes": {"Status": status}}
+    if previous is not None:
+        event["previous"] = previous
+    return event
+
+
+def test_first_transition_needs_a_start_timestamp():
+    events = [
+        # Added on the 5th (no time of day known), responded that evening
+        engagement_event("2026-01-05T19:48:00", "Responded", {"status": "Initial Contact", "time": "2026-01-05"}),
+        engagement_event("2026-01-06T19:48:00", "Meeting Scheduled"),
+    ]
+    assert stage_timings(events) == [("Responded", "Meeting Scheduled", 1, 24.0)]
+
+
+def test_first_transition_from_a_timestamp():
+    events = [engagement_event("2026-01-05T19:48:00", "Responded", {"status": "Initial Contact", "time": "2026-01-05T18:18:00"})]
+    assert stage_timings(events) == [("Initial Contact", "Responded", 1, 1.5)]
+
+
+def test_updates_reach_the_cached_analytics_without_rewriting_the_cache(tmp_path):
+    tracker = InternshipSearchTracker(data_dir=str(tmp_path))
+    tracker.console.quiet = True
+    populate(tracker, 500)
+    before = tracker.compute_analytics()
+    cache = os.path.join(str(tmp_path), AnalyticsCache.file_name)
+    written = os.stat(cache).st_mtime_ns
+
+    # The update goes to the latest engagement with a contact at a company
+    latest = {(row["Contact Name"], row["Company"]): row for row in tracker.storage.read_rows("engagements")}
+    engagement = next(row for row in latest.values() if not row["Response Received"])
+    assert tracker.update_engagement_response(engagement["Contact Name"], engagement["Company"], "Thanks!", 5)
+    assert os.stat(cache).st_mtime_ns == written
+
+    after = tracker.compute_analytics()
+    assert after.response_time_count == before.response_time_count + 1
+    assert after.to_dict() == tracker.compute_analytics(use_cache=False).to_dict()
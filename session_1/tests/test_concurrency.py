@@ -0,0 +1,81 @@
+import csv
+import json
+import multiprocessing
+import os
+
+import pytest
+
+from tracker_events import UpdateLog
+from tracker_journal import WriteJournal
+from tracker_schema import TABLES
+from tracker_synthetic import SyntheticData
+from tracking_tool import InternshipSearchTracker
+
+PROCESSES = 3
+ROWS = 30
+
+
+def quiet_tracker(data_dir, backend):
+    tracker = InternshipSearchTracker(data_dir=data_dir, backend=backend)
+    tracker.console.quiet = True
+    return tracker
+
+
+def contact(worker, i, suffix=""):
+    return f"Worker {worker} Contact {i}{suffix}"
+
+
+def writer(data_dir, worker, backend):
+    """Process body: interleave single appends, bulk appends and whole-file rewrites."""
+    tracker = quiet_tracker(data_dir, backend)
+    for i, engagement in enumerate(SyntheticData(worker).engagements(ROWS)):
+        # Start without a response, so a lost one shows
+        engagement.update({"Contact Name": contact(worker, i), "Response Received": ""})
+        if i % 10 == 9:
+            # Bulk append of two rows through the batched writer
+            tracker.add_engagements([engagement, dict(engagement, **{"Contact Name": contact(worker, i, "b")})])
+        else:
+            assert tracker.add_engagement(engagement)
+        if i % 10 == 5:
+            # Rewrite racing the other processes' appends
+            assert tracker.update_engagement_response(contact(worker, i), engagement["Company"], "Replied")
+
+
+def assert_lines_are_whole(path):
+    """Every line of a JSON Lines file left behind parses: no write was torn."""
+    if not os.path.exists(path):
+        return
+    with open(path, 'r', encoding='utf-8') as file:
+        for line in file:
+            if line.strip():
+                json.loads(line)
+
+
+@pytest.mark.parametrize("backend", ["csv", "sqlite"])
+def test_concurrent_writers_lose_nothing(tmp_path, backend):
+    data_dir = str(tmp_path)
+    quiet_tracker(data_dir, backend)
+    processes = [multiprocessing.Process(target=writer, args=(data_dir, worker, backend)) for worker in range(PROCESSES)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=60)
+    assert [process.exitcode for process in processes] == [0] * PROCESSES
+
+    if backend == "csv":
+        # Check the files as the writers left them, before a read applies anything
+        for path in (WriteJournal(data_dir).path, UpdateLog(data_dir).path):
+            assert_lines_are_whole(path)
+        assert not os.path.exists(WriteJournal(data_dir).claimed_path)
+        with open(os.path.join(data_dir, TABLES["engagements"][0]), 'r', newline='', encoding='utf-8') as file:
+            rows = list(csv.reader(file))
+        assert all(len(row) == len(rows[0]) for row in rows)
+
+    engagements = quiet_tracker(data_dir, backend).storage.read_rows("engagements")
+    contacts = [engagement["Contact Name"] for engagement in engagements]
+    expected = {contact(worker, i) for worker in range(PROCESSES) for i in range(ROWS)}
+    expected.update(contact(worker, i, "b") for worker in range(PROCESSES) for i in range(ROWS) if i % 10 == 9)
+    assert sorted(contacts) == sorted(expected)
+
+    responded = {engagement["Contact Name"] for engagement in engagements if engagement["Response Received"]}
+    assert {contact(worker, i) for worker in range(PROCESSES) for i in range(ROWS) if i % 10 == 5} <= responded
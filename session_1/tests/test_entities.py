@@ -0,0 +1,133 @@
+import os
+
+import pytest
+
+from tracker_analytics import SUCCESS_STATUSES
+from tracker_entities import EntityResolver
+from tracker_synthetic import SyntheticData, populate
+from tracking_tool import InternshipSearchTracker
+
+
+def quiet_tracker(data_dir, **options):
+    tracker = InternshipSearchTracker(data_dir=str(data_dir), **options)
+    tracker.console.quiet = True
+    return tracker
+
+
+def rebuilt(storage):
+    """A resolver built from scratch over the current tables."""
+    for name in (EntityResolver.file_name, EntityResolver.contacts_file_name):
+        path = os.path.join(storage.data_dir, name)
+        if os.path.exists(path):
+            os.remove(path)
+    resolver = EntityResolver(storage)
+    resolver.refresh()
+    return resolver
+
+
+def assert_same(resolver, expected):
+    assert resolver.companies == expected.companies
+    assert resolver.names == expected.names
+    assert resolver.tracked == expected.tracked
+    assert resolver.contacts == expected.contacts
+
+
+@pytest.mark.parametrize("chunksize", [None, 50])
+def test_appends_are_folded_in(tmp_path, chunksize):
+    tracker = quiet_tracker(tmp_path, chunksize=chunksize)
+    populate(tracker, 300, variants=0.2)
+    tracker.entities.refresh()
+
+    data = SyntheticData(1)
+    tracker.add_engagements(data.engagements(40, 60, variants=0.3))
+    tracker.add_companies({"Company Name": f"Late {i}", "Industry": "Software", "Technologies": "Python"} for i in range(3))
+    # A new process folds the appended rows into the stored ids
+    resolver = EntityResolver(tracker.storage, chunksize=chunksize)
+    assert resolver.refresh()
+    assert_same(resolver, rebuilt(tracker.storage))
+
+
+def test_company_added_after_its_engagements(tmp_path):
+    tracker = quiet_tracker(tmp_path)
+    tracker.add_engagements([{
+        "Date": "2026-01-05", "Platform": "LinkedIn", "Contact Name": "Jane Smith",
+        "Company": "Exampel Tech Inc", "Engagement Type": "Connection Request", "Status": "Initial Contact"
+    }])
+    tracker.entities.refresh()
+    tracker.add_company({"Company Name": "Example Tech", "Industry": "Software", "Technologies": "Python"})
+
+    assert tracker.update_company_status("Exampel Tech Inc", "In Conversation")
+    assert tracker.entities.latest_engagement("Jane Smith", "Example Tech") == ("Jane Smith", "Exampel Tech Inc")
+    assert_same(tracker.entities, rebuilt(tracker.storage))
+
+
+def test_status_updates_keep_the_ids(tmp_path):
+    tracker = quiet_tracker(tmp_path)
+    populate(tracker, 300, variants=0.2)
+    tracker.entities.refresh()
+
+    company = tracker.storage.read_rows("companies")[0]["Company Name"]
+    engagement = tracker.storage.read_rows("engagements")[-1]
+    assert tracker.update_company_status(company, "Meeting Scheduled")
+    assert tracker.update_engagement_response(engagement["Contact Name"], engagement["Company"], "Thanks!", 5)
+    tracker.compact()
+
+    # The compaction rewrote both files without touching a name: nothing to rebuild
+    resolver = EntityResolver(tracker.storage)
+    assert not resolver.refresh()
+    # Read before the rebuild below deletes the contacts file
+    resolver.contacts
+    assert_same(resolver, rebuilt(tracker.storage))
+
+
+def test_industry_rates_count_each_company_once(tmp_path):
+    tracker = quiet_tracker(tmp_path)
+    populate(tracker, 500, variants=0.3)
+    analytics = tracker.compute_analytics()
+    ids = tracker.entities.company_ids()
+
+    industries = {}
+    for row in tracker.storage.read_rows("companies"):
+        if row["Industry"]:
+            industries.setdefault(ids[row["Company Name"]], row["Industry"])
+    successful = {ids[row["Company Name"]] for row in tracker.storage.read_rows("companies")
+                  if row["Contact Status"] in SUCCESS_STATUSES}
+    successful.update(ids[row["Company"]] for row in tracker.storage.read_rows("engagements")
+                      if row["Status"] in SUCCESS_STATUSES)
+    expected = {}
+    for canonical, industry in industries.items():
+        total, success = expected.get(industry, (0, 0))
+        expected[industry] = (total + 1, success + (canonical in successful))
+
+    rates = analytics.company_success_rates(ids)
+    assert rates == pytest.approx({industry: success / total * 100 for industry, (total, success) in expected.items()})
+    assert tracker.compute_analytics(chunksize=70).company_success_rates(ids) == pytest.approx(rates)
+
+
+def test_sqlite_appends_are_folded_in_and_saved(tmp_path, monkeypatch):
+    tracker = quiet_tracker(tmp_path, backend="sqlite")
+    populate(tracker, 300, variants=0.2)
+    tracker.entities.refresh()
+    company = tracker.storage.read_rows("companies")[0]["Company Name"]
+    assert tracker.update_company_status(company, "Meeting Scheduled")
+    tracker.add_engagements(SyntheticData(1).engagements(40, 60, variants=0.3))
+
+    # A new process loads the saved ids and folds in the new rows without reading whole tables
+    resolver = EntityResolver(tracker.storage)
+    with monkeypatch.context() as patch:
+        patch.setattr(tracker.storage, "iter_frames", None)
+        assert resolver.refresh()
+        assert not resolver.refresh()
+    assert_same(resolver, rebuilt(tracker.storage))
+
+
+def test_sqlite_renames_rebuild(tmp_path):
+    tracker = quiet_tracker(tmp_path, backend="sqlite")
+    populate(tracker, 100)
+    tracker.entities.refresh()
+    company = tracker.storage.read_rows("companies")[0]["Company Name"]
+    tracker.storage.update_company(company, {"Company Name": "Renamed Example"})
+
+    assert tracker.entities.refresh()
+    assert tracker.entities.names[tracker.entities.company_id("Renamed Example")] == "Renamed Example"
+    assert_same(tracker.entities, rebuilt(tracker.storage))
@@ -0,0 +1,100 @@
+import datetime
+
+import pytest
+
+from tracker_index import KEY_RECORD, SAVE_AFTER_ROWS, NextActionIndex, parse_date
+from tracker_synthetic import SyntheticData, populate
+from tracking_tool import InternshipSearchTracker
+
+# The synthetic follow-ups fall around today
+TODAY = datetime.date.today()
+
+
+def day(offset):
+    return (TODAY + datetime.timedelta(days=offset)).isoformat()
+
+
+def quiet_tracker(data_dir):
+    tracker = InternshipSearchTracker(data_dir=str(data_dir))
+    tracker.console.quiet = True
+    return tracker
+
+
+def brute_force(storage, start, end):
+    actions = []
+    for row_id, row in enumerate(storage.read_rows("engagements")):
+        date = parse_date(row["Next Action Date"])
+        if date and (start is None or date >= start) and (end is None or date <= end):
+            actions.append((date, row_id, row["Contact Name"], row["Company"], row["Next Action"]))
+    return [
+        {"Next Action Date": date, "Contact Name": contact, "Company": company, "Next Action": action}
+        for date, _, contact, company, action in sorted(actions)
+    ]
+
+
+class CountingFile:
+    """File wrapper that counts the bytes read through it."""
+
+    def __init__(self, file):
+        self.file = file
+        self.bytes_read = 0
+
+    def seek(self, offset):
+        return self.file.seek(offset)
+
+    def read(self, size):
+        data = self.file.read(size)
+        self.bytes_read += len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+@pytest.mark.parametrize("window", [(None, None), (day(-10), day(5)), (day(0), day(0)), (None, day(-3)), (day(400), None)])
+def test_saved_and_unsaved_keys_are_merged(tmp_path, window):
+    tracker = quiet_tracker(tmp_path)
+    populate(tracker, SAVE_AFTER_ROWS + 500)
+    tracker.storage.next_action_index.refresh()
+    # A smaller tail stays unsaved; a new process reads it from the CSV file
+    tracker.add_engagements(SyntheticData(1).engagements(200))
+
+    for index in (tracker.storage.next_action_index, NextActionIndex(tracker.storage)):
+        assert index.between(*window) == brute_force(tracker.storage, *window)
+
+
+def test_new_process_reads_only_the_window(tmp_path):
+    tracker = quiet_tracker(tmp_path)
+    populate(tracker, 5000)
+    tracker.storage.next_action_index.refresh()
+
+    index = NextActionIndex(tracker.storage)
+    index.refresh()
+    index._saved.file = counting = CountingFile(index._saved.file)
+    actions = index.between(day(1), day(1))
+    assert actions and actions == brute_force(tracker.storage, day(1), day(1))
+    # Two binary searches and the matching records and texts, not the whole file
+    assert counting.bytes_read <= (2 * len(index._saved).bit_length() + len(actions)) * KEY_RECORD.size + 200 * len(actions)
+
+
+def test_rewrites_keep_the_index(tmp_path):
+    tracker = quiet_tracker(tmp_path)
+    populate(tracker, 300)
+    engagement = tracker.storage.read_rows("engagements")[-1]
+    assert tracker.update_engagement_response(engagement["Contact Name"], engagement["Company"], "Thanks!", 5)
+    tracker.compact()
+    assert NextActionIndex(tracker.storage).between() == brute_force(tracker.storage, None, None)
+
+
+def test_upcoming_actions_leave_pending_updates_pending(tmp_path):
+    tracker = quiet_tracker(tmp_path)
+    populate(tracker, 300)
+    tracker.get_upcoming_actions(output=None)
+    for engagement in tracker.storage.read_rows("engagements")[-5:]:
+        assert tracker.update_engagement_response(engagement["Contact Name"], engagement["Company"], "Thanks!", 5)
+    assert tracker.storage.updates.has_pending()
+
+    report = tracker.get_upcoming_actions(days=30, output=None)
+    # Responses don't change any indexed column, so the lookup doesn't compact them
+    assert tracker.storage.updates.has_pending()
+    assert report.rows("actions") == brute_force(tracker.storage, day(0), day(30))
@@ -0,0 +1,55 @@
+import tracemalloc
+
+import pytest
+
+from tracker_synthetic import populate
+from tracking_tool import InternshipSearchTracker
+
+CHUNKSIZE = 500
+
+
+def analytics_peak(tracker, chunksize):
+    """Compute the analytics without the cache; return them with the peak traced bytes."""
+    tracemalloc.start()
+    try:
+        analytics = tracker.compute_analytics(use_cache=False, chunksize=chunksize)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return analytics.to_dict(), peak
+
+
+@pytest.fixture(params=["csv", "sqlite"])
+def trackers(request, tmp_path):
+    """Trackers over a small and a four times larger copy of the same kind of data."""
+    trackers = {}
+    for rows in (2000, 8000):
+        tracker = InternshipSearchTracker(data_dir=str(tmp_path / str(rows)), backend=request.param)
+        tracker.console.quiet = True
+        # A fixed set of companies keeps the aggregates themselves the same size
+        populate(tracker, rows, companies=50)
+        # Warm up: the first call pays for imports and caches
+        tracker.compute_analytics(use_cache=False)
+        trackers[rows] = tracker
+    return trackers
+
+
+def test_chunked_analytics_equal_in_memory(trackers):
+    for tracker in trackers.values():
+        in_memory, _ = analytics_peak(tracker, None)
+        chunked, _ = analytics_peak(tracker, CHUNKSIZE)
+        # Float sums are added up in a different order, so only those may differ (in the last bits)
+        sums = {key for key, value in in_memory.items() if isinstance(value, float)}
+        assert {key: chunked[key] for key in sums} == pytest.approx({key: in_memory[key] for key in sums})
+        assert {key: value for key, value in chunked.items() if key not in sums} == \
+            {key: value for key, value in in_memory.items() if key not in sums}
+
+
+def test_chunked_peak_is_bounded_by_the_chunk_size(trackers):
+    _, small_peak = analytics_peak(trackers[2000], CHUNKSIZE)
+    _, large_peak = analytics_peak(trackers[8000], CHUNKSIZE)
+    _, in_memory_peak = analytics_peak(trackers[8000], None)
+
+    # Four times the rows must not mean (anywhere near) four times the memory
+    assert large_peak < small_peak * 1.25
+    assert large_peak < in_memory_peak
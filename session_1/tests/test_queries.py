@@ -0,0 +1,19 @@
+from tracker_synthetic import SyntheticData, populate
+from tracking_tool import InternshipSearchTracker
+
+
+def test_adding_a_query_leaves_pending_updates_pending(tmp_path):
+    tracker = InternshipSearchTracker(data_dir=str(tmp_path))
+    tracker.console.quiet = True
+    populate(tracker, 300)
+    company = tracker.storage.read_rows("companies")[0]["Company Name"]
+    assert tracker.update_company_status(company, "Meeting Scheduled")
+    assert tracker.storage.updates.has_pending()
+
+    query = next(SyntheticData(1).queries(1))
+    runs = tracker.storage.query_stats().lookup(query["Platform"], query["Query"])
+    assert tracker.add_search_query(query)
+    # Update events never touch the queries table, so they stay batched
+    assert tracker.storage.updates.has_pending()
+    after = tracker.storage.query_stats().lookup(query["Platform"], query["Query"])
+    assert after["runs"] == (runs["runs"] if runs else 0) + 1
@@ -0,0 +1,83 @@
+import threading
+
+import pytest
+
+from tracker_service import ServiceClient, TrackerPool, TrackerService, make_server
+from tracker_synthetic import SyntheticData
+
+
+@pytest.fixture(params=["csv", "sqlite"])
+def service(request, tmp_path):
+    pool = TrackerPool(str(tmp_path), backend=request.param)
+    service = TrackerService(pool, flush_interval=0.1)
+    server = make_server(service)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield service, server.server_address[1]
+    server.shutdown()
+    server.server_close()
+    service.close()
+
+
+def test_concurrent_requests(service):
+    service, port = service
+    data = SyntheticData(0)
+    companies = list(data.companies(40))
+    engagements = list(data.engagements(200, 40))
+    errors = []
+
+    def student(worker):
+        client = ServiceClient(port=port)
+        try:
+            # Every worker shares one directory, so requests reach its tracker from several threads
+            requests = [
+                ("POST", "/companies", companies[worker::4]),
+                ("POST", "/engagements", engagements[worker::4]),
+                ("GET", "/upcoming", None),
+                ("GET", "/analytics", None),
+                ("GET", "/suggestions", None),
+                ("POST", "/response", {"contact": engagements[worker]["Contact Name"],
+                                       "company": engagements[worker]["Company"], "response": "Yes"}),
+            ]
+            for method, path, body in requests:
+                status, result = client.request(method, path, "student", body=body)
+                if status != 200:
+                    errors.append((path, status, result))
+        finally:
+            client.close()
+
+    threads = [threading.Thread(target=student, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    client = ServiceClient(port=port)
+    status, analytics = client.request("GET", "/analytics", "student")
+    client.close()
+    assert status == 200
+    assert analytics["companies"] == 40
+    assert analytics["engagements"] == 200
+
+
+def test_failed_flush_keeps_rows_buffered(service, monkeypatch):
+    service, port = service
+    pool = service.pool
+    entry = pool.acquire("student")
+    entry.buffer("queries", list(SyntheticData(0).queries(5)))
+    pool.release(entry)
+
+    def fail(rows):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(entry.tracker, "add_search_queries", fail)
+    pool.flush_due(0)
+    assert pool.stats["flush_errors"] == 1
+    assert entry.pending_rows() == 5
+
+    monkeypatch.undo()
+    pool.flush_due(0)
+    assert entry.pending_rows() == 0
+    assert pool.stats["flushed_rows"] == 5
+    assert service._flusher.is_alive()
@@ -0,0 +1,337 @@
+"""Aggregations behind the tracker's analytics, charts and optimization suggestions.
+
+All reports are computed from one ``TrackerAggregates`` value: plain counts
+per platform, engagement type, status and industry. The counts are built
+with vectorized ``groupby``/``value_counts`` over each table in a single
+pass, and two aggregates can be merged, so partial results (e.g. from
+separate chunks of a file) combine into the same totals.
+"""
+import datetime
+from collections import Counter, defaultdict
+
+from tracker_technologies import normalize_technology
+
+# Company contact statuses that count as a successful engagement
+SUCCESS_STATUSES = ['In Conversation', 'Meeting Scheduled', 'Interview Opportunity']
+
+# Engagement statuses shown in the funnel chart, in funnel order
+FUNNEL_STATUSES = ['Initial Contact', 'Response Received', 'In Conversation', 'Meeting Scheduled', 'Interview Opportunity']
+
+
+def _counts(series):
+    """Return value counts of a Series as a Counter of plain Python ints."""
+    return Counter({key: int(count) for key, count in series.value_counts().items() if count})
+
+
+def _group_sums(flags, keys):
+    """Return per-key sums of a boolean Series as a Counter."""
+    sums = flags.groupby(keys, observed=True).sum()
+    return Counter({key: int(count) for key, count in sums.items() if count})
+
+
+def ranked(counter, n=None):
+    """Return (key, count) pairs, largest count first and ties broken by key.
+
+    Unlike ``Counter.most_common`` the order doesn't depend on the order the
+    keys were first seen, so aggregates merged from chunks rank identically
+    to aggregates computed in one pass.
+    """
+    pairs = sorted(counter.items(), key=lambda item: (-item[1], str(item[0])))
+    return pairs if n is None else pairs[:n]
+
+
+def split_technologies(technologies):
+    """Split a Series of comma-separated technology lists into one stripped entry per row."""
+    techs = technologies.dropna().str.split(',').explode().str.strip()
+    return techs[techs != ""]
+
+
+# Column holding the status of each table's rows, as logged in update events
+STATUS_COLUMNS = {"companies": "Contact Status", "engagements": "Status"}
+
+
+def _event_time(value):
+    try:
+        return datetime.datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _start_time(previous):
+    """Return when the status before an entity's first logged change was set, if known.
+
+    Rows only record the date they were added, and counting from midnight
+    would add up to a day to the first transition, so a date alone gives None.
+    """
+    value = previous.get("time")
+    time = _event_time(value)
+    return time if time is not None and len(value) > 10 else None
+
+
+def stage_timings(events):
+    """Time spent between consecutive statuses of the same company or engagement.
+
+    The first transition of an entity is only timed when the previous status
+    carries a full timestamp; later ones are timed between logged updates.
+
+    Args:
+        events (list): Update events, oldest first (see ``TrackerStorage.update_history``)
+
+    Returns:
+        list: (from status, to status, transitions, mean hours) tuples, in funnel order
+    """
+    current = {}
+    hours = defaultdict(list)
+    for event in events:
+        status = event["changes"].get(STATUS_COLUMNS.get(event["table"]))
+        time = _event_time(event["time"])
+        if not status or time is None:
+            continue
+        entity = (event["table"], tuple(event["key"]))
+        if entity not in current and event.get("previous"):
+            previous = event["previous"]
+            current[entity] = (previous["status"], _start_time(previous))
+        if entity in current:
+            previous_status, since = current[entity]
+            if previous_status == status:
+                continue
+            if since is not None:
+                hours[(previous_status, status)].append((time - since).total_seconds() / 3600)
+        current[entity] = (status, time)
+
+    # Statuses are matched to the funnel case-insensitively; others sort last
+    order = {status.lower(): position for position, status in enumerate(FUNNEL_STATUSES)}
+
+    def funnel_order(item):
+        (source, target), _ = item
+        return (order.get(source.lower(), len(order)), order.get(target.lower(), len(order)), source, target)
+
+    return [
+        (source, target, len(durations), sum(durations) / len(durations))
+        for (source, target), durations in sorted(hours.items(), key=funnel_order)
+    ]
+
+
+def stage_entry_hours(timings):
+    """Mean hours to reach each funnel status from the status before it, in funnel order (None if unknown)."""
+    totals = defaultdict(float)
+    counts = defaultdict(int)
+    for _, target, transitions, mean_hours in timings:
+        totals[target.lower()] += mean_hours * transitions
+        counts[target.lower()] += transitions
+    return [
+        totals[status.lower()] / counts[status.lower()] if counts[status.lower()] else None
+        for status in FUNNEL_STATUSES
+    ]
+
+
+class TrackerAggregates:
+    """Mergeable counts over the companies, engagements and search queries tables."""
+
+    COUNTERS = [
+        "industry_counts", "industry_success", "tech_counts",
+        "platform_counts", "platform_responses",
+        "type_counts", "type_responses",
+        "status_counts",
+        # Rows with a successful status per company name, as written in each table
+        "company_successes", "engagement_successes"
+    ]
+    TOTALS = [
+        "company_count", "engagement_count", "responded_count",
+        "response_time_sum", "response_time_count", "query_count"
+    ]
+    # Columns each table's rows are aggregated from (the rest need not be loaded)
+    COLUMNS = {
+        "companies": ["Company Name", "Industry", "Contact Status", "Technologies"],
+        "engagements": ["Company", "Response Received", "Platform", "Engagement Type", "Status", "Response Time (hours)"],
+        "queries": []
+    }
+
+    def __init__(self):
+        for name in self.COUNTERS:
+            setattr(self, name, Counter())
+        for name in self.TOTALS:
+            setattr(self, name, 0)
+        # tech_counts is keyed by normalized technology; this maps keys to display names
+        self.tech_names = {}
+        # Company name -> industry of its first row that names one
+        self.company_industries = {}
+
+    @classmethod
+    def from_frames(cls, companies_df=None, engagements_df=None, queries_df=None):
+        """Aggregate whichever tables are given."""
+        aggregates = cls()
+        if companies_df is not None:
+            aggregates.add_companies(companies_df)
+        if engagements_df is not None:
+            aggregates.add_engagements(engagements_df)
+        if queries_df is not None:
+            aggregates.add_queries(queries_df)
+        return aggregates
+
+    def add_companies(self, companies_df):
+        """Fold a DataFrame of company rows into the counts."""
+        self.company_count += len(companies_df)
+        if 'Industry' in companies_df.columns:
+            self.industry_counts.update(_counts(companies_df['Industry']))
+            if 'Contact Status' in companies_df.columns:
+                success = companies_df['Contact Status'].isin(SUCCESS_STATUSES)
+                self.industry_success.update(_group_sums(success, companies_df['Industry']))
+            if 'Company Name' in companies_df.columns:
+                industries = companies_df[['Company Name', 'Industry']].dropna()
+                for name, industry in zip(industries['Company Name'].tolist(), industries['Industry'].tolist()):
+                    if industry:
+                        self.company_industries.setdefault(name, industry)
+        if 'Company Name' in companies_df.columns and 'Contact Status' in companies_df.columns:
+            success = companies_df['Contact Status'].isin(SUCCESS_STATUSES).to_numpy()
+            self.company_successes.update(_counts(companies_df['Company Name'][success]))
+        if 'Technologies' in companies_df.columns:
+            techs = split_technologies(companies_df['Technologies'])
+            # Normalize each distinct spelling once; the first spelling seen names a technology
+            for spelling in techs.drop_duplicates():
+                key, name = normalize_technology(spelling)
+                self.tech_names.setdefault(key, name)
+            for spelling, count in _counts(techs).items():
+                self.tech_counts[normalize_technology(spelling)[0]] += count
+
+    def add_engagements(self, engagements_df):
+        """Fold a DataFrame of engagement rows into the counts."""
+        self.engagement_count += len(engagements_df)
+        responded = engagements_df['Response Received'].notna()
+        self.responded_count += int(responded.sum())
+
+        self.platform_counts.update(_counts(engagements_df['Platform']))
+        self.platform_responses.update(_group_sums(responded, engagements_df['Platform']))
+        self.type_counts.update(_counts(engagements_df['Engagement Type']))
+        self.type_responses.update(_group_sums(responded, engagements_df['Engagement Type']))
+        self.status_counts.update(_counts(engagements_df['Status']))
+        if 'Company' in engagements_df.columns:
+            success = engagements_df['Status'].isin(SUCCESS_STATUSES).to_numpy()
+            self.engagement_successes.update(_counts(engagements_df['Company'][success]))
+
+        if 'Response Time (hours)' in engagements_df.columns:
+            import pandas as pd
+
+            response_times = pd.to_numeric(engagements_df['Response Time (hours)'], errors='coerce').dropna()
+            self.response_time_sum += float(response_times.sum())
+            self.response_time_count += int(len(response_times))
+
+    def add_queries(self, queries_df):
+        """Fold a DataFrame of search query rows into the counts."""
+        self.query_count += len(queries_df)
+
+    def add_table(self, table, frame):
+        """Fold rows of a named table ("companies", "engagements" or "queries") into the counts."""
+        {
+            "companies": self.add_companies,
+            "engagements": self.add_engagements,
+            "queries": self.add_queries
+        }[table](frame)
+
+    def to_dict(self):
+        """Return the counts as JSON-serializable data."""
+        data = {name: dict(getattr(self, name)) for name in self.COUNTERS}
+        data.update({name: getattr(self, name) for name in self.TOTALS})
+        data["tech_names"] = dict(self.tech_names)
+        data["company_industries"] = dict(self.company_industries)
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild aggregates from the output of ``to_dict``."""
+        aggregates = cls()
+        for name in cls.COUNTERS:
+            getattr(aggregates, name).update(data.get(name, {}))
+        for name in cls.TOTALS:
+            setattr(aggregates, name, data.get(name, 0))
+        aggregates.tech_names.update(data.get("tech_names", {}))
+        aggregates.company_industries.update(data.get("company_industries", {}))
+        return aggregates
+
+    def merge(self, other):
+        """Add another aggregate's counts into this one and return self."""
+        for name in self.COUNTERS:
+            getattr(self, name).update(getattr(other, name))
+        for name in self.TOTALS:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        for key, name in other.tech_names.items():
+            self.tech_names.setdefault(key, name)
+        for name, industry in other.company_industries.items():
+            self.company_industries.setdefault(name, industry)
+        return self
+
+    # Derived figures used by the reports
+
+    def response_rate(self):
+        """Overall response rate in percent."""
+        if not self.engagement_count:
+            return 0.0
+        return self.responded_count / self.engagement_count * 100
+
+    @staticmethod
+    def _rates(totals, responses, min_count=0):
+        """Response rate per key in percent, ordered by total count (largest first)."""
+        return {
+            key: responses.get(key, 0) / count * 100
+            for key, count in ranked(totals)
+            if count >= min_count
+        }
+
+    def platform_response_rates(self, min_count=0):
+        """Response rate per platform, for platforms with at least ``min_count`` engagements."""
+        return self._rates(self.platform_counts, self.platform_responses, min_count)
+
+    def type_response_rates(self, min_count=0):
+        """Response rate per engagement type, for types with at least ``min_count`` engagements."""
+        return self._rates(self.type_counts, self.type_responses, min_count)
+
+    def industry_success_rates(self, min_count=0):
+        """Share of companies in a successful contact status per industry, in percent."""
+        return self._rates(self.industry_counts, self.industry_success, min_count)
+
+    def company_success_rates(self, company_ids=None, min_count=0):
+        """Share of companies per industry that reached a successful status, in percent.
+
+        Unlike ``industry_success_rates``, each company counts once, and it
+        counts as successful if its own contact status or any of its
+        engagements reached a successful status.
+
+        Args:
+            company_ids (dict, optional): Company name as written -> canonical id, so the
+                spellings of one company count as one (see ``EntityResolver.company_ids``)
+            min_count (int): Leave out industries with fewer companies
+
+        Returns:
+            dict: Industry -> rate, ordered by number of companies (largest first)
+        """
+        ids = company_ids or {}
+        industries = {}
+        for name, industry in self.company_industries.items():
+            industries.setdefault(ids.get(name, name), industry)
+        successful = {ids.get(name, name) for name in self.company_successes}
+        successful.update(ids.get(name, name) for name in self.engagement_successes)
+        totals = Counter(industries.values())
+        successes = Counter(industry for canonical, industry in industries.items() if canonical in successful)
+        return self._rates(totals, successes, min_count)
+
+    def industry_breakdown(self):
+        """Companies per industry as (industry, count) pairs, largest first."""
+        return ranked(self.industry_counts)
+
+    def status_breakdown(self):
+        """Engagements per status as (status, count) pairs, largest first."""
+        return ranked(self.status_counts)
+
+    def funnel(self):
+        """Engagement counts for each funnel status, in funnel order."""
+        return [self.status_counts.get(status, 0) for status in FUNNEL_STATUSES]
+
+    def top_technologies(self, n=None):
+        """Most frequent technologies as (technology, count) pairs, with aliases counted together."""
+        return [(self.tech_names.get(key, key), count) for key, count in ranked(self.tech_counts, n)]
+
+    def average_response_time(self):
+        """Mean response time in hours, or None if no response times were recorded."""
+        if not self.response_time_count:
+            return None
+        return self.response_time_sum / self.response_time_count
@@ -0,0 +1,366 @@
+"""Scheduled batch runs of the tracker reports over many data directories.
+
+``run_batch`` finds every tracker data directory under a root directory
+(one per student), runs the report jobs (upcoming actions, analytics,
+suggestions) for each one in a process pool, and writes a single digest
+with every directory's reports and job timings.
+
+Directories whose data files haven't changed since their last successful
+run are skipped, and their section of the digest repeats the previous
+reports; only the upcoming actions, which move with the date, are rerun
+on a new day. A job that fails (an unreadable CSV file, a report error) is
+recorded in the digest and leaves the other jobs and directories running;
+a failed directory is rerun in full on the next run.
+
+Run once, or every day at a given time with the ``schedule`` package:
+
+    python tracker_batch.py --root DIR [--workers 4] [--digest digest.md]
+    python tracker_batch.py --root DIR --at 07:00
+"""
+import argparse
+import datetime
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from tracker_events import UpdateLog
+from tracker_journal import WriteJournal
+from tracker_locking import atomic_write
+from tracker_schema import TABLES
+from tracker_storage import SqliteStorage
+
+# Job name -> tracker method; names match the CLI subcommands
+JOBS = {
+    "upcoming": "get_upcoming_actions",
+    "analytics": "generate_analytics",
+    "suggest": "suggest_optimizations",
+}
+
+# Files holding a directory's data; derived files (indexes, caches, charts) are left out
+SOURCE_FILES = (
+    [file_name for file_name, _ in TABLES.values()]
+    + [UpdateLog.file_name, WriteJournal.file_name, WriteJournal.file_name + ".applying"]
+    + [SqliteStorage.db_name, SqliteStorage.db_name + "-wal"]
+)
+
+# Per-root record of each directory's last run, used to skip unchanged ones
+STATE_FILE_NAME = ".batch_state.json"
+
+
+def is_tracker_dir(path):
+    """Return True if a directory holds tracker data files."""
+    return any(os.path.exists(os.path.join(path, name)) for name in SOURCE_FILES)
+
+
+def discover_directories(root):
+    """Find the tracker data directories under a root directory.
+
+    Hidden directories are skipped, and a tracker directory's own
+    subdirectories (charts, snapshot) aren't searched.
+
+    Returns:
+        list: Paths relative to ``root``, sorted
+    """
+    found = []
+    for path, dirs, _ in os.walk(root):
+        if path != root and is_tracker_dir(path):
+            found.append(os.path.relpath(path, root))
+            dirs[:] = []
+            continue
+        dirs[:] = [name for name in dirs if not name.startswith(".")]
+    return sorted(found)
+
+
+def fingerprint(data_dir):
+    """Size and modification time of each data file, to detect changes between runs."""
+    state = []
+    for name in SOURCE_FILES:
+        try:
+            stat = os.stat(os.path.join(data_dir, name))
+        except FileNotFoundError:
+            continue
+        state.append([name, stat.st_size, stat.st_mtime_ns])
+    return state
+
+
+def run_directory(data_dir, jobs, backend="csv", days=7):
+    """Run report jobs for one data directory (the process pool's task).
+
+    Reports are captured as plain text. Exceptions are caught per job, so a
+    failing job doesn't stop the ones after it.
+
+    Args:
+        data_dir (str): Tracker data directory
+        jobs (list): Job names from ``JOBS``
+        backend (str): Storage backend of the directory
+        days (int): Look-ahead window of the upcoming actions job
+
+    Returns:
+        dict: "jobs" (name -> ok, seconds, error and output) and the
+        directory's "fingerprint" after the run
+    """
+    from rich.console import Console
+
+    from tracking_tool import InternshipSearchTracker
+
+    results = {}
+    try:
+        tracker = InternshipSearchTracker(data_dir=data_dir, backend=backend)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        results = {name: {"ok": False, "seconds": 0.0, "error": error, "output": ""} for name in jobs}
+        return {"jobs": results, "fingerprint": fingerprint(data_dir)}
+
+    output = io.StringIO()
+    # Messages aren't wrapped, so an error stays on one line
+    tracker.console = Console(file=output, width=100, color_system=None, soft_wrap=True)
+    # The batch's process pool already uses the CPUs
+    tracker.chart_workers = 1
+    try:
+        for name in jobs:
+            kwargs = {"days": days} if name == "upcoming" else {}
+            output.seek(0)
+            output.truncate()
+            start = time.perf_counter()
+            error = None
+            try:
+                ok = getattr(tracker, JOBS[name])(**kwargs) is not False
+            except Exception as e:
+                ok, error = False, f"{type(e).__name__}: {e}"
+            text = output.getvalue()
+            if not ok and error is None:
+                # The reports catch their own errors and print them last
+                printed = text.strip().splitlines()
+                error = printed[-1] if printed else "job failed"
+            results[name] = {"ok": ok, "seconds": time.perf_counter() - start, "error": error, "output": text}
+    finally:
+        tracker.storage.close()
+    return {"jobs": results, "fingerprint": fingerprint(data_dir)}
+
+
+def _load_state(root):
+    try:
+        with open(os.path.join(root, STATE_FILE_NAME), 'r') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_state(root, state):
+    with atomic_write(os.path.join(root, STATE_FILE_NAME), fsync=False) as file:
+        json.dump(state, file)
+
+
+def _stale_jobs(previous, jobs, current, today, days, force):
+    """Return the jobs whose last successful result can't be reused."""
+    if force or previous is None or previous["fingerprint"] != current or previous["days"] != days:
+        return list(jobs)
+    stale = []
+    for name in jobs:
+        cached = previous["jobs"].get(name)
+        # Upcoming actions depend on the date as well as the data
+        if cached is None or (name == "upcoming" and cached["date"] != today):
+            stale.append(name)
+    return stale
+
+
+def _failures(jobs):
+    return [name for name, job in jobs.items() if not job["ok"]]
+
+
+def write_digest(path, results, started, seconds):
+    """Write the consolidated digest of a batch run as Markdown.
+
+    Args:
+        path (str): Digest file
+        results (dict): Directory -> job name -> job result, with "reused"
+            and "finished" added
+        started (datetime.datetime): When the batch started
+        seconds (float): Wall-clock duration of the batch
+    """
+    failed = [name for name, jobs in results.items() if _failures(jobs)]
+    ran = [name for name, jobs in results.items() if not all(job["reused"] for job in jobs.values())]
+    lines = [
+        f"# Tracker digest ({started:%Y-%m-%d %H:%M})",
+        "",
+        f"{len(results)} directories: {len(ran)} ran, {len(results) - len(ran)} unchanged, "
+        f"{len(failed)} with failures, in {seconds:.1f} s.",
+    ]
+    if failed:
+        lines += ["", "Failures: " + ", ".join(failed)]
+    for name, jobs in results.items():
+        lines += ["", f"## {name}", "", "| Job | Status | Seconds | Finished |", "|---|---|---|---|"]
+        for job_name, job in jobs.items():
+            if not job["ok"]:
+                status = f"failed: {job['error']}"
+            else:
+                status = "unchanged" if job["reused"] else "ok"
+            lines.append(f"| {job_name} | {status} | {job['seconds']:.2f} | {job['finished']} |")
+        output = "".join(job["output"] for job in jobs.values()).strip()
+        if output:
+            lines += ["", "```", output, "```"]
+    with atomic_write(path, fsync=False) as file:
+        file.write("\n".join(lines) + "\n")
+
+
+def run_batch(root, jobs=None, workers=None, backend="csv", days=7, digest=None, force=False, console=None):
+    """Run report jobs for every tracker directory under a root directory.
+
+    Args:
+        root (str): Directory holding one data directory per student
+        jobs (list, optional): Job names from ``JOBS``, all by default
+        workers (int, optional): Process pool size, defaults to the CPU count; 1 runs in this process
+        backend (str): Storage backend of the directories
+        days (int): Look-ahead window of the upcoming actions job
+        digest (str, optional): Digest file, ``digest.md`` in the root by default
+        force (bool): Rerun jobs whose results could be reused
+        console (rich.console.Console, optional): Where to print the timing summary
+
+    Returns:
+        dict: Directory -> job name -> job result, with "reused" and "finished" added
+    """
+    from rich.console import Console
+    from rich.table import Table
+
+    console = console or Console()
+    jobs = list(jobs or JOBS)
+    workers = workers or os.cpu_count() or 1
+    started = datetime.datetime.now()
+    today = started.date().isoformat()
+    began = time.perf_counter()
+    state = _load_state(root)
+    directories = discover_directories(root)
+    tasks = {}
+    for name in directories:
+        stale = _stale_jobs(state.get(name), jobs, fingerprint(os.path.join(root, name)), today, days, force)
+        if stale:
+            tasks[name] = stale
+
+    def record(name, result):
+        finished = datetime.datetime.now().isoformat(timespec="seconds")
+        previous = state.get(name)
+        # Jobs not rerun keep their results, which are valid for an unchanged fingerprint
+        kept = previous["jobs"] if previous and previous["fingerprint"] == result["fingerprint"] else {}
+        entry = {"fingerprint": result["fingerprint"], "days": days, "jobs": dict(kept)}
+        for job_name, job in result["jobs"].items():
+            entry["jobs"][job_name] = dict(job, finished=finished, date=today)
+        if _failures(result["jobs"]):
+            # Retried in full on the next run
+            entry["fingerprint"] = None
+        state[name] = entry
+        return entry
+
+    fresh = {}
+    if workers == 1 or len(tasks) <= 1:
+        for name, stale in tasks.items():
+            record(name, run_directory(os.path.join(root, name), stale, backend, days))
+            fresh[name] = stale
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+            futures = {
+                name: executor.submit(run_directory, os.path.join(root, name), stale, backend, days)
+                for name, stale in tasks.items()
+            }
+            for name, future in futures.items():
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # The worker process itself failed (e.g. it was killed): the other directories go on
+                    error = f"{type(e).__name__}: {e}"
+                    result = {
+                        "jobs": {job: {"ok": False, "seconds": 0.0, "error": error, "output": ""} for job in tasks[name]},
+                        "fingerprint": None
+                    }
+                record(name, result)
+                fresh[name] = tasks[name]
+
+    # Forget directories that no longer exist
+    for name in list(state):
+        if name not in directories:
+            del state[name]
+    _save_state(root, state)
+
+    results = {}
+    for name in directories:
+        stored = state[name]["jobs"]
+        results[name] = {
+            job: dict(stored[job], reused=job not in fresh.get(name, ()))
+            for job in jobs if job in stored
+        }
+    seconds = time.perf_counter() - began
+    digest = digest or os.path.join(root, "digest.md")
+    write_digest(digest, results, started, seconds)
+
+    table = Table(title="Batch Run")
+    table.add_column("Directory", style="cyan")
+    for job_name in jobs:
+        table.add_column(job_name, justify="right")
+    for name, results_by_job in results.items():
+        cells = []
+        for job_name in jobs:
+            job = results_by_job.get(job_name)
+            if job is None:
+                cells.append("[red]not run[/red]")
+            elif not job["ok"]:
+                cells.append(f"[red]failed[/red] {job['seconds']:.2f}s")
+            elif job["reused"]:
+                cells.append("[dim]unchanged[/dim]")
+            else:
+                cells.append(f"{job['seconds']:.2f}s")
+        table.add_row(name, *cells)
+    console.print(table)
+
+    failed = sum(1 for jobs_by_name in results.values() if _failures(jobs_by_name))
+    summary = f"ran {len(tasks)} of {len(results)} directories in {seconds:.1f}s; digest written to {digest}"
+    if failed:
+        console.print(f"[bold yellow]Warning:[/bold yellow] Batch {summary}; {failed} with failures")
+    else:
+        console.print(f"[bold green]Success:[/bold green] Batch {summary}")
+    return results
+
+
+def run_daily(at, **batch_options):
+    """Run ``run_batch`` every day at a given time until interrupted.
+
+    Args:
+        at (str): Time of day, "HH:MM"
+        **batch_options: Passed to ``run_batch``
+    """
+    import schedule
+
+    schedule.every().day.at(at).do(run_batch, **batch_options)
+    while True:
+        schedule.run_pending()
+        idle = schedule.idle_seconds()
+        time.sleep(min(max(idle or 0, 1), 60))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the tracker reports for many data directories.")
+    parser.add_argument("--root", required=True, help="Directory holding one data directory per student")
+    parser.add_argument("--jobs", nargs="+", choices=list(JOBS), help="Jobs to run (default: all)")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--backend", default="csv", choices=["csv", "sqlite"])
+    parser.add_argument("--days", type=int, default=7, help="Look-ahead window of the upcoming actions job")
+    parser.add_argument("--digest", help="Digest file (default: ROOT/digest.md)")
+    parser.add_argument("--force", action="store_true", help="Run unchanged directories too")
+    parser.add_argument("--at", metavar="HH:MM", help="Run every day at this time instead of once")
+    args = parser.parse_args(argv)
+
+    options = dict(root=args.root, jobs=args.jobs, workers=args.workers, backend=args.backend,
+                   days=args.days, digest=args.digest, force=args.force)
+    if args.at:
+        try:
+            run_daily(args.at, **options)
+        except KeyboardInterrupt:
+            pass
+        return 0
+    results = run_batch(**options)
+    return 1 if any(_failures(jobs) for jobs in results.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
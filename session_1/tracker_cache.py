@@ -0,0 +1,119 @@
+"""Persistent, incremental cache of the analytics aggregates for CSV data directories.
+
+Tracking files mostly grow by appends, so re-parsing them for every report
+wastes work. The cache stores, per table, the aggregates computed so far and
+the byte offset they cover. On the next load only the rows appended after
+that offset are parsed and folded in. When a file looks rewritten rather
+than appended to (it shrank, its modification time went backwards, its
+header, inode or the bytes just before the cached offset changed) that
+table is recomputed from scratch, from the storage's columnar snapshot if
+it keeps one.
+"""
+import json
+import os
+
+from tracker_analytics import TrackerAggregates
+from tracker_locking import atomic_write
+from tracker_schema import TABLES
+
+
+class AnalyticsCache:
+    """Incrementally maintained ``TrackerAggregates`` for a ``CsvStorage``."""
+
+    file_name = "analytics_cache.json"
+    version = 4
+
+    def __init__(self, storage):
+        self.storage = storage
+        self.path = os.path.join(storage.data_dir, self.file_name)
+        self._entries = None
+
+    def _read_cache(self):
+        try:
+            with open(self.path, 'r') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != self.version:
+            return {}
+        return data.get("tables", {})
+
+    def _write_cache(self):
+        with atomic_write(self.path, fsync=False) as file:
+            json.dump({"version": self.version, "tables": self._entries}, file)
+
+    def _refresh_table(self, table, chunksize=None):
+        """Bring one table's cache entry up to date.
+
+        Args:
+            table (str): Table name
+            chunksize (int, optional): Parse new rows in chunks of this many rows
+
+        Returns:
+            bool: True if the entry changed
+        """
+        entry = self._entries.get(table)
+        change = self.storage.classify_change(table, entry and entry["state"])
+
+        if change == "unchanged":
+            return False
+        if change == "appended":
+            aggregates = TrackerAggregates.from_dict(entry["aggregates"])
+            offset = entry["state"]["offset"]
+        else:
+            aggregates = TrackerAggregates()
+            offset = None
+
+        snapshot = getattr(self.storage, "snapshot", None)
+        if offset is None and snapshot is not None:
+            # Map just the aggregated columns instead of re-parsing the whole file
+            frame, offset = snapshot.load(table, TrackerAggregates.COLUMNS[table])
+            frames = [frame]
+        elif chunksize:
+            frames, offset = self.storage.read_tail_chunks(table, offset, chunksize)
+        else:
+            frame, offset = self.storage.read_tail(table, offset)
+            frames = [frame]
+        for frame in frames:
+            if len(frame):
+                aggregates.add_table(table, frame)
+
+        self._entries[table] = {
+            "state": self.storage.tail_state(table, offset),
+            "aggregates": aggregates.to_dict()
+        }
+        return True
+
+    def load(self, chunksize=None):
+        """Return up-to-date aggregates over all tables, folding in only new rows where possible.
+
+        Args:
+            chunksize (int, optional): Stream new rows in chunks of this many rows to bound memory use
+        """
+        if self._entries is None:
+            self._entries = self._read_cache()
+
+        changed = False
+        for table in TABLES:
+            changed = self._refresh_table(table, chunksize) or changed
+        if changed:
+            self._write_cache()
+
+        result = TrackerAggregates()
+        for table in TABLES:
+            result.merge(TrackerAggregates.from_dict(self._entries[table]["aggregates"]))
+        return result
+
+    def invalidate(self, table=None):
+        """Force a full recomputation of one table (or all tables) on the next load.
+
+        Not needed after updates: applying them rewrites the file, which the
+        next load detects by itself.
+        """
+        if self._entries is None:
+            self._entries = self._read_cache()
+        if table is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(table, None)
+        self._write_cache()
@@ -0,0 +1,220 @@
+"""Headless chart rendering for the tracker's analytics.
+
+Charts are drawn on object-oriented ``Figure`` instances with the Agg canvas,
+never through the global pyplot state, so nothing is kept alive between
+renders and the code runs without a display. Each chart is a top-level
+function of (output path, plain data), which lets the charts render
+concurrently in a process pool. A manifest of content hashes in the figures
+directory lets unchanged charts be skipped.
+"""
+import hashlib
+import importlib.util
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from tracker_analytics import FUNNEL_STATUSES, stage_entry_hours
+from tracker_locking import atomic_write
+
+# Bump to force every chart to re-render after changing how charts are drawn
+CHARTS_VERSION = 1
+
+
+def _new_figure(figsize):
+    """Create a Figure bound to an Agg canvas (no pyplot, no display)."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    figure = Figure(figsize=figsize)
+    FigureCanvasAgg(figure)
+    return figure
+
+
+def _save(figure, path):
+    """Write a figure to disk and release its memory.
+
+    Returns:
+        float: Seconds spent in ``savefig``
+    """
+    start = time.perf_counter()
+    try:
+        figure.savefig(path)
+        return time.perf_counter() - start
+    finally:
+        figure.clear()
+
+
+def render_platform_chart(path, data):
+    """Bar chart of response rates by platform."""
+    figure = _new_figure((10, 6))
+    ax = figure.add_subplot()
+    ax.bar(data["platforms"], data["response_rates"], color='skyblue')
+    ax.set_xlabel('Platform')
+    ax.set_ylabel('Response Rate (%)')
+    ax.set_title('Response Rates by Platform')
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
+    return _save(figure, path)
+
+
+def render_funnel_chart(path, data):
+    """Bar chart of engagement counts per funnel status, labelled with the mean time to reach each stage."""
+    figure = _new_figure((12, 6))
+    ax = figure.add_subplot()
+    bars = ax.bar(data["statuses"], data["counts"], color='lightgreen')
+    entry_hours = data.get("entry_hours")
+    if entry_hours and any(hours is not None for hours in entry_hours):
+        labels = ["" if hours is None else f"{hours:.0f}h" for hours in entry_hours]
+        ax.bar_label(bars, labels=labels, padding=3)
+    ax.set_xlabel('Status')
+    ax.set_ylabel('Count')
+    ax.set_title('Engagement Funnel')
+    ax.tick_params(axis='x', labelrotation=45)
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
+    figure.tight_layout()
+    return _save(figure, path)
+
+
+def render_wordcloud(path, data):
+    """Word cloud of technology frequencies."""
+    from wordcloud import WordCloud
+
+    wordcloud = WordCloud(width=800, height=400, background_color='white').generate_from_frequencies(data["frequencies"])
+    figure = _new_figure((10, 5))
+    ax = figure.add_subplot()
+    ax.imshow(wordcloud, interpolation='bilinear')
+    ax.axis('off')
+    ax.set_title('Technologies Word Cloud')
+    figure.tight_layout()
+    return _save(figure, path)
+
+
+def _render(job):
+    """Process pool entry point: render one (function, path, data) job.
+
+    Returns:
+        tuple: (path, total seconds, seconds spent in ``savefig``)
+    """
+    function, path, data = job
+    start = time.perf_counter()
+    savefig_seconds = function(path, data)
+    return path, time.perf_counter() - start, savefig_seconds
+
+
+def chart_jobs(analytics, timings=None):
+    """Return the charts to draw for an analytics result.
+
+    Args:
+        analytics (TrackerAggregates): Aggregated tracking data
+        timings (list, optional): Funnel stage timings from ``stage_timings``
+
+    Returns:
+        dict: File name -> (render function, chart data)
+    """
+    platform_rates = analytics.platform_response_rates()
+    jobs = {
+        'response_rates_by_platform.png': (render_platform_chart, {
+            "platforms": [str(platform) for platform in platform_rates],
+            "response_rates": list(platform_rates.values())
+        }),
+        'engagement_funnel.png': (render_funnel_chart, {
+            "statuses": FUNNEL_STATUSES,
+            "counts": analytics.funnel(),
+            "entry_hours": stage_entry_hours(timings or [])
+        }),
+    }
+    tech_counts = {str(tech): count for tech, count in analytics.top_technologies()}
+    if tech_counts and wordcloud_available():
+        jobs['technologies_wordcloud.png'] = (render_wordcloud, {"frequencies": tech_counts})
+    return jobs
+
+
+def wordcloud_available():
+    """Return True if the optional wordcloud package is installed."""
+    return importlib.util.find_spec("wordcloud") is not None
+
+
+def content_hash(function, data):
+    """Hash a chart's inputs so unchanged charts can be skipped."""
+    payload = json.dumps([CHARTS_VERSION, function.__name__, data], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ChartRenderer:
+    """Render analytics charts into a figures directory, skipping unchanged ones."""
+
+    manifest_name = ".render_manifest.json"
+
+    def __init__(self, figures_dir, max_workers=None, parallel=True):
+        """
+        Args:
+            figures_dir (str): Output directory
+            max_workers (int, optional): Process pool size, defaults to the CPU count
+            parallel (bool): Render in a process pool when more than one chart changed
+                and more than one worker is available
+        """
+        self.figures_dir = figures_dir
+        self.max_workers = max_workers
+        self.parallel = parallel
+        self.manifest_path = os.path.join(figures_dir, self.manifest_name)
+        # File name -> (total seconds, savefig seconds) of the charts drawn by the last render
+        self.render_times = {}
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, 'r') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self, manifest):
+        with atomic_write(self.manifest_path, fsync=False) as file:
+            json.dump(manifest, file, indent=2, sort_keys=True)
+
+    def _run(self, jobs):
+        workers = min(len(jobs), self.max_workers or os.cpu_count() or 1)
+        if self.parallel and workers > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    return list(executor.map(_render, jobs))
+            except (OSError, NotImplementedError, BrokenProcessPool):
+                # No process support in this environment: fall back to rendering here
+                pass
+        return [_render(job) for job in jobs]
+
+    def render(self, analytics, force=False, timings=None):
+        """Render every chart whose inputs changed since the last render.
+
+        Args:
+            analytics (TrackerAggregates): Aggregated tracking data
+            force (bool): Re-render even if the inputs are unchanged
+            timings (list, optional): Funnel stage timings from ``stage_timings``
+
+        Returns:
+            dict: File name -> "rendered" or "unchanged"
+        """
+        if not os.path.exists(self.figures_dir):
+            os.makedirs(self.figures_dir)
+
+        manifest = self._load_manifest()
+        statuses = {}
+        pending = []
+        hashes = {}
+        for name, (function, data) in chart_jobs(analytics, timings).items():
+            path = os.path.join(self.figures_dir, name)
+            digest = content_hash(function, data)
+            if not force and manifest.get(name) == digest and os.path.exists(path):
+                statuses[name] = "unchanged"
+                continue
+            pending.append((function, path, data))
+            hashes[name] = digest
+
+        self.render_times = {}
+        if pending:
+            for path, seconds, savefig_seconds in self._run(pending):
+                self.render_times[os.path.basename(path)] = (seconds, savefig_seconds)
+            manifest.update(hashes)
+            self._save_manifest(manifest)
+            statuses.update({name: "rendered" for name in hashes})
+        return statuses
@@ -0,0 +1,352 @@
+"""Asynchronous enrichment of company contacts from their LinkedIn profile URLs.
+
+Company rows carry LinkedIn URLs for the engineering manager, recruiter and
+team lead. ``Enricher`` looks them up through a pluggable provider with
+bounded concurrency, retries transient failures with exponential backoff,
+and keeps responses in a TTL cache so repeated runs only ask for what
+changed or expired. The tracker then writes every enriched field back in a
+single batched update (see ``InternshipSearchTracker.enrich_contacts``).
+
+Providers are objects with ``async lookup(url)`` returning a profile dict
+(``{"name": ..., "mutual_connections": ...}``) or None if the profile is
+unknown, and ``async close()``. ``HttpProvider`` queries a JSON HTTP service
+over a pool of keep-alive connections using only the standard library.
+``MockProvider`` and ``MockProfileServer`` stand in for a real service, so
+throughput and cache behaviour can be measured offline.
+"""
+import asyncio
+import hashlib
+import http.client
+import json
+import os
+import random
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from tracker_locking import atomic_write
+
+# (name column, LinkedIn column) of each contact on a company row
+CONTACT_COLUMNS = [
+    ("Engineering Manager Name", "Engineering Manager LinkedIn"),
+    ("Recruiter Name", "Recruiter LinkedIn"),
+    ("Team Lead Name", "Team Lead LinkedIn"),
+]
+
+# Seconds a cached profile lookup stays valid
+CACHE_TTL = 7 * 24 * 3600
+
+# HTTP statuses worth retrying
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class RetryableError(Exception):
+    """A lookup failed in a way that may succeed if tried again (rate limit, timeout, 5xx)."""
+
+
+class ResponseCache:
+    """Profile lookups by URL, expiring after ``ttl`` seconds, optionally persisted to a JSON file.
+
+    Negative results (None: profile unknown) are cached too.
+    """
+
+    def __init__(self, path=None, ttl=CACHE_TTL, max_entries=100000):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = {}      # url -> [expiry timestamp, profile]
+        self.hits = 0
+        self.misses = 0
+        if path:
+            try:
+                with open(path, 'r') as file:
+                    self._entries = json.load(file)
+            except (OSError, ValueError):
+                self._entries = {}
+
+    def get(self, url):
+        """Return (True, profile) for a fresh entry, (False, None) otherwise."""
+        entry = self._entries.get(url)
+        if entry is not None and entry[0] > time.time():
+            self.hits += 1
+            return True, entry[1]
+        self.misses += 1
+        return False, None
+
+    def put(self, url, profile):
+        self._entries[url] = [time.time() + self.ttl, profile]
+        if len(self._entries) > self.max_entries:
+            # Drop expired entries first, then the ones expiring soonest
+            now = time.time()
+            self._entries = {key: entry for key, entry in self._entries.items() if entry[0] > now}
+            if len(self._entries) > self.max_entries:
+                keep = sorted(self._entries.items(), key=lambda item: item[1][0])[-self.max_entries:]
+                self._entries = dict(keep)
+
+    def save(self):
+        if self.path:
+            with atomic_write(self.path, fsync=False) as file:
+                json.dump(self._entries, file)
+
+
+class HttpProvider:
+    """Look up profiles from a JSON HTTP service: ``GET <base_url>?url=<profile url>``.
+
+    Requests run on a small thread pool, each thread borrowing a keep-alive
+    connection from a shared pool, so at most ``pool_size`` connections are
+    open at once.
+    """
+
+    def __init__(self, base_url, pool_size=8, timeout=10, headers=None):
+        """
+        Args:
+            base_url (str): Endpoint URL, e.g. "http://127.0.0.1:8000/profiles"
+            pool_size (int): Maximum open connections (and concurrent requests)
+            timeout (float): Socket timeout in seconds
+            headers (dict, optional): Extra request headers, e.g. an API key
+        """
+        parts = urllib.parse.urlsplit(base_url)
+        self._connection_type = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        self._host = parts.netloc
+        self._path = parts.path or "/"
+        self.timeout = timeout
+        self.headers = dict(headers or {})
+        self.pool_size = pool_size
+        self._pool = []
+        self._pool_lock = threading.Lock()
+        self._executor = None
+
+    def _connection(self):
+        with self._pool_lock:
+            if self._pool:
+                return self._pool.pop()
+        return self._connection_type(self._host, timeout=self.timeout)
+
+    def _release(self, connection):
+        with self._pool_lock:
+            self._pool.append(connection)
+
+    def _get(self, url):
+        """Blocking request on a pooled connection (runs on the thread pool)."""
+        query = urllib.parse.urlencode({"url": url})
+        connection = self._connection()
+        try:
+            connection.request("GET", f"{self._path}?{query}", headers=self.headers)
+            response = connection.getresponse()
+            body = response.read()
+        except (OSError, http.client.HTTPException) as e:
+            connection.close()
+            raise RetryableError(f"Request for {url} failed: {e}") from e
+        self._release(connection)
+
+        if response.status == 404:
+            return None
+        if response.status in RETRY_STATUSES:
+            raise RetryableError(f"Request for {url} returned HTTP {response.status}")
+        if response.status != 200:
+            raise ValueError(f"Request for {url} returned HTTP {response.status}")
+        return json.loads(body)
+
+    async def lookup(self, url):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.pool_size)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self._get, url)
+
+    async def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        with self._pool_lock:
+            for connection in self._pool:
+                connection.close()
+            self._pool.clear()
+
+
+def mock_profile(url):
+    """Deterministic fake profile for a LinkedIn URL (".../in/jane-smith" -> "Jane Smith")."""
+    slug = urllib.parse.urlsplit(url).path.rstrip("/").rsplit("/", 1)[-1]
+    digest = int(hashlib.sha1(url.encode('utf-8')).hexdigest(), 16)
+    return {
+        "name": " ".join(part.capitalize() for part in slug.replace("_", "-").split("-") if part) or None,
+        "mutual_connections": digest % 25
+    }
+
+
+class MockProvider:
+    """In-process stand-in provider with simulated latency and transient failures."""
+
+    def __init__(self, latency=0.02, failure_rate=0.0, seed=0):
+        """
+        Args:
+            latency (float): Seconds per lookup
+            failure_rate (float): Share of lookups that raise ``RetryableError``
+            seed (int): Seed for the failure pattern
+        """
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self.calls = 0
+
+    async def lookup(self, url):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        if self._random.random() < self.failure_rate:
+            raise RetryableError(f"Simulated failure for {url}")
+        return mock_profile(url)
+
+    async def close(self):
+        pass
+
+
+class MockProfileServer:
+    """Local HTTP server answering ``GET /profiles?url=...`` with ``mock_profile`` data.
+
+    Use as a context manager; ``base_url`` points ``HttpProvider`` at it.
+    """
+
+    def __init__(self, latency=0.0):
+        latency_seconds = latency
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately; don't let Nagle's algorithm delay the body
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                query = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)
+                if latency_seconds:
+                    time.sleep(latency_seconds)
+                body = json.dumps(mock_profile(query.get("url", [""])[0])).encode('utf-8')
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/profiles"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class Enricher:
+    """Fan profile lookups out over a provider with bounded concurrency, retries and caching."""
+
+    def __init__(self, provider, concurrency=8, retries=3, backoff=0.5, cache=None):
+        """
+        Args:
+            provider: Object with ``async lookup(url)`` and ``async close()``
+            concurrency (int): Maximum lookups in flight
+            retries (int): Extra attempts after a ``RetryableError``
+            backoff (float): Delay before the first retry; doubles (with jitter) each attempt
+            cache (ResponseCache, optional): Response cache, in-memory by default
+        """
+        self.provider = provider
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.cache = cache if cache is not None else ResponseCache()
+        self.stats = {"requests": 0, "cache_hits": 0, "retries": 0, "failures": 0, "seconds": 0.0}
+
+    async def _lookup(self, url, semaphore):
+        async with semaphore:
+            for attempt in range(self.retries + 1):
+                try:
+                    self.stats["requests"] += 1
+                    return await self.provider.lookup(url)
+                except (RetryableError, asyncio.TimeoutError):
+                    if attempt == self.retries:
+                        raise
+                    self.stats["retries"] += 1
+                    await asyncio.sleep(self.backoff * (2 ** attempt) * random.uniform(1, 1.5))
+
+    async def enrich(self, urls):
+        """Look up every distinct URL once, serving fresh cache entries without a request.
+
+        Args:
+            urls (iterable): Profile URLs
+
+        Returns:
+            dict: URL -> profile dict (or None if unknown); URLs whose lookup failed are left out
+        """
+        start = time.perf_counter()
+        profiles = {}
+        pending = []
+        for url in dict.fromkeys(urls):
+            cached, profile = self.cache.get(url)
+            if cached:
+                profiles[url] = profile
+                self.stats["cache_hits"] += 1
+            else:
+                pending.append(url)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        results = await asyncio.gather(
+            *(self._lookup(url, semaphore) for url in pending), return_exceptions=True
+        )
+
+        for url, result in zip(pending, results):
+            if isinstance(result, Exception):
+                self.stats["failures"] += 1
+                continue
+            profiles[url] = result
+            self.cache.put(url, result)
+        self.cache.save()
+        self.stats["seconds"] += time.perf_counter() - start
+        return profiles
+
+
+def enrichment_changes(companies, profiles, overwrite=False):
+    """Work out the column changes that enriched profiles make to company rows.
+
+    Missing contact names are filled from the profiles, and "Mutual
+    Connections" is set to the total across the company's contacts.
+
+    Args:
+        companies (list): Company row dicts
+        profiles (dict): URL -> profile, from ``Enricher.enrich``
+        overwrite (bool): Replace values that are already filled in
+
+    Returns:
+        dict: Company name -> changes, for companies with anything to change
+    """
+    updates = {}
+    for company in companies:
+        changes = {}
+        mutual = None
+        for name_column, url_column in CONTACT_COLUMNS:
+            profile = profiles.get(company.get(url_column) or "")
+            if not profile:
+                continue
+            if profile.get("name") and (overwrite or not company.get(name_column)):
+                changes[name_column] = profile["name"]
+            if profile.get("mutual_connections") is not None:
+                mutual = (mutual or 0) + int(profile["mutual_connections"])
+        if mutual is not None and (overwrite or not company.get("Mutual Connections")):
+            changes["Mutual Connections"] = str(mutual)
+        changes = {column: value for column, value in changes.items() if company.get(column) != value}
+        if changes:
+            updates[company["Company Name"]] = changes
+    return updates
+
+
+def cache_path(data_dir):
+    """Default location of a data directory's enrichment cache."""
+    return os.path.join(data_dir, "enrichment_cache.json")
@@ -0,0 +1,620 @@
+"""Entity resolution between the engagements and the companies they refer to.
+
+Engagements name their company and contact in free text, so one company
+shows up as "Example Tech", "Example Tech, Inc." and "example tech". Names
+are first reduced to a key (accents, case, punctuation, a leading "the" and
+legal suffixes dropped, common words abbreviated); keys that are equal name
+the same entity. Names whose key is new are matched approximately against
+the known companies through a character trigram index: only companies
+sharing enough reasonably rare trigrams with the name are scored
+(blocking), so resolving a name costs a few posting list scans instead of
+a comparison with every company. Candidates are scored by edit similarity,
+which, unlike trigram overlap, barely drops for a swapped pair of letters.
+Numbers must match exactly, so "Company 12" never resolves to "Company 13".
+Contacts are matched the same way, but only among the contacts of the
+resolved company.
+
+``EntityResolver`` stores the resulting canonical ids (the key of the
+company a name resolves to) in the data directory. Like the other indexes
+over the CSV tables, it folds in rows appended to either table by byte
+offset (by rowid with SQLite) and rebuilds only after a rewrite or update
+that may have changed a name.
+The contacts, the bulk of the data, are kept in a second file that is only
+read when a contact is looked up.
+"""
+import json
+import os
+import re
+import unicodedata
+import uuid
+from collections import Counter
+from difflib import SequenceMatcher
+from functools import lru_cache
+
+from tracker_index import SAVE_AFTER_ROWS
+from tracker_locking import atomic_write
+
+# Trailing words that don't distinguish companies
+LEGAL_SUFFIXES = {
+    "inc", "incorporated", "llc", "ltd", "limited", "corp", "corporation", "co", "company",
+    "plc", "gmbh", "ag", "sa", "lp", "llp", "pllc", "holdings", "group"
+}
+
+# Words written several ways, mapped to one spelling
+ABBREVIATIONS = {
+    "technologies": "tech", "technology": "tech", "international": "intl",
+    "laboratories": "labs", "laboratory": "labs", "and": "&"
+}
+
+# Titles and suffixes dropped from contact names
+NAME_AFFIXES = {"dr", "mr", "mrs", "ms", "mx", "prof", "jr", "sr", "ii", "iii", "iv", "phd", "md", "mba"}
+
+# Minimum similarity (``similarity``) of two names for an approximate match
+MATCH_THRESHOLD = 0.85
+
+# Minimum share of trigrams (Dice coefficient) a candidate must share with a
+# name to be scored; one typo in a short word already changes several trigrams
+CANDIDATE_OVERLAP = 0.3
+
+# Trigrams shared by more entities than this are too common to block on
+MAX_POSTING = 500
+
+# Candidates scored per lookup, those sharing the most trigrams first
+MAX_CANDIDATES = 20
+
+_TOKEN = re.compile(r"[a-z0-9&]+")
+
+
+def _tokens(name):
+    """Split a name into lower-case ASCII word tokens."""
+    text = name or ""
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text)
+        text = "".join(char for char in text if not unicodedata.combining(char))
+    # "L.L.C." and "Node.js" become single words
+    return _TOKEN.findall(text.casefold().replace(".", "").replace("'", ""))
+
+
+@lru_cache(maxsize=65536)
+def normalize_company(name):
+    """Return the matching key of a company name ("" if it has no words)."""
+    tokens = [ABBREVIATIONS.get(token, token) for token in _tokens(name)]
+    if len(tokens) > 1 and tokens[0] == "the":
+        tokens = tokens[1:]
+    # Keep at least one word: "The Company" is still a name
+    while len(tokens) > 1 and tokens[-1] in LEGAL_SUFFIXES:
+        tokens.pop()
+    return " ".join(tokens)
+
+
+@lru_cache(maxsize=65536)
+def normalize_contact(name):
+    """Return the matching key of a person's name ("" if it has no words)."""
+    tokens = _tokens(name)
+    while len(tokens) > 1 and tokens[0] in NAME_AFFIXES:
+        tokens.pop(0)
+    while len(tokens) > 1 and tokens[-1] in NAME_AFFIXES:
+        tokens.pop()
+    return " ".join(tokens)
+
+
+def trigrams(key):
+    """Return the set of character trigrams of a key, padded so short keys have some."""
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _numbers(key):
+    return re.findall(r"\d+", key)
+
+
+def similarity(a, b):
+    """Edit similarity of two keys between 0 and 1 (``SequenceMatcher`` ratio)."""
+    if a == b:
+        return 1.0
+    return SequenceMatcher(None, a, b, autojunk=False).ratio()
+
+
+class NgramIndex:
+    """Blocking index over entity keys for approximate lookups.
+
+    Keys containing numbers can only match keys with the same numbers, so
+    they are blocked on their numbers alone; other keys are blocked on
+    their trigrams.
+    """
+
+    def __init__(self, threshold=MATCH_THRESHOLD, max_posting=MAX_POSTING):
+        self.threshold = threshold
+        self.max_posting = max_posting
+        self._postings = {}     # trigram -> keys without numbers
+        self._numbered = {}     # numbers in a key -> keys with those numbers
+        self._sizes = {}        # key -> number of trigrams
+
+    def __len__(self):
+        return len(self._sizes)
+
+    def remove(self, key):
+        """Drop an entity key from the index (no-op if it isn't indexed)."""
+        if self._sizes.pop(key, None) is None:
+            return
+        numbers = _numbers(key)
+        postings = [self._numbered.get(tuple(numbers))] if numbers else [self._postings.get(gram) for gram in trigrams(key)]
+        for posting in postings:
+            if posting is not None and key in posting:
+                posting.remove(key)
+
+    def add(self, key):
+        """Index an entity key (no-op if it is already indexed)."""
+        if key in self._sizes:
+            return
+        grams = trigrams(key)
+        self._sizes[key] = len(grams)
+        numbers = _numbers(key)
+        if numbers:
+            self._numbered.setdefault(tuple(numbers), []).append(key)
+            return
+        for gram in grams:
+            self._postings.setdefault(gram, []).append(key)
+
+    def match(self, key):
+        """Return the indexed key most similar to ``key``, or None if none reaches the threshold.
+
+        Only keys sharing trigrams that aren't too common are candidates,
+        and of those whose trigram overlap can reach ``CANDIDATE_OVERLAP``,
+        the ``MAX_CANDIDATES`` sharing the most trigrams are scored.
+        """
+        if key in self._sizes:
+            return key
+        numbers = _numbers(key)
+        if numbers:
+            return self._best(key, self._numbered.get(tuple(numbers), ()))
+
+        grams = trigrams(key)
+        shared = Counter()
+        common = 0
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if posting is None:
+                continue
+            if len(posting) > self.max_posting:
+                common += 1
+            else:
+                shared.update(posting)
+
+        # Common trigrams weren't counted: assume a candidate has them all
+        candidates = [
+            candidate for candidate, count in shared.most_common(MAX_CANDIDATES)
+            if 2 * (count + common) / (len(grams) + self._sizes[candidate]) >= CANDIDATE_OVERLAP
+        ]
+        return self._best(key, candidates)
+
+    def _best(self, key, candidates):
+        """Return the candidate most similar to ``key`` if it reaches the threshold."""
+        best, best_score = None, self.threshold
+        matcher = SequenceMatcher(None, autojunk=False)
+        # SequenceMatcher caches what it learns about its second sequence
+        matcher.set_seq2(key)
+        for candidate in candidates:
+            matcher.set_seq1(candidate)
+            # Cheap upper bounds first
+            if matcher.real_quick_ratio() < best_score or matcher.quick_ratio() < best_score:
+                continue
+            score = matcher.ratio()
+            if score > best_score or (score == best_score and best is None):
+                best, best_score = candidate, score
+        return best
+
+
+def _only_appended(before, after):
+    """True if ``change_token`` values [last rowid, rows, updates] differ only by appended rows."""
+    if before is None:
+        return False
+    return after[2] == before[2] and after[0] >= before[0] and after[1] - before[1] == after[0] - before[0]
+
+
+class EntityResolver:
+    """Canonical company and contact ids for the names used in a tracker's tables."""
+
+    file_name = "entity_map.json"
+    contacts_file_name = "entity_contacts.json"
+    version = 2
+
+    # Companies first, so engagement spellings resolve to the companies table's entities
+    tables = ("companies", "engagements")
+
+    # Columns the ids are built from; rewrites that keep them don't need a rebuild
+    columns = {"Company Name", "Company", "Contact Name"}
+
+    def __init__(self, storage, threshold=MATCH_THRESHOLD, chunksize=None):
+        """
+        Args:
+            storage (TrackerStorage): Tracker storage
+            threshold (float): Minimum similarity for an approximate match
+            chunksize (int, optional): Read the tables in chunks of this many rows
+        """
+        self.storage = storage
+        self.threshold = threshold
+        self.chunksize = chunksize
+        self.path = os.path.join(storage.data_dir, self.file_name)
+        self.contacts_path = os.path.join(storage.data_dir, self.contacts_file_name)
+        # CSV storage: table -> tail state of the rows folded in. Other backends:
+        # table -> change token (of the name columns) of the table the ids were built from
+        self._states = None
+        self._loaded = False
+        self._reset()
+
+    def _reset(self):
+        self.companies = {}     # company name as written -> canonical id
+        self.names = {}         # canonical id -> display name (the companies table's spelling if any)
+        self.tracked = set()    # canonical ids of the companies in the companies table
+        # canonical company id -> {contact key: [contact name, company name]}; None until
+        # read from the contacts file, with the changes made to it meanwhile pending
+        self._contacts = {}
+        self._pending_contacts = []
+        self._contacts_id = None    # identifies the contacts file written with the ids
+        self._index = NgramIndex(self.threshold)
+
+    # Building
+
+    def _add_company(self, name, fuzzy=True):
+        """Return the canonical id of a company name, creating an entity if nothing matches.
+
+        Args:
+            name (str): Company name as written
+            fuzzy (bool): Also match approximately. Rows of the companies table
+                are distinct companies unless their keys are equal, so they don't.
+        """
+        canonical = self.companies.get(name)
+        if canonical is not None:
+            return canonical
+        key = normalize_company(name)
+        if not key:
+            # Blank or punctuation only: only the exact spelling names it
+            canonical = name
+        else:
+            index = self._ngrams()
+            canonical = index.match(key) if fuzzy else (key if key in self.names else None)
+            if canonical is None:
+                if not fuzzy and len(self.names) > len(self.tracked):
+                    # A company added after engagements that spelled it differently:
+                    # their entity becomes this company's, as if it had been added first
+                    stray = index.match(key)
+                    if stray is not None and stray not in self.tracked:
+                        self._merge(stray, key)
+                canonical = key
+                index.add(key)
+        self.names.setdefault(canonical, name)
+        self.companies[name] = canonical
+        return canonical
+
+    def _merge(self, stray, canonical):
+        """Re-point the spellings and contacts of an engagement-only entity to another id."""
+        self._ngrams().remove(stray)
+        self.names.pop(stray, None)
+        for name, target in self.companies.items():
+            if target == stray:
+                self.companies[name] = canonical
+        self._merge_contacts(stray, canonical)
+
+    def _merge_contacts(self, stray, canonical):
+        if self._contacts is None:
+            self._pending_contacts.append(("merge", stray, canonical))
+            return
+        contacts = self._contacts.pop(stray, None)
+        if contacts:
+            self._contacts.setdefault(canonical, {}).update(contacts)
+
+    def _add_company_names(self, names):
+        """Add the names of companies table rows, in row order."""
+        for name in names:
+            canonical = self._add_company(name, fuzzy=False)
+            if canonical not in self.tracked:
+                # The companies table's spelling names the entity
+                self.tracked.add(canonical)
+                self.names[canonical] = name
+
+    def _add_contact(self, canonical, contact, company):
+        """Record an engagement's contact as the latest one under its key."""
+        if self._contacts is None:
+            self._pending_contacts.append(("contact", canonical, contact, company))
+            return
+        key = normalize_contact(contact)
+        if key:
+            contacts = self._contacts.setdefault(canonical, {})
+            # Re-insert so iteration order follows recency
+            contacts.pop(key, None)
+            contacts[key] = [contact, company]
+
+    def _add_frame(self, table, frame):
+        """Fold in a DataFrame of rows (rebuilds and chunked reads)."""
+        import numpy as np
+        import pandas as pd
+
+        if not len(frame):
+            return
+        if table == "companies":
+            self._add_company_names(frame["Company Name"].fillna("").tolist())
+            return
+
+        # Resolve each distinct company spelling once
+        codes, uniques = pd.factorize(frame["Company"].fillna(""))
+        ids = np.array([self._add_company(name) for name in uniques] + [""], dtype=object)[codes]
+
+        # The last row of each (contact, company) spelling is its latest engagement
+        pairs = pd.DataFrame({"contact": frame["Contact Name"].fillna(""), "company": frame["Company"].fillna("")})
+        pairs["id"] = ids
+        latest = pairs.drop_duplicates(["contact", "company"], keep="last")
+        for contact, company, canonical in zip(*(latest[column].tolist() for column in latest.columns)):
+            self._add_contact(canonical, contact, company)
+
+    def _add_rows(self, table, rows):
+        """Fold in row dicts (appended rows, read without loading pandas)."""
+        if table == "companies":
+            self._add_company_names(row.get("Company Name") or "" for row in rows)
+            return
+        for row in rows:
+            contact, company = row.get("Contact Name") or "", row.get("Company") or ""
+            self._add_contact(self._add_company(company), contact, company)
+
+    def _load(self):
+        self._loaded = True
+        try:
+            with open(self.path, 'r') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != self.version:
+            return
+        self._reset()
+        self.companies = data["companies"]
+        self.names = data["names"]
+        self.tracked = set(data["tracked"])
+        self._contacts = None
+        self._contacts_id = data["contacts_id"]
+        # Rebuilt on first use: lookups of known spellings don't need it
+        self._index = None
+        self._states = data["states"]
+
+    @property
+    def contacts(self):
+        """Canonical company id -> {contact key: [contact name, company name]}, read on first use."""
+        return self._read_contacts()
+
+    def _read_contacts(self):
+        if self._contacts is None:
+            try:
+                with open(self.contacts_path, 'r') as file:
+                    data = json.load(file)
+            except (OSError, ValueError):
+                data = {}
+            if data.get("version") != self.version or data.get("id") != self._contacts_id:
+                # Missing, or not the file saved with the ids: rebuild both
+                self._states = None
+                self.refresh()
+            else:
+                self._contacts = data["contacts"]
+                pending, self._pending_contacts = self._pending_contacts, []
+                for change in pending:
+                    if change[0] == "merge":
+                        self._merge_contacts(*change[1:])
+                    else:
+                        self._add_contact(*change[1:])
+        return self._contacts
+
+    def _ngrams(self):
+        """Return the blocking index of the entity ids, building it after a load."""
+        if self._index is None:
+            self._index = NgramIndex(self.threshold)
+            for canonical in self.names:
+                if normalize_company(canonical):
+                    self._index.add(canonical)
+        return self._index
+
+    def _save(self):
+        if self._pending_contacts:
+            self._read_contacts()
+        if self._contacts is not None:
+            # Written first: if the ids file isn't written after it, the ids don't
+            # name it and a later read rebuilds instead of using mismatched contacts
+            self._contacts_id = uuid.uuid4().hex
+            with atomic_write(self.contacts_path, fsync=False) as file:
+                file.write(json.dumps({"version": self.version, "id": self._contacts_id, "contacts": self._contacts}))
+        data = {
+            "version": self.version,
+            "states": self._states,
+            "contacts_id": self._contacts_id,
+            "companies": self.companies,
+            "names": self.names,
+            "tracked": sorted(self.tracked)
+        }
+        with atomic_write(self.path, fsync=False) as file:
+            # dumps encodes in one C call, dump in many small writes
+            file.write(json.dumps(data))
+
+    def refresh(self, chunksize=None):
+        """Bring the ids up to date with both tables.
+
+        Rows appended since the last call are folded in, and only a rewrite
+        (CSV) or update (SQLite) that may have changed a name rebuilds the ids.
+
+        Args:
+            chunksize (int, optional): Read rows in chunks of this many rows (default: the resolver's)
+
+        Returns:
+            bool: True if the ids changed
+        """
+        chunksize = chunksize or self.chunksize
+        if not self._loaded:
+            self._load()
+        if not hasattr(self.storage, "classify_change"):
+            return self._refresh_from_tokens(chunksize)
+
+        states = self._states or {}
+        # Updates to the name columns are applied right away, so pending ones can wait
+        changes = {table: self.storage.classify_change(table, states.get(table), apply_updates=False) for table in self.tables}
+        if all(change == "unchanged" for change in changes.values()):
+            return False
+        rebuild = "rewritten" in changes.values()
+        if rebuild:
+            self._reset()
+            states = {}
+
+        added = 0
+        new_states = {}
+        for table in self.tables:
+            if changes[table] == "unchanged" and not rebuild:
+                new_states[table] = states[table]
+                continue
+            offset = states[table]["offset"] if table in states else None
+            if chunksize:
+                frames, offset = self.storage.read_tail_chunks(table, offset, chunksize)
+            elif rebuild:
+                frame, offset = self.storage.read_tail(table, offset)
+                frames = [frame]
+            else:
+                # Appended rows are usually few: read them the way the other indexes do
+                rows, offset = self.storage.read_tail_rows(table, offset)
+                self._add_rows(table, rows)
+                added += len(rows)
+                frames = []
+            for frame in frames:
+                self._add_frame(table, frame)
+                added += len(frame)
+            new_states[table] = self.storage.tail_state(table, offset)
+        self._states = new_states
+        if rebuild or added >= SAVE_AFTER_ROWS:
+            self._save()
+        return True
+
+    def _refresh_from_tokens(self, chunksize):
+        """Bring the ids up to date through the tables' change tokens (non-CSV backends).
+
+        With a backend that can list the rows after a rowid (SQLite), rows
+        appended since the ids were built are folded in; any other change,
+        such as an update of a name column, rebuilds them.
+        """
+        tokens = {table: self.storage.change_token(table, self.columns) for table in self.tables}
+        if None in tokens.values():
+            # The backend can't tell whether anything changed: rebuild and don't store the ids
+            self._reset()
+            self._states = None
+            for table in self.tables:
+                for frame in self.storage.iter_frames(table, chunksize):
+                    self._add_frame(table, frame)
+            return True
+
+        states = self._states or {}
+        if states == tokens:
+            return False
+        appended = hasattr(self.storage, "iter_rows_after") and all(
+            _only_appended(states.get(table), tokens[table]) for table in self.tables
+        )
+        added = 0
+        if appended:
+            for table in self.tables:
+                rows = list(self.storage.iter_rows_after(table, states[table][0]))
+                self._add_rows(table, rows)
+                added += len(rows)
+        else:
+            self._reset()
+            for table in self.tables:
+                for frame in self.storage.iter_frames(table, chunksize):
+                    self._add_frame(table, frame)
+        self._states = tokens
+        if not appended or added >= SAVE_AFTER_ROWS:
+            self._save()
+        return True
+
+    def catch_up(self):
+        """Fold in appended rows ahead of a rewrite that keeps the name columns (see ``resync``).
+
+        Does nothing if the ids were never built: the next refresh builds them anyway.
+        """
+        if not self._loaded:
+            self._load()
+        if self._states:
+            self.refresh()
+
+    def resync(self, table):
+        """Accept a CSV table's current file as folded in after a rewrite that kept the name columns.
+
+        The caller calls ``catch_up`` right before the rewrite, which must
+        change neither the row order nor any of ``columns``.
+        """
+        if not self._loaded:
+            self._load()
+        if not self._states or table not in self._states:
+            return
+        # The rewrite re-serializes every row, so the processed offset is now the file size
+        size = os.path.getsize(self.storage.csv_path(table))
+        self._states[table] = self.storage.tail_state(table, size)
+        self._save()
+
+    # Lookups
+
+    def company_id(self, name):
+        """Return the canonical id a company name resolves to, or None if it matches no known company."""
+        self.refresh()
+        canonical = self.companies.get(name)
+        if canonical is None:
+            key = normalize_company(name)
+            canonical = self._ngrams().match(key) if key else None
+        return canonical
+
+    def canonical_company(self, name):
+        """Return the companies-table spelling of the company a name resolves to, or None.
+
+        Returns None for names that only match companies never added to the
+        companies table (engagement-only companies).
+        """
+        canonical = self.company_id(name)
+        if canonical not in self.tracked:
+            return None
+        return self.names[canonical]
+
+    def latest_engagement(self, contact_name, company):
+        """Return the (contact name, company) spelling of the latest engagement with a contact.
+
+        The company is resolved first, then the contact among that
+        company's contacts, exactly by key or approximately by edit
+        similarity.
+
+        Returns:
+            tuple: (contact name, company) as written in the engagements table, or None
+        """
+        canonical = self.company_id(company)
+        contacts = self.contacts.get(canonical) if canonical is not None else None
+        if not contacts:
+            return None
+        key = normalize_contact(contact_name)
+        match = contacts.get(key)
+        if match is None and key:
+            numbers = _numbers(key)
+            best_score = self.threshold
+            for candidate, spelling in contacts.items():
+                if _numbers(candidate) != numbers:
+                    continue
+                score = similarity(key, candidate)
+                if score >= best_score:
+                    match, best_score = spelling, score
+        return tuple(match) if match is not None else None
+
+    def variants(self):
+        """Return canonical ids with more than one spelling, as {display name: [spellings]}."""
+        self.refresh()
+        spellings = {}
+        for name, canonical in self.companies.items():
+            spellings.setdefault(canonical, []).append(name)
+        return {
+            self.names[canonical]: sorted(names)
+            for canonical, names in spellings.items() if len(names) > 1
+        }
+
+    def company_ids(self, chunksize=None):
+        """Return every company name seen in either table mapped to its canonical id.
+
+        Args:
+            chunksize (int, optional): Read new rows in chunks of this many rows
+        """
+        self.refresh(chunksize)
+        return self.companies
@@ -0,0 +1,168 @@
+"""Append-only log of status and response updates.
+
+Updating a CSV row in place means rewriting the whole file. The CSV backend
+instead appends each update as a small event (an O(1) write) and leaves the
+files as they are. Pending events are compacted into the files in one
+rewrite per table: lazily, before the next read, or as soon as the log
+passes a size or age threshold. Compaction is idempotent, since events only
+assign values, so a compaction interrupted by a crash is simply run again.
+
+Compacted events move to a history file instead of being dropped. The
+history records when every status changed, which gives the time spent
+between funnel stages (see ``stage_timings``).
+"""
+import datetime
+import json
+import os
+import uuid
+
+from tracker_locking import claim_file, locked_append
+
+# Pending log size that triggers compaction when an update is logged
+COMPACT_AFTER_BYTES = 1 << 20
+
+# Age of the oldest pending update that triggers compaction when an update is logged (None: no limit)
+COMPACT_AFTER_SECONDS = None
+
+
+def new_event(table, key, changes, rows=None, previous=None):
+    """Create an update event.
+
+    Args:
+        table (str): "companies" or "engagements"
+        key (list): [company name] or [contact name, company]
+        changes (dict): Column values to assign
+        rows (int, optional): For engagements, the number of rows when the update
+            was made; only those rows are candidates for the "latest engagement"
+        previous (dict, optional): {"status", "time"} of the row before the update,
+            when known, so the first logged change still has a start status
+            (and a start time, if "time" has a time of day rather than a date)
+
+    Returns:
+        dict: JSON-serializable event
+    """
+    event = {
+        "id": uuid.uuid4().hex,
+        "time": datetime.datetime.now().isoformat(timespec="seconds"),
+        "table": table,
+        "key": list(key),
+        "changes": changes
+    }
+    if rows is not None:
+        event["rows"] = rows
+    if previous is not None:
+        event["previous"] = previous
+    return event
+
+
+def _read_events(path):
+    events = []
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            for line in file:
+                try:
+                    events.append(json.loads(line))
+                except ValueError:
+                    # Torn write from a process that crashed mid-append
+                    continue
+    except FileNotFoundError:
+        pass
+    return events
+
+
+class UpdateLog:
+    """Pending and applied update events of a data directory."""
+
+    file_name = "update_events.jsonl"
+    history_name = "update_history.jsonl"
+
+    def __init__(self, data_dir, compact_after_bytes=COMPACT_AFTER_BYTES, compact_after_seconds=COMPACT_AFTER_SECONDS):
+        """
+        Args:
+            data_dir (str): Data directory
+            compact_after_bytes (int): Pending log size that makes ``due`` return True
+            compact_after_seconds (float, optional): Age of the oldest pending event that makes ``due`` return True
+        """
+        self.path = os.path.join(data_dir, self.file_name)
+        self.claimed_path = self.path + ".applying"
+        self.history_path = os.path.join(data_dir, self.history_name)
+        self.compact_after_bytes = compact_after_bytes
+        self.compact_after_seconds = compact_after_seconds
+
+    def append(self, event):
+        """Durably log one pending event."""
+        self.extend([event])
+
+    def extend(self, events):
+        """Durably log a batch of pending events with one write."""
+        data = "".join(json.dumps(event) + "\n" for event in events)
+        locked_append(self.path, data.encode('utf-8'), fsync=True)
+
+    def has_pending(self):
+        """Return True if events are waiting to be compacted (cheap: two ``stat`` calls)."""
+        if os.path.exists(self.claimed_path):
+            return True
+        try:
+            return os.path.getsize(self.path) > 0
+        except OSError:
+            return False
+
+    def due(self):
+        """Return True if the pending events passed a compaction threshold."""
+        if os.path.exists(self.claimed_path):
+            return True
+        try:
+            if os.path.getsize(self.path) >= self.compact_after_bytes:
+                return True
+            if self.compact_after_seconds is None:
+                return False
+            with open(self.path, 'r', encoding='utf-8') as file:
+                oldest = json.loads(file.readline())["time"]
+        except (OSError, ValueError, KeyError):
+            return False
+        age = datetime.datetime.now() - datetime.datetime.fromisoformat(oldest)
+        return age.total_seconds() >= self.compact_after_seconds
+
+    def claim(self):
+        """Move the pending events aside for compaction (hold the directory's write lock).
+
+        Returns:
+            list: Claimed events in the order they were logged, or None if nothing is pending
+        """
+        if not claim_file(self.path, self.claimed_path):
+            return None
+        return _read_events(self.claimed_path)
+
+    def finish(self, events):
+        """Move compacted events into the history."""
+        self.record_applied(events)
+        os.remove(self.claimed_path)
+
+    def record_applied(self, events):
+        """Add events that were applied directly (e.g. by the SQLite backend) to the history."""
+        if events:
+            data = "".join(json.dumps(event) + "\n" for event in events)
+            locked_append(self.history_path, data.encode('utf-8'), fsync=True)
+
+    def history(self, include_pending=True):
+        """Return every logged update, oldest first.
+
+        Args:
+            include_pending (bool): Include events not compacted yet
+
+        Returns:
+            list: Event dicts (see ``new_event``)
+        """
+        paths = [self.history_path]
+        if include_pending:
+            paths += [self.claimed_path, self.path]
+        events = []
+        seen = set()
+        for path in paths:
+            for event in _read_events(path):
+                # A crash between writing the history and removing the claimed
+                # events can leave an event in both files
+                if event["id"] not in seen:
+                    seen.add(event["id"])
+                    events.append(event)
+        return events
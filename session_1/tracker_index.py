@@ -0,0 +1,320 @@
+"""Persistent indexes over the CSV tables that follow appends.
+
+Each index is stored next to the CSV files and, like the analytics cache,
+folds in appended rows by byte offset and rebuilds only after a rewrite.
+
+``NextActionIndex`` is a sorted date index over the engagements' "Next
+Action Date" column. It holds (date, row id) keys in sorted order, so a date
+window is found with two binary searches and only the matching rows are
+touched: O(log n + k) per query instead of parsing and filtering the whole
+file. Each key carries the few columns the upcoming-actions report shows.
+The keys are saved as fixed-width binary records, and the binary searches
+seek through the file, so a new process (such as one CLI run) reads O(log n
++ k) records of it rather than parsing the whole index first.
+"""
+import bisect
+import datetime
+import heapq
+import json
+import os
+import struct
+
+from tracker_locking import atomic_write
+
+# Appended rows folded in before the index is written back to disk; smaller
+# tails are cheap to re-read, while rewriting the index file is not
+SAVE_AFTER_ROWS = 1000
+
+# Saved next-action key: ISO date, row id, and the offset and length of the
+# row's action text (a JSON list) after the keys
+KEY_RECORD = struct.Struct("<10sIQI")
+
+# Key records read at once while streaming a date window
+READ_RECORDS = 1024
+
+# Date formats accepted in "Next Action Date", tried in order after ISO format
+DATE_FORMATS = ["%m/%d/%Y", "%Y/%m/%d", "%m/%d/%y", "%d %b %Y", "%b %d, %Y"]
+
+
+def parse_date(value):
+    """Parse a next-action date to an ISO "YYYY-MM-DD" string, or None if it isn't a date."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return datetime.date.fromisoformat(value[:10]).isoformat()
+    except ValueError:
+        pass
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(value, date_format).date().isoformat()
+        except ValueError:
+            continue
+    return None
+
+
+class AppendIndex:
+    """Persistent index over one table of a ``CsvStorage`` that follows appends.
+
+    Subclasses define the indexed ``table``, the index file name, and how
+    rows are added (``_add_rows``) and serialized (``_data``/``_restore``).
+    Row ids are row positions in the file.
+    """
+
+    table = None
+    file_name = None
+    version = 1
+
+    # Apply pending update events before reading the table. Indexes that don't
+    # read any column an update can leave pending (see the storage's
+    # ``IMMEDIATE_COLUMNS``) turn this off, so a lookup doesn't compact them.
+    apply_updates = True
+
+    def __init__(self, storage):
+        self.storage = storage
+        self.path = os.path.join(storage.data_dir, self.file_name)
+        self._row_count = 0
+        self._state = None
+        self._built = False
+        self._loaded = False
+
+    def _reset(self):
+        """Empty the index."""
+        raise NotImplementedError
+
+    def _add_rows(self, rows):
+        """Index rows that follow the ones already indexed (advancing ``_row_count``)."""
+        raise NotImplementedError
+
+    def _data(self):
+        """Return the index contents as JSON-serializable data."""
+        raise NotImplementedError
+
+    def _restore(self, data):
+        """Load the index contents from the output of ``_data``."""
+        raise NotImplementedError
+
+    def _load(self):
+        self._loaded = True
+        try:
+            with open(self.path, 'r') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != self.version:
+            return
+        self._restore(data)
+        self._row_count = data["row_count"]
+        self._state = data["state"]
+        self._built = True
+
+    def _save(self):
+        data = self._data()
+        data.update({"version": self.version, "row_count": self._row_count, "state": self._state})
+        with atomic_write(self.path, fsync=False) as file:
+            json.dump(data, file)
+
+    def refresh(self):
+        """Fold appended rows into the index, or rebuild it if the file was rewritten."""
+        if not self._loaded:
+            self._load()
+
+        change = self.storage.classify_change(self.table, self._state, apply_updates=self.apply_updates)
+        if change == "unchanged":
+            return
+        rebuild = change == "rewritten" or not self._built
+        if rebuild:
+            self._reset()
+            self._row_count = 0
+            self._built = True
+            offset = None
+        else:
+            offset = self._state["offset"]
+
+        rows, offset = self.storage.read_tail_rows(self.table, offset)
+        self._add_rows(rows)
+        self._state = self.storage.tail_state(self.table, offset)
+        if rebuild or len(rows) >= SAVE_AFTER_ROWS:
+            self._save()
+
+    def resync(self):
+        """Accept the current file as indexed after a rewrite that kept the indexed columns.
+
+        Used after in-place updates (e.g. recording a response) that change
+        neither the row order nor any indexed column.
+        """
+        if not self._loaded:
+            self._load()
+        if not self._built:
+            return
+        # The rewrite re-serializes every row, so the processed offset is now the file size
+        size = os.path.getsize(self.storage.csv_path(self.table))
+        self._state = self.storage.tail_state(self.table, size)
+        self._save()
+
+
+class _SavedKeys:
+    """Sorted key records of a saved ``NextActionIndex``, read from the file on demand.
+
+    Indexing returns the (date, row id) key at a position, so ``bisect``
+    searches the file directly. The file is kept open: a newer index written
+    over it doesn't change what this one reads.
+    """
+
+    def __init__(self, file=None, count=0):
+        self.file = file
+        self.count = count
+        self.start = file.tell() if file else 0
+        self.texts_start = self.start + count * KEY_RECORD.size
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, position):
+        self.file.seek(self.start + position * KEY_RECORD.size)
+        date, row_id, _, _ = KEY_RECORD.unpack(self.file.read(KEY_RECORD.size))
+        return date.decode('ascii'), row_id
+
+    def __del__(self):
+        if self.file:
+            self.file.close()
+
+    def actions(self, low, high):
+        """Yield ((date, row id), action) for the keys at positions low to high - 1."""
+        for first in range(low, high, READ_RECORDS):
+            last = min(first + READ_RECORDS, high)
+            self.file.seek(self.start + first * KEY_RECORD.size)
+            records = list(KEY_RECORD.iter_unpack(self.file.read((last - first) * KEY_RECORD.size)))
+            # Texts are stored in key order, so a run of keys has one run of texts
+            begin = records[0][2]
+            self.file.seek(self.texts_start + begin)
+            texts = self.file.read(records[-1][2] + records[-1][3] - begin)
+            for date, row_id, offset, length in records:
+                yield (date.decode('ascii'), row_id), json.loads(texts[offset - begin:offset - begin + length])
+
+
+class NextActionIndex(AppendIndex):
+    """Bisectable index of engagements by next action date for a ``CsvStorage``.
+
+    The file holds a JSON header line, the sorted key records (``KEY_RECORD``)
+    and the action texts. Keys folded in since the file was written are kept
+    in memory and merged in when reading, until the next save rewrites it.
+    """
+
+    table = "engagements"
+    file_name = "next_action_index.bin"
+    version = 2
+
+    # Columns stored in the index; rewrites that change them need a rebuild
+    columns = {"Contact Name", "Company", "Next Action", "Next Action Date"}
+
+    # Updates of these columns are applied right away, so pending ones can wait
+    apply_updates = False
+
+    def __init__(self, storage):
+        super().__init__(storage)
+        self._saved = _SavedKeys()
+        self._keys = []         # sorted [(iso date, row id)] not saved yet
+        self._actions = {}      # row id -> [contact name, company, next action], for those keys
+
+    def _reset(self):
+        self._saved = _SavedKeys()
+        self._keys = []
+        self._actions = {}
+
+    def _open(self, file):
+        """Use an index file positioned at its start; return its header, or None if unusable."""
+        try:
+            header = json.loads(file.readline())
+        except ValueError:
+            header = None
+        if not isinstance(header, dict) or header.get("version") != self.version:
+            file.close()
+            return None
+        self._saved = _SavedKeys(file, header["keys"])
+        self._keys = []
+        self._actions = {}
+        return header
+
+    def _load(self):
+        self._loaded = True
+        try:
+            file = open(self.path, 'rb')
+        except OSError:
+            return
+        header = self._open(file)
+        if header is None:
+            return
+        self._row_count = header["row_count"]
+        self._state = header["state"]
+        self._built = True
+
+    def _save(self):
+        # Merge the unsaved keys into the saved ones; texts follow the keys in the same order
+        records = bytearray()
+        texts = bytearray()
+        for (date, row_id), action in self._iter_range(0, len(self._saved), 0, len(self._keys)):
+            text = json.dumps(action).encode('utf-8')
+            records += KEY_RECORD.pack(date.encode('ascii'), row_id, len(texts), len(text))
+            texts += text
+        header = {"version": self.version, "row_count": self._row_count, "state": self._state,
+                  "keys": len(records) // KEY_RECORD.size}
+        with atomic_write(self.path, 'wb', fsync=False) as file:
+            file.write(json.dumps(header).encode('utf-8') + b"\n")
+            file.write(records)
+            file.write(texts)
+            file.flush()
+            # Open the new file before it's swapped in, so this is the one read back
+            saved = open(file.name, 'rb')
+        self._open(saved)
+
+    def _add_rows(self, rows):
+        new_keys = []
+        for row in rows:
+            row_id = self._row_count
+            self._row_count += 1
+            date = parse_date(row.get("Next Action Date"))
+            if date is None:
+                continue
+            new_keys.append((date, row_id))
+            self._actions[row_id] = [row.get("Contact Name", ""), row.get("Company", ""), row.get("Next Action", "")]
+
+        if len(new_keys) > 32:
+            self._keys.extend(new_keys)
+            self._keys.sort()
+        else:
+            for key in new_keys:
+                bisect.insort(self._keys, key)
+
+    def _iter_range(self, saved_low, saved_high, low, high):
+        """Yield ((date, row id), action) in key order for saved and unsaved key positions."""
+        actions = self._actions
+        unsaved = ((key, actions[key[1]]) for key in self._keys[low:high])
+        return heapq.merge(self._saved.actions(saved_low, saved_high), unsaved, key=lambda item: item[0])
+
+    def between(self, start=None, end=None):
+        """Return indexed actions with start <= date <= end, sorted by date.
+
+        Args:
+            start (str, optional): ISO date, unbounded if None
+            end (str, optional): ISO date, unbounded if None
+
+        Returns:
+            list: Dicts with "Next Action Date", "Contact Name", "Company" and "Next Action"
+        """
+        return list(self.iter_between(start, end))
+
+    def iter_between(self, start=None, end=None):
+        """Like ``between``, but yield the actions one at a time."""
+        self.refresh()
+        bounds = []
+        for keys in (self._saved, self._keys):
+            bounds.append(0 if start is None else bisect.bisect_left(keys, (start, -1)))
+            bounds.append(len(keys) if end is None else bisect.bisect_right(keys, (end, float('inf'))))
+        for (date, _), (contact, company, action) in self._iter_range(*bounds):
+            yield {
+                "Next Action Date": date,
+                "Contact Name": contact,
+                "Company": company,
+                "Next Action": action
+            }
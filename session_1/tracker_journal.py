@@ -0,0 +1,107 @@
+"""Append-only write journal that batches rows from concurrent writer processes.
+
+When one process holds a data directory's write lock (say, for a long bulk
+import or a rewrite), other processes don't wait for it: they append their
+rows to the journal, one locked ``write`` per batch, and return. The next
+process to hold the write lock applies every queued row to the CSV files in
+one group commit, with one fsync per table instead of one per writer.
+
+Applying a batch is crash safe. The journal is first renamed aside, so new
+writers start a fresh one, and the table sizes are recorded in the claimed
+file before any row is written. A claimed file found on the next apply means
+the previous apply was interrupted: the tables are truncated back to the
+recorded sizes and the batch is applied again, so rows are never lost or
+written twice.
+"""
+import json
+import os
+
+from tracker_locking import claim_file, locked_append
+
+# Buffered journal bytes written out in one locked append
+JOURNAL_FLUSH_BYTES = 1 << 20
+
+
+class WriteJournal:
+    """Journal of rows waiting to be appended to a data directory's tables."""
+
+    file_name = "write_journal.jsonl"
+
+    def __init__(self, data_dir):
+        self.path = os.path.join(data_dir, self.file_name)
+        self.claimed_path = self.path + ".applying"
+
+    def has_entries(self):
+        """Return True if rows are waiting to be applied (cheap: two ``stat`` calls)."""
+        if os.path.exists(self.claimed_path):
+            return True
+        try:
+            return os.path.getsize(self.path) > 0
+        except OSError:
+            return False
+
+    def writer(self, table, fsync=False):
+        """Return ``(write, close)`` functions for queueing rows of one table.
+
+        ``write`` takes a record; rows are buffered and appended in batches,
+        and ``close`` appends whatever is left.
+        """
+        buffer = []
+        size = [0]
+
+        def flush():
+            if buffer:
+                locked_append(self.path, "".join(buffer).encode('utf-8'), fsync=fsync)
+                buffer.clear()
+                size[0] = 0
+
+        def write(record):
+            line = json.dumps([table, record.to_row()]) + "\n"
+            buffer.append(line)
+            size[0] += len(line)
+            if size[0] >= JOURNAL_FLUSH_BYTES:
+                flush()
+
+        return write, flush
+
+    def claim(self):
+        """Move queued rows aside for applying; new writers start a fresh journal.
+
+        Only call this while holding the data directory's write lock.
+
+        Returns:
+            bool: True if there is a claimed batch to apply
+        """
+        return claim_file(self.path, self.claimed_path)
+
+    def read_claimed(self):
+        """Return the claimed batch.
+
+        Returns:
+            tuple: ([(table, row values)], table sizes recorded before applying, or None)
+        """
+        entries = []
+        sizes = None
+        with open(self.claimed_path, 'r', encoding='utf-8') as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Torn write from a writer that crashed mid-append
+                    continue
+                if isinstance(entry, dict):
+                    sizes = entry["sizes"]
+                else:
+                    entries.append((entry[0], entry[1]))
+        return entries, sizes
+
+    def record_sizes(self, sizes):
+        """Record the table sizes before the claimed batch is applied."""
+        with open(self.claimed_path, 'a', encoding='utf-8') as file:
+            file.write("\n" + json.dumps({"sizes": sizes}) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+
+    def finish(self):
+        """Discard the claimed batch once it is safely in the tables."""
+        os.remove(self.claimed_path)
@@ -0,0 +1,178 @@
+"""Cross-process locking and atomic file replacement for tracker data directories.
+
+Several processes (students' scripts, scheduled jobs) may share one data
+directory. Writers take an exclusive advisory lock on a lock file in the
+directory, and whole-file rewrites go through a temporary file that is
+swapped in with ``os.replace``, so readers see either the old or the new
+file and never a half-written one. Locks use ``fcntl.flock`` and are no-ops
+on platforms without it.
+"""
+import os
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, single-process use only
+    fcntl = None
+
+
+class FileLock:
+    """Reentrant advisory lock on a file, shared between processes.
+
+    Nested acquisitions in the same process reuse the outer lock; a shared
+    lock can't be upgraded to an exclusive one while it is held.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+        self._depth = 0
+        self._exclusive = False
+
+    def acquire(self, exclusive=True, blocking=True):
+        """Take the lock.
+
+        Args:
+            exclusive (bool): Exclusive (writer) lock, otherwise shared (reader)
+            blocking (bool): Wait for the lock instead of giving up
+
+        Returns:
+            bool: True if the lock is now held, False if it is busy and blocking is False
+        """
+        if self._depth:
+            if exclusive and not self._exclusive:
+                raise RuntimeError(f"Can't upgrade the shared lock on {self.path} to exclusive")
+            self._depth += 1
+            return True
+
+        file = open(self.path, 'a')
+        if fcntl is not None:
+            flags = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+            if not blocking:
+                flags |= fcntl.LOCK_NB
+            try:
+                fcntl.flock(file.fileno(), flags)
+            except BlockingIOError:
+                file.close()
+                return False
+        self._file = file
+        self._depth = 1
+        self._exclusive = exclusive
+        return True
+
+    def release(self):
+        """Release one level of the lock, unlocking the file at the outermost level."""
+        self._depth -= 1
+        if self._depth:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        finally:
+            self._file.close()
+            self._file = None
+
+    @property
+    def held(self):
+        """True while this process holds the lock."""
+        return self._depth > 0
+
+    @contextmanager
+    def hold(self, exclusive=True):
+        """Hold the lock for the duration of a ``with`` block (blocking)."""
+        self.acquire(exclusive=exclusive)
+        try:
+            yield
+        finally:
+            self.release()
+
+
+@contextmanager
+def atomic_write(path, mode='w', newline=None, fsync=True):
+    """Write a file through a temporary sibling and swap it in with ``os.replace``.
+
+    The temporary name includes the process id, so concurrent writers never
+    share one. If the ``with`` block raises, the original file is left as it was.
+
+    Args:
+        path (str): File to replace
+        mode (str): ``'w'`` or ``'wb'``
+        newline (str, optional): Passed to ``open`` in text mode
+        fsync (bool): Force the new contents to disk before the swap
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, mode, newline=newline) as file:
+            yield file
+            if fsync:
+                file.flush()
+                os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _lock_fd(fd):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+
+
+def locked_append(path, data, fsync=False):
+    """Append bytes to a shared log file as one locked write.
+
+    Writers from several processes never interleave. If the log is claimed
+    (renamed aside by ``claim_file``) while we wait for the lock, the bytes
+    go to the fresh log that replaces it.
+
+    Args:
+        path (str): Log file, created if missing
+        data (bytes): Complete lines to append
+        fsync (bool): Force the data to disk before returning
+    """
+    while True:
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            _lock_fd(fd)
+            try:
+                current = os.stat(path).st_ino
+            except FileNotFoundError:
+                current = None
+            if current != os.fstat(fd).st_ino:
+                # Claimed while we waited: start the next log
+                continue
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+            if fsync:
+                os.fsync(fd)
+            return
+        finally:
+            os.close(fd)
+
+
+def claim_file(path, claimed_path):
+    """Rename a non-empty log written with ``locked_append`` aside for processing.
+
+    New appends start a fresh log. A claimed file left over from an
+    interrupted run is returned again, so it can be processed to completion.
+    Only one process may claim at a time (hold the directory's write lock).
+
+    Returns:
+        bool: True if ``claimed_path`` holds entries to process
+    """
+    if os.path.exists(claimed_path):
+        return True
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except FileNotFoundError:
+        return False
+    try:
+        _lock_fd(fd)
+        if os.fstat(fd).st_size == 0:
+            return False
+        os.replace(path, claimed_path)
+        return True
+    finally:
+        os.close(fd)
@@ -0,0 +1,256 @@
+"""Opt-in instrumentation for the tracker: timers, I/O counters and profiling hooks.
+
+A ``Metrics`` object collects
+
+- timers: calls, total and slowest seconds per name (tracker methods are
+  named after themselves, report sections and charts get their own names),
+- I/O: rows and bytes read and written per table,
+- profiles: cProfile statistics and tracemalloc peaks of chosen methods.
+
+Everything is disabled by default and costs next to nothing then: tracker
+methods are only wrapped while instrumentation is on (see ``instrument``),
+storage checks a single ``metrics is None`` before counting, and ``timer``
+returns a shared no-op context manager.
+"""
+import cProfile
+import functools
+import io
+import json
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+# Functions listed per profiled method in ``to_dict`` and the summary
+PROFILE_TOP = 15
+
+_NULL_TIMER = nullcontext()
+
+
+class Metrics:
+    """Timers, I/O counters and profiles collected while instrumentation is enabled."""
+
+    def __init__(self):
+        self.enabled = False
+        self.profiling = False
+        self.reset()
+
+    def reset(self):
+        """Drop everything collected so far."""
+        self.timers = {}        # name -> [calls, total seconds, max seconds]
+        self.io = {}            # (direction, table) -> [rows, bytes]
+        self.profiles = {}      # method name -> pstats.Stats
+        self.memory = {}        # method name -> peak traced bytes
+
+    def add_time(self, name, seconds):
+        """Record one timed call."""
+        timer = self.timers.get(name)
+        if timer is None:
+            self.timers[name] = [1, seconds, seconds]
+        else:
+            timer[0] += 1
+            timer[1] += seconds
+            if seconds > timer[2]:
+                timer[2] = seconds
+
+    def timer(self, name):
+        """Context manager timing a block under ``name`` (a no-op while disabled)."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return self._timer(name)
+
+    @contextmanager
+    def _timer(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def record_io(self, direction, table, rows, nbytes=0):
+        """Count rows and bytes moved to or from a table.
+
+        Args:
+            direction (str): "read" or "write"
+            table (str): Table name
+            rows (int): Rows read or written
+            nbytes (int): Bytes of file I/O (0 where the backend doesn't expose it)
+        """
+        counts = self.io.setdefault((direction, table), [0, 0])
+        counts[0] += rows
+        counts[1] += nbytes
+
+    def add_profile(self, name, profile):
+        """Merge a finished ``cProfile.Profile`` into the statistics of a method."""
+        stats = self.profiles.get(name)
+        if stats is None:
+            self.profiles[name] = pstats.Stats(profile)
+        else:
+            stats.add(profile)
+
+    def top_functions(self, name, n=PROFILE_TOP):
+        """Return the ``n`` functions with the most cumulative time in a method's profile.
+
+        Returns:
+            list: Dicts with "function", "calls", "total_seconds" (own time) and "cumulative_seconds"
+        """
+        stats = self.profiles[name]
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:n]
+        return [
+            {
+                "function": f"{filename}:{line}({function})",
+                "calls": calls,
+                "total_seconds": total,
+                "cumulative_seconds": cumulative
+            }
+            for (filename, line, function), (_, calls, total, cumulative, _) in rows
+        ]
+
+    def to_dict(self):
+        """Return everything collected as JSON-serializable data."""
+        return {
+            "timers": {
+                name: {"calls": calls, "total_seconds": total, "max_seconds": slowest}
+                for name, (calls, total, slowest) in sorted(self.timers.items(), key=lambda item: -item[1][1])
+            },
+            "io": [
+                {"direction": direction, "table": table, "rows": rows, "bytes": nbytes}
+                for (direction, table), (rows, nbytes) in sorted(self.io.items())
+            ],
+            "profiles": {name: self.top_functions(name) for name in self.profiles},
+            "memory_peaks": dict(self.memory)
+        }
+
+    def to_json(self, path=None):
+        """Serialize the metrics as JSON, written to ``path`` if given.
+
+        Returns:
+            str: The JSON document
+        """
+        text = json.dumps(self.to_dict(), indent=2)
+        if path:
+            with open(path, 'w') as file:
+                file.write(text + "\n")
+        return text
+
+    def print_stats(self, name, n=PROFILE_TOP):
+        """Return the pstats report of a profiled method, sorted by cumulative time."""
+        output = io.StringIO()
+        stats = pstats.Stats(stream=output)
+        stats.add(self.profiles[name])
+        stats.sort_stats("cumulative").print_stats(n)
+        return output.getvalue()
+
+    def summary_tables(self):
+        """Build rich tables of the timers, I/O counters and memory peaks."""
+        from rich.table import Table
+
+        tables = []
+        table = Table(title="Timings")
+        table.add_column("Name", style="cyan", no_wrap=True)
+        table.add_column("Calls", style="magenta", justify="right")
+        table.add_column("Total", style="green", justify="right")
+        table.add_column("Mean", style="green", justify="right")
+        table.add_column("Max", style="green", justify="right")
+        for name, timer in self.to_dict()["timers"].items():
+            table.add_row(
+                name, str(timer["calls"]), f"{timer['total_seconds'] * 1000:.1f} ms",
+                f"{timer['total_seconds'] / timer['calls'] * 1000:.2f} ms", f"{timer['max_seconds'] * 1000:.1f} ms"
+            )
+        tables.append(table)
+
+        if self.io:
+            table = Table(title="I/O")
+            table.add_column("Direction", style="cyan")
+            table.add_column("Table", style="cyan")
+            table.add_column("Rows", style="magenta", justify="right")
+            table.add_column("Bytes", style="magenta", justify="right")
+            for (direction, name), (rows, nbytes) in sorted(self.io.items()):
+                table.add_row(direction, name, f"{rows:,}", f"{nbytes:,}")
+            tables.append(table)
+
+        if self.memory:
+            table = Table(title="Peak Memory (tracemalloc)")
+            table.add_column("Method", style="cyan")
+            table.add_column("Peak", style="magenta", justify="right")
+            for name, peak in sorted(self.memory.items(), key=lambda item: -item[1]):
+                table.add_row(name, f"{peak / 2**20:.1f} MiB")
+            tables.append(table)
+        return tables
+
+
+def _wrap(method, name, metrics, profile, trace_memory):
+    """Wrap a bound method so each call is timed (and optionally profiled)."""
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        profiler = None
+        tracing = False
+        # Calls nested in a profiled call are already in its profile: only time them
+        if profile and not metrics.profiling:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+                metrics.profiling = True
+            except ValueError:
+                # Another profiler (e.g. ``python -m cProfile``) is active
+                profiler = None
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            tracing = True
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            metrics.add_time(name, time.perf_counter() - start)
+            if profiler is not None:
+                profiler.disable()
+                metrics.profiling = False
+                metrics.add_profile(name, profiler)
+            if tracing:
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                metrics.memory[name] = max(metrics.memory.get(name, 0), peak)
+
+    wrapper.__instrumented__ = True
+    return wrapper
+
+
+def public_methods(obj):
+    """Return the names of an object's public methods."""
+    return [
+        name for name in dir(type(obj))
+        if not name.startswith("_") and callable(getattr(type(obj), name))
+    ]
+
+
+def instrument(obj, metrics, methods=None, exclude=(), profile=(), trace_memory=()):
+    """Time every call to an object's public methods by shadowing them on the instance.
+
+    Args:
+        obj: Object to instrument
+        metrics (Metrics): Where the timings go
+        methods (list, optional): Method names to wrap, all public methods by default
+        exclude (iterable): Method names to leave alone
+        profile (iterable): Method names to run under cProfile, or "*" for all of them
+        trace_memory (iterable): Method names whose peak memory is traced, or "*" for all
+    """
+    for name in methods or public_methods(obj):
+        if name in exclude:
+            continue
+        method = getattr(obj, name)
+        if getattr(method, "__instrumented__", False):
+            continue
+        wrapper = _wrap(
+            method, name, metrics,
+            profile=profile == "*" or name in profile,
+            trace_memory=trace_memory == "*" or name in trace_memory
+        )
+        setattr(obj, name, wrapper)
+
+
+def uninstrument(obj):
+    """Remove the wrappers installed by ``instrument``."""
+    for name, value in list(vars(obj).items()):
+        if getattr(value, "__instrumented__", False):
+            delattr(obj, name)
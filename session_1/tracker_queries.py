@@ -0,0 +1,335 @@
+"""Boolean search query normalization and the query effectiveness index.
+
+The same search is logged many times, written slightly differently each
+time ("Python AND remote", "remote python", "(python && Remote)").
+``canonicalize_query`` parses a boolean query (AND/OR/NOT in any case,
+``&&``/``||``/``!``/``-`` forms, parentheses, quoted phrases, implicit AND
+between terms) and prints it back in one canonical form: terms case-folded,
+operands of AND and OR deduplicated and sorted, nested operators flattened,
+one-word phrases unquoted. ``query_key`` hashes the canonical form, so
+every spelling of a query lands on the same key.
+
+``QueryStats`` keeps running totals per (platform, query key) - runs,
+results and effectiveness ratings - that are updated row by row, and
+answers "best queries" with ``heapq.nlargest`` over the distinct queries
+instead of sorting them. ``QueryIndex`` maintains them over the CSV
+queries table the way the other indexes do, folding in appended rows by
+byte offset.
+"""
+import hashlib
+import heapq
+import re
+from functools import lru_cache
+
+from tracker_index import AppendIndex
+
+# Operator spellings (case-folded) -> operator
+OPERATORS = {
+    "and": "AND", "&&": "AND", "&": "AND", "+": "AND",
+    "or": "OR", "||": "OR", "|": "OR",
+    "not": "NOT", "!": "NOT",
+}
+
+# Quoted phrases (closing quote optional), parentheses, symbolic operators and bare words
+TOKEN = re.compile(r'"[^"]*"?|\(|\)|&&|\|\||[^\s()"]+')
+
+# Ways to rank queries in QueryStats.best
+RANKINGS = ("rating", "results", "runs")
+
+
+def _tokenize(text):
+    """Split a query into terms, phrases, operators and parentheses."""
+    tokens = []
+    for token in TOKEN.findall(text):
+        operator = OPERATORS.get(token.casefold())
+        if operator is not None:
+            tokens.append(operator)
+        elif token in "()":
+            tokens.append(token)
+        elif token[0] in "-!" and len(token) > 1:
+            # -term / !term exclude a term
+            tokens.append("NOT")
+            tokens.append(_term(token[1:]))
+        else:
+            tokens.append(_term(token))
+    return [token for token in tokens if token is not None]
+
+
+def _term(token):
+    """Normalize a word or quoted phrase (None if it is empty)."""
+    if token.startswith('"'):
+        words = token.strip('"').casefold().split()
+        if not words:
+            return None
+        # Quoting a single word doesn't change the query
+        return ("term", words[0] if len(words) == 1 else '"' + " ".join(words) + '"')
+    return ("term", token.casefold())
+
+
+class _Parser:
+    """Recursive descent parser: OR binds loosest, then AND (explicit or implied), then NOT.
+
+    Malformed input never fails: dangling operators are dropped, unclosed
+    parentheses are closed at the end and stray closing ones are skipped.
+    """
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.position = 0
+
+    def _peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def parse(self):
+        operands = []
+        while self._peek() is not None:
+            node = self._or()
+            if node is not None:
+                operands.append(node)
+            if self._peek() == ")":
+                self.position += 1
+        return _combine("AND", operands)
+
+    def _or(self):
+        operands = [self._and()]
+        while self._peek() == "OR":
+            self.position += 1
+            operands.append(self._and())
+        return _combine("OR", operands)
+
+    def _and(self):
+        operands = []
+        while True:
+            token = self._peek()
+            if token is None or token in ("OR", ")"):
+                break
+            if token == "AND":
+                self.position += 1
+                continue
+            operands.append(self._unary())
+        return _combine("AND", operands)
+
+    def _unary(self):
+        token = self._peek()
+        self.position += 1
+        if token == "NOT":
+            if self._peek() in (None, "OR", ")", "AND"):
+                return None
+            operand = self._unary()
+            if operand is None:
+                return None
+            # NOT NOT x is x
+            return operand[1] if operand[0] == "NOT" else ("NOT", operand)
+        if token == "(":
+            node = self._or()
+            if self._peek() == ")":
+                self.position += 1
+            return node
+        return token
+
+
+def _combine(operator, operands):
+    """Build an AND/OR node: flattened, deduplicated and sorted by canonical text."""
+    children = {}
+    for operand in operands:
+        if operand is None:
+            continue
+        nested = operand[1] if operand[0] == operator else [operand]
+        for child in nested:
+            children.setdefault(_render(child), child)
+    if not children:
+        return None
+    if len(children) == 1:
+        return next(iter(children.values()))
+    return (operator, [children[text] for text in sorted(children)])
+
+
+def _render(node, parent=None):
+    kind = node[0]
+    if kind == "term":
+        return node[1]
+    if kind == "NOT":
+        return "NOT " + _render(node[1], "NOT")
+    text = f" {kind} ".join(_render(child, kind) for child in node[1])
+    return f"({text})" if parent is not None else text
+
+
+@lru_cache(maxsize=65536)
+def canonicalize_query(text):
+    """Return the canonical form of a boolean search query ("" if it has no terms).
+
+    >>> canonicalize_query('Remote && ("backend intern" OR python)')
+    '("backend intern" OR python) AND remote'
+    """
+    node = _Parser(_tokenize(text or "")).parse()
+    return _render(node) if node is not None else ""
+
+
+def query_key(text):
+    """Return a short hash identifying a query in any spelling."""
+    canonical = canonicalize_query(text)
+    return hashlib.blake2b(canonical.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def _number(value):
+    """Parse a numeric cell (None if blank or not a number)."""
+    if value is None or value == "":
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if number != number else number
+
+
+# Positions in a QueryStats entry
+PLATFORM, QUERY, CANONICAL, RUNS, RESULTS_SUM, RESULTS_COUNT, RATING_SUM, RATING_COUNT, LAST_RUN = range(9)
+
+
+class QueryStats:
+    """Running effectiveness totals per platform and canonical query."""
+
+    def __init__(self):
+        # "platform key:query key" -> [platform, first spelling, canonical, runs,
+        # results sum, results count, rating sum, rating count, last run date]
+        self.entries = {}
+
+    @staticmethod
+    def key(platform, query):
+        return f"{(platform or '').strip().casefold()}:{query_key(query)}"
+
+    def add(self, platform, query, results=None, rating=None, date=None):
+        """Count one logged run of a query."""
+        canonical = canonicalize_query(query)
+        if not canonical:
+            return
+        key = self.key(platform, query)
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = self.entries[key] = [(platform or "").strip(), query.strip(), canonical, 0, 0.0, 0, 0.0, 0, ""]
+        entry[RUNS] += 1
+        results = _number(results)
+        if results is not None:
+            entry[RESULTS_SUM] += results
+            entry[RESULTS_COUNT] += 1
+        rating = _number(rating)
+        if rating is not None:
+            entry[RATING_SUM] += rating
+            entry[RATING_COUNT] += 1
+        if date and date > entry[LAST_RUN]:
+            entry[LAST_RUN] = date
+
+    def add_rows(self, rows):
+        for row in rows:
+            self.add(row.get("Platform"), row.get("Query") or "", row.get("Results Count"),
+                     row.get("Effectiveness Rating"), row.get("Date Added"))
+
+    @staticmethod
+    def _summary(entry):
+        return {
+            "platform": entry[PLATFORM],
+            "query": entry[QUERY],
+            "canonical": entry[CANONICAL],
+            "runs": entry[RUNS],
+            "average_results": entry[RESULTS_SUM] / entry[RESULTS_COUNT] if entry[RESULTS_COUNT] else None,
+            "average_rating": entry[RATING_SUM] / entry[RATING_COUNT] if entry[RATING_COUNT] else None,
+            "last_run": entry[LAST_RUN] or None,
+        }
+
+    def lookup(self, platform, query):
+        """Return the statistics of a query on a platform, or None if it was never logged."""
+        entry = self.entries.get(self.key(platform, query))
+        return self._summary(entry) if entry is not None else None
+
+    def best(self, k=10, platform=None, by="rating", min_runs=1):
+        """Return the ``k`` best queries, best first.
+
+        Args:
+            k (int): Number of queries
+            platform (str, optional): Only queries run on this platform
+            by (str): "rating" (average effectiveness rating), "results"
+                (average results count) or "runs"; ties go to the more-run query
+            min_runs (int): Ignore queries run fewer times
+
+        Returns:
+            list: Dicts with "platform", "query", "canonical", "runs",
+            "average_results", "average_rating" and "last_run"
+        """
+        if by not in RANKINGS:
+            raise ValueError(f"unknown ranking {by!r}, expected one of {', '.join(RANKINGS)}")
+        wanted = platform.strip().casefold() if platform else None
+        sums = {"rating": (RATING_SUM, RATING_COUNT), "results": (RESULTS_SUM, RESULTS_COUNT)}
+
+        def candidates():
+            for entry in self.entries.values():
+                if entry[RUNS] < min_runs or (wanted is not None and entry[PLATFORM].casefold() != wanted):
+                    continue
+                if by == "runs":
+                    yield (entry[RUNS], 0), entry
+                    continue
+                total, count = sums[by]
+                if entry[count]:
+                    yield (entry[total] / entry[count], entry[RUNS]), entry
+
+        # O(n log k) over the distinct queries rather than a full sort
+        return [self._summary(entry) for _, entry in heapq.nlargest(k, candidates(), key=lambda item: item[0])]
+
+    def platforms(self):
+        """Return per-platform totals: runs, distinct queries and average results and rating.
+
+        Platforms are grouped regardless of case and shown as first spelled.
+        """
+        totals = {}
+        names = {}      # platform key -> first spelling seen
+        for entry in self.entries.values():
+            key = entry[PLATFORM].casefold()
+            names.setdefault(key, entry[PLATFORM])
+            total = totals.setdefault(key, [0, 0, 0.0, 0, 0.0, 0])
+            total[0] += entry[RUNS]
+            total[1] += 1
+            total[2] += entry[RESULTS_SUM]
+            total[3] += entry[RESULTS_COUNT]
+            total[4] += entry[RATING_SUM]
+            total[5] += entry[RATING_COUNT]
+        return {
+            names[platform]: {
+                "runs": runs,
+                "queries": queries,
+                "average_results": results_sum / results_count if results_count else None,
+                "average_rating": rating_sum / rating_count if rating_count else None,
+            }
+            for platform, (runs, queries, results_sum, results_count, rating_sum, rating_count) in totals.items()
+        }
+
+
+class QueryIndex(AppendIndex):
+    """``QueryStats`` over the queries table of a ``CsvStorage``, following appends."""
+
+    table = "queries"
+    file_name = "query_index.json"
+    version = 1
+
+    # Update events only change companies and engagements
+    apply_updates = False
+
+    def __init__(self, storage):
+        super().__init__(storage)
+        self.stats = QueryStats()
+
+    def _reset(self):
+        self.stats = QueryStats()
+
+    def _data(self):
+        return {"entries": self.stats.entries}
+
+    def _restore(self, data):
+        self.stats.entries = data["entries"]
+
+    def _add_rows(self, rows):
+        self._row_count += len(rows)
+        self.stats.add_rows(rows)
+
+    def current(self):
+        """Return the statistics, refreshed with any rows appended since the last call."""
+        self.refresh()
+        return self.stats
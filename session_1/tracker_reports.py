@@ -0,0 +1,141 @@
+"""Structured report results and their machine-readable output formats.
+
+Every report method of ``InternshipSearchTracker`` builds a ``Report``:
+summary values plus named tables of rows (dicts keyed by column name).
+Rendering it with rich is one way to present it; ``write_report`` streams
+it instead as JSON Lines or CSV, writing each row as it is produced, so
+thousands of rows can be piped to another program without building a
+table in memory or paying for its layout.
+
+Both streaming formats tag each row with the table it belongs to. In JSON
+Lines every line is an object with a "table" key and the row's columns
+(the summary, if any, is the first line, tagged "summary"). In CSV the
+first column is "table", and a header row starts every table.
+"""
+import csv
+import json
+from itertools import islice
+
+# Presentation formats accepted by the report methods (None: return the data only)
+OUTPUT_FORMATS = ("rich", "jsonl", "csv")
+
+
+class ReportTable:
+    """Named rows of a report; ``rows`` may be an iterator until the report is presented."""
+
+    def __init__(self, name, columns, rows, title=None):
+        self.name = name
+        self.columns = list(columns)
+        self.rows = rows
+        self.title = title
+        self.count = None       # rows written, once streamed
+
+    def page(self, offset=0, limit=None):
+        """Keep only ``limit`` rows after skipping ``offset`` (lazily, for iterators)."""
+        if offset or limit is not None:
+            self.rows = islice(self.rows, offset, None if limit is None else offset + limit)
+
+    def materialize(self):
+        """Turn the rows into a list, returning it."""
+        if not isinstance(self.rows, list):
+            self.rows = list(self.rows)
+        return self.rows
+
+
+class Report:
+    """Structured result of a report: summary values and named tables."""
+
+    def __init__(self, name, title, summary=None):
+        self.name = name
+        self.title = title
+        self.summary = dict(summary or {})
+        self.tables = {}
+
+    def add_table(self, name, columns, rows, title=None):
+        """Add a table (rows may be any iterable of dicts) and return it."""
+        table = self.tables[name] = ReportTable(name, columns, rows, title)
+        return table
+
+    def rows(self, name):
+        """Return a table's rows as a list (empty for unknown tables)."""
+        table = self.tables.get(name)
+        return table.materialize() if table is not None else []
+
+    def page(self, offset=0, limit=None):
+        """Apply ``offset``/``limit`` to every table."""
+        for table in self.tables.values():
+            table.page(offset, limit)
+
+    def materialize(self):
+        """Turn every table's rows into a list, returning the report."""
+        for table in self.tables.values():
+            table.materialize()
+        return self
+
+    def to_dict(self):
+        """Return the report as JSON-serializable data."""
+        return {
+            "report": self.name,
+            "title": self.title,
+            "summary": self.summary,
+            "tables": {name: table.materialize() for name, table in self.tables.items()},
+        }
+
+
+def write_jsonl(report, file):
+    """Stream a report as JSON Lines. Returns the number of rows written."""
+    if report.summary:
+        file.write(json.dumps(dict({"table": "summary"}, **report.summary), default=str) + "\n")
+    written = 0
+    for table in report.tables.values():
+        count = 0
+        for row in table.rows:
+            file.write(json.dumps(dict({"table": table.name}, **row), default=str) + "\n")
+            count += 1
+        table.rows, table.count = [], count
+        written += count
+    return written
+
+
+def _cell(value):
+    """Format a value as a CSV cell: blank for None, lists joined with commas."""
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple)):
+        return ", ".join(str(item) for item in value)
+    return value
+
+
+def write_csv(report, file):
+    """Stream a report as CSV, one header row per table. Returns the number of rows written."""
+    writer = csv.writer(file, lineterminator="\n")
+    if report.summary:
+        writer.writerow(["table"] + list(report.summary))
+        writer.writerow(["summary"] + [_cell(value) for value in report.summary.values()])
+    written = 0
+    for table in report.tables.values():
+        writer.writerow(["table"] + table.columns)
+        count = 0
+        for row in table.rows:
+            writer.writerow([table.name] + [_cell(row.get(column)) for column in table.columns])
+            count += 1
+        table.rows, table.count = [], count
+        written += count
+    return written
+
+
+def write_report(report, file, output):
+    """Stream a report in a machine-readable format ("jsonl" or "csv").
+
+    The streamed rows are not kept: afterwards each table's ``rows`` is
+    empty and ``count`` holds the number written.
+
+    Returns:
+        int: Rows written
+    """
+    writers = {"jsonl": write_jsonl, "csv": write_csv}
+    if output not in writers:
+        raise ValueError(f"unknown output format {output!r}, expected one of {', '.join(writers)}")
+    written = writers[output](report, file)
+    file.flush()
+    return written
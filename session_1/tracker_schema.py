@@ -0,0 +1,190 @@
+"""Column schemas and typed record types for the internship search tracking tables."""
+import re
+from functools import lru_cache
+
+COMPANY_FIELDS = [
+    "Company Name",
+    "Industry",
+    "Company Size",
+    "Job Posting URL",
+    "Technologies",
+    "Engineering Manager Name",
+    "Engineering Manager LinkedIn",
+    "Recruiter Name",
+    "Recruiter LinkedIn",
+    "Team Lead Name",
+    "Team Lead LinkedIn",
+    "Mutual Connections",
+    "Contact Status",
+    "Last Contact Date",
+    "Notes"
+]
+
+ENGAGEMENT_FIELDS = [
+    "Contact Name",
+    "Company",
+    "Position",
+    "Platform",
+    "Engagement Type",
+    "Date",
+    "Content Sent",
+    "Response Received",
+    "Response Time (hours)",
+    "Next Action",
+    "Next Action Date",
+    "Status",
+    "Notes"
+]
+
+QUERY_FIELDS = ["Platform", "Query", "Date Added", "Results Count", "Effectiveness Rating"]
+
+# Table name -> (CSV file name, column order)
+TABLES = {
+    "companies": ("company_contacts.csv", COMPANY_FIELDS),
+    "engagements": ("engagement_tracker.csv", ENGAGEMENT_FIELDS),
+    "queries": ("search_queries.csv", QUERY_FIELDS),
+}
+
+
+@lru_cache(maxsize=None)
+def attribute_name(field):
+    """Convert a column name to a Python attribute name ("Response Time (hours)" -> "response_time_hours")."""
+    return re.sub(r'[^0-9a-z]+', '_', field.lower()).strip('_')
+
+
+class Record:
+    """A typed row of a tracking table.
+
+    Subclasses list their columns in ``fields``; each column is stored in a
+    slot named after it (see ``attribute_name``). Building rows through a
+    record type keeps every write in header order and fills missing columns
+    with blanks, whatever keys the caller's dict happened to have.
+    """
+
+    __slots__ = ()
+    table = None
+    fields = []
+    required_fields = []
+    date_field = None
+    # Column dtypes used when reading the table into pandas
+    dtypes = {}
+
+    def __init__(self, *values):
+        for attribute, value in zip(self.attributes(), values):
+            setattr(self, attribute, value)
+        for attribute in self.attributes()[len(values):]:
+            setattr(self, attribute, None)
+
+    @classmethod
+    def attributes(cls):
+        return cls.__slots__
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a record from a dict keyed by column name; unknown keys are ignored."""
+        return cls(*(data.get(field) for field in cls.fields))
+
+    def get(self, field, default=None):
+        """Return a column value by column name."""
+        value = getattr(self, attribute_name(field))
+        return default if value is None else value
+
+    def set(self, field, value):
+        """Set a column value by column name."""
+        if field not in self.fields:
+            raise KeyError(f"{type(self).__name__} has no column {field!r}")
+        setattr(self, attribute_name(field), value)
+
+    def missing_fields(self):
+        """Return the required columns that are empty."""
+        return [field for field in self.required_fields if self.get(field) in (None, "")]
+
+    def to_row(self):
+        """Return the column values in header order, blanks for missing values."""
+        return ["" if value is None else value for value in (getattr(self, a) for a in self.attributes())]
+
+    def to_dict(self):
+        return dict(zip(self.fields, self.to_row()))
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.to_row() == other.to_row()
+
+    def __repr__(self):
+        values = ", ".join(f"{a}={getattr(self, a)!r}" for a in self.attributes() if getattr(self, a) is not None)
+        return f"{type(self).__name__}({values})"
+
+
+class Company(Record):
+    __slots__ = tuple(attribute_name(field) for field in COMPANY_FIELDS)
+    table = "companies"
+    fields = COMPANY_FIELDS
+    required_fields = ["Company Name", "Industry", "Technologies"]
+    date_field = "Last Contact Date"
+    dtypes = dict(
+        {field: "str" for field in COMPANY_FIELDS},
+        **{"Industry": "category", "Company Size": "category", "Contact Status": "category"}
+    )
+
+
+class Engagement(Record):
+    __slots__ = tuple(attribute_name(field) for field in ENGAGEMENT_FIELDS)
+    table = "engagements"
+    fields = ENGAGEMENT_FIELDS
+    required_fields = ["Contact Name", "Company", "Platform", "Engagement Type"]
+    date_field = "Date"
+    dtypes = dict(
+        {field: "str" for field in ENGAGEMENT_FIELDS},
+        **{
+            "Position": "category",
+            "Platform": "category",
+            "Engagement Type": "category",
+            "Status": "category",
+            "Response Time (hours)": "float64"
+        }
+    )
+
+
+class SearchQuery(Record):
+    __slots__ = tuple(attribute_name(field) for field in QUERY_FIELDS)
+    table = "queries"
+    fields = QUERY_FIELDS
+    required_fields = ["Platform", "Query"]
+    date_field = "Date Added"
+    dtypes = dict(
+        {field: "str" for field in QUERY_FIELDS},
+        **{"Platform": "category", "Results Count": "float64", "Effectiveness Rating": "float64"}
+    )
+
+
+RECORD_TYPES = {record_type.table: record_type for record_type in (Company, Engagement, SearchQuery)}
+
+
+def as_record(table, row):
+    """Return ``row`` as a record of the table's type (dicts are converted, records pass through)."""
+    if isinstance(row, Record):
+        return row
+    return RECORD_TYPES[table].from_dict(row)
+
+
+def numeric_fields(table):
+    """Return the columns of a table that are read as numbers."""
+    return [field for field, dtype in RECORD_TYPES[table].dtypes.items() if dtype == "float64"]
+
+
+def apply_dtypes(frame, table):
+    """Convert a DataFrame of raw strings to the table's fixed dtypes.
+
+    Numeric columns are coerced, so a stray non-numeric value becomes NaN
+    instead of failing the whole load.
+    """
+    import pandas as pd
+
+    for field, dtype in RECORD_TYPES[table].dtypes.items():
+        if field not in frame.columns or dtype == "str":
+            # Text columns stay as read: astype(str) would turn missing values into "None"/"nan"
+            continue
+        if dtype == "float64":
+            frame[field] = pd.to_numeric(frame[field], errors='coerce')
+        else:
+            frame[field] = frame[field].astype(dtype)
+    return frame
@@ -0,0 +1,600 @@
+"""Long-running tracker service keeping many data directories hot in memory.
+
+Every CLI run opens a tracker, loads its indexes and caches from disk and
+exits. ``TrackerService`` keeps open trackers for many data directories
+(one per student) in a ``TrackerPool`` and answers JSON requests over HTTP,
+on a TCP port or a Unix socket:
+
+    GET  /upcoming?dir=NAME&days=7          actions due in the next days
+    GET  /analytics?dir=NAME                aggregated analytics
+    GET  /suggestions?dir=NAME              optimization suggestions
+    POST /companies?dir=NAME                add companies (a JSON object or list)
+    POST /engagements?dir=NAME              add engagements
+    POST /queries?dir=NAME                  add search queries
+    POST /status?dir=NAME                   {"company", "status", "notes"}
+    POST /response?dir=NAME                 {"contact", "company", "response", "response_time"}
+    POST /flush                             write every buffered row now
+    GET  /stats                             pool statistics
+
+``NAME`` is a directory under the service's root. The pool is an LRU:
+when the estimated memory of the open trackers exceeds its budget, the
+least recently used idle ones are flushed and closed. Requests for one
+directory run one at a time (its trackers and caches aren't thread-safe),
+while requests for different directories run concurrently.
+
+Added rows are validated right away and buffered; each directory's buffer
+is written with one bulk append when it reaches ``flush_rows`` rows, when
+it is ``flush_interval`` seconds old, before any other request for that
+directory reads or updates it, and on eviction and shutdown. A service
+crash can lose up to ``flush_interval`` seconds of acknowledged rows.
+
+Run it with ``python tracker_service.py --root DIR [--port N | --socket PATH]``.
+"""
+import argparse
+import datetime
+import http.client
+import io
+import json
+import os
+import re
+import socket
+import sys
+import threading
+import time
+import urllib.parse
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from socketserver import ThreadingMixIn, UnixStreamServer
+
+from tracker_schema import RECORD_TYPES
+from tracking_tool import InternshipSearchTracker
+
+# Default budget for the estimated memory of the open trackers
+MAX_POOL_BYTES = 512 * 2**20
+
+# In-memory state of a tracker per byte of its data files: parsed rows,
+# indexes and caches take a few times the size of the CSV text
+MEMORY_PER_DATA_BYTE = 4
+
+# Buffered rows that trigger a flush, and the longest a row stays buffered
+FLUSH_ROWS = 1000
+FLUSH_INTERVAL = 0.5
+
+# Data directory names accepted in requests (no separators, no hidden names)
+DIR_NAME = re.compile(r"^[A-Za-z0-9_][A-Za-z0-9_.-]*$")
+
+# Request path -> table for adding rows
+ADD_PATHS = {"/companies": "companies", "/engagements": "engagements", "/queries": "queries"}
+
+
+class RequestError(Exception):
+    """A request the service can't serve, with the HTTP status to answer."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def directory_bytes(path):
+    """Total size of the files in a directory (not recursive)."""
+    total = 0
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_file(follow_symlinks=False):
+                total += entry.stat().st_size
+    return total
+
+
+class PoolEntry:
+    """An open tracker with its lock, write buffer and memory estimate."""
+
+    def __init__(self, data_dir, tracker_options):
+        from rich.console import Console
+
+        self.data_dir = data_dir
+        self.lock = threading.Lock()
+        if tracker_options.get("backend") == "sqlite":
+            # Requests use the tracker from whichever server thread they run on, one at
+            # a time: every use of it holds ``lock``
+            tracker_options = dict(tracker_options, check_same_thread=False)
+        self.tracker = InternshipSearchTracker(data_dir=data_dir, **tracker_options)
+        # Reports print to a buffer that each request reads back
+        self.output = io.StringIO()
+        self.tracker.console = Console(file=self.output, width=100, color_system=None)
+        self.pending = {table: [] for table in ADD_PATHS.values()}
+        self.pending_names = set()      # company names waiting in the buffer
+        self.pending_since = None
+        self.estimate = 0
+        self.measure()
+
+    def measure(self):
+        """Re-estimate the tracker's memory from the size of its data."""
+        self.estimate = directory_bytes(self.data_dir) * MEMORY_PER_DATA_BYTE
+        return self.estimate
+
+    def pending_rows(self):
+        return sum(len(rows) for rows in self.pending.values())
+
+    def take_output(self):
+        """Return what the tracker printed since the last call."""
+        text = self.output.getvalue()
+        self.output.seek(0)
+        self.output.truncate()
+        return text
+
+    def buffer(self, table, rows):
+        """Validate rows and buffer the valid ones (entry lock held).
+
+        Returns:
+            tuple: (number buffered, list of {"index", "error"} for rejected rows)
+        """
+        record_type = RECORD_TYPES[table]
+        queued = 0
+        rejected = []
+        for index, data in enumerate(rows):
+            if not isinstance(data, dict):
+                rejected.append({"index": index, "error": "not a JSON object"})
+                continue
+            record = record_type.from_dict(data)
+            missing = record.missing_fields()
+            if missing:
+                rejected.append({"index": index, "error": f"missing required field: {missing[0]}"})
+                continue
+            if table == "companies":
+                name = record.company_name
+                if name in self.pending_names or self.tracker.storage.has_company(name):
+                    rejected.append({"index": index, "error": f"company {name} already exists"})
+                    continue
+                self.pending_names.add(name)
+            self.pending[table].append(data)
+            queued += 1
+        if queued and self.pending_since is None:
+            self.pending_since = time.monotonic()
+        return queued, rejected
+
+    def flush(self):
+        """Write the buffered rows, one bulk append per table (entry lock held).
+
+        Returns:
+            int: Rows written
+        """
+        written = 0
+        ingest = {
+            "companies": self.tracker.add_companies,
+            "engagements": self.tracker.add_engagements,
+            "queries": self.tracker.add_search_queries
+        }
+        for table, rows in self.pending.items():
+            if rows:
+                written += ingest[table](rows)
+                self.pending[table] = []
+        self.pending_names.clear()
+        self.pending_since = None
+        self.take_output()
+        if written:
+            self.measure()
+        return written
+
+    def close(self):
+        """Flush and release the tracker (entry lock held)."""
+        self.flush()
+        self.tracker.storage.close()
+
+
+class TrackerPool:
+    """LRU pool of open trackers for the data directories under a root directory."""
+
+    def __init__(self, root, max_bytes=MAX_POOL_BYTES, max_trackers=None, flush_rows=FLUSH_ROWS, **tracker_options):
+        """
+        Args:
+            root (str): Directory holding one data directory per tracker
+            max_bytes (int): Budget for the estimated memory of the open trackers
+            max_trackers (int, optional): Maximum number of open trackers
+            flush_rows (int): Buffered rows of a directory that trigger a flush
+            **tracker_options: Passed to ``InternshipSearchTracker``, e.g. ``backend``
+        """
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_trackers = max_trackers
+        self.flush_rows = flush_rows
+        self.tracker_options = tracker_options
+        self._entries = OrderedDict()   # name -> PoolEntry, least recently used first
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "flushes": 0, "flushed_rows": 0, "flush_errors": 0}
+
+    def _path(self, name):
+        if not name or not DIR_NAME.match(name):
+            raise RequestError(400, f"invalid data directory name: {name!r}")
+        return os.path.join(self.root, name)
+
+    def acquire(self, name):
+        """Return the entry for a data directory with its lock held, opening it if needed.
+
+        Release it with ``release``.
+        """
+        path = self._path(name)
+        while True:
+            with self._lock:
+                entry = self._entries.get(name)
+                if entry is not None:
+                    self._entries.move_to_end(name)
+                    self.stats["hits"] += 1
+            if entry is None:
+                break
+            entry.lock.acquire()
+            # It may have been evicted while we waited for its lock
+            if self._entries.get(name) is entry:
+                return entry
+            entry.lock.release()
+
+        # Open outside the pool lock: loading a large directory must not stall the others
+        os.makedirs(path, exist_ok=True)
+        entry = PoolEntry(path, self.tracker_options)
+        entry.lock.acquire()
+        with self._lock:
+            current = self._entries.get(name)
+            if current is None:
+                self._entries[name] = entry
+                self.stats["misses"] += 1
+        if current is not None:
+            # Another request opened it first: use theirs
+            entry.tracker.storage.close()
+            entry.lock.release()
+            return self.acquire(name)
+        self._evict(keep=name)
+        return entry
+
+    def release(self, entry):
+        """Release an entry from ``acquire``, flushing its buffer if it is full."""
+        try:
+            if entry.pending_rows() >= self.flush_rows:
+                self._flush_entry(entry)
+        finally:
+            entry.lock.release()
+        self._evict(keep=None)
+
+    def _flush_entry(self, entry):
+        rows = entry.flush()
+        if rows:
+            self.stats["flushes"] += 1
+            self.stats["flushed_rows"] += rows
+
+    def used_bytes(self):
+        """Estimated memory of the open trackers."""
+        return sum(entry.estimate for entry in self._entries.values())
+
+    def _evict(self, keep):
+        """Close least recently used idle trackers until the pool is within its budget."""
+        while True:
+            with self._lock:
+                over_memory = self.used_bytes() > self.max_bytes
+                over_count = self.max_trackers is not None and len(self._entries) > self.max_trackers
+                if not (over_memory or over_count):
+                    return
+                victim = None
+                for name, entry in self._entries.items():
+                    # Busy entries are skipped rather than waited for
+                    if name != keep and entry.lock.acquire(blocking=False):
+                        victim = name, entry
+                        break
+                if victim is None:
+                    return
+                name, entry = victim
+                del self._entries[name]
+                self.stats["evictions"] += 1
+            try:
+                self._flush_entry(entry)
+                entry.tracker.storage.close()
+            finally:
+                entry.lock.release()
+
+    def flush_due(self, max_age):
+        """Flush the buffers holding rows older than ``max_age`` seconds (skipping busy entries).
+
+        A failed flush is reported on standard error and counted in ``stats``;
+        its rows stay buffered and are retried on the next call.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entries = list(self._entries.values())
+        for entry in entries:
+            if entry.pending_since is None or now - entry.pending_since < max_age:
+                continue
+            if entry.lock.acquire(blocking=False):
+                try:
+                    self._flush_entry(entry)
+                except Exception as e:
+                    # Keep the rows buffered for the next attempt, and keep flushing the others
+                    self.stats["flush_errors"] += 1
+                    print(f"Error flushing {entry.data_dir}: {e}", file=sys.stderr)
+                finally:
+                    entry.lock.release()
+
+    def flush_all(self):
+        """Flush every buffer, waiting for busy entries.
+
+        Returns:
+            int: Rows written
+        """
+        with self._lock:
+            entries = list(self._entries.values())
+        before = self.stats["flushed_rows"]
+        for entry in entries:
+            with entry.lock:
+                self._flush_entry(entry)
+        return self.stats["flushed_rows"] - before
+
+    def close(self):
+        """Flush and close every tracker."""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for entry in entries:
+            with entry.lock:
+                self._flush_entry(entry)
+                entry.tracker.storage.close()
+
+    def summary(self):
+        """Return pool statistics as JSON-serializable data."""
+        with self._lock:
+            return dict(
+                self.stats,
+                open=len(self._entries),
+                used_bytes=self.used_bytes(),
+                max_bytes=self.max_bytes,
+                pending_rows=sum(entry.pending_rows() for entry in self._entries.values()),
+                directories=list(self._entries)
+            )
+
+
+def _analytics_data(analytics):
+    """Summarize aggregates as the figures the analytics report shows."""
+    return {
+        "engagements": analytics.engagement_count,
+        "companies": analytics.company_count,
+        "queries": analytics.query_count,
+        "response_rate": analytics.response_rate(),
+        "platform_response_rates": analytics.platform_response_rates(),
+        "type_response_rates": analytics.type_response_rates(),
+        "status_breakdown": dict(analytics.status_breakdown()),
+        "industry_breakdown": dict(analytics.industry_breakdown()),
+        "top_technologies": dict(analytics.top_technologies(10)),
+        "average_response_time": analytics.average_response_time()
+    }
+
+
+class TrackerService:
+    """Route JSON requests to the trackers of a ``TrackerPool``."""
+
+    def __init__(self, pool, flush_interval=FLUSH_INTERVAL):
+        self.pool = pool
+        self.flush_interval = flush_interval
+        self._stop = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flusher.start()
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.flush_interval / 2):
+            self.pool.flush_due(self.flush_interval)
+
+    def close(self):
+        """Stop the background flusher and flush and close every tracker."""
+        self._stop.set()
+        self._flusher.join()
+        self.pool.close()
+
+    def handle(self, method, path, query, body):
+        """Serve one request.
+
+        Returns:
+            dict: JSON response body
+
+        Raises:
+            RequestError: For unknown paths and invalid requests
+        """
+        if path == "/stats" and method == "GET":
+            return self.pool.summary()
+        if path == "/flush" and method == "POST":
+            return {"flushed": self.pool.flush_all()}
+
+        routes = {
+            ("POST", "/status"): self._update_status,
+            ("POST", "/response"): self._update_response,
+            ("GET", "/upcoming"): self._upcoming,
+            ("GET", "/analytics"): self._analytics,
+            ("GET", "/suggestions"): self._suggestions,
+        }
+        if method == "POST" and path in ADD_PATHS:
+            route = self._add
+        else:
+            route = routes.get((method, path))
+        if route is None:
+            raise RequestError(404, f"no route for {method} {path}")
+
+        entry = self.pool.acquire(query.get("dir", ""))
+        try:
+            if route is not self._add:
+                # Reads and updates see every row added before them
+                self.pool._flush_entry(entry)
+            return route(entry, path, query, body)
+        finally:
+            self.pool.release(entry)
+
+    def _add(self, entry, path, query, body):
+        rows = body if isinstance(body, list) else [body]
+        queued, rejected = entry.buffer(ADD_PATHS[path], rows)
+        return {"queued": queued, "rejected": rejected}
+
+    def _update_status(self, entry, path, query, body):
+        if not body.get("company") or not body.get("status"):
+            raise RequestError(400, "company and status are required")
+        updated = entry.tracker.update_company_status(body["company"], body["status"], body.get("notes"))
+        return {"updated": updated, "output": entry.take_output()}
+
+    def _update_response(self, entry, path, query, body):
+        if not body.get("contact") or not body.get("company") or "response" not in body:
+            raise RequestError(400, "contact, company and response are required")
+        updated = entry.tracker.update_engagement_response(
+            body["contact"], body["company"], body["response"], body.get("response_time")
+        )
+        return {"updated": updated, "output": entry.take_output()}
+
+    def _upcoming(self, entry, path, query, body):
+        try:
+            days = int(query.get("days", 7))
+        except ValueError:
+            raise RequestError(400, "days must be an integer")
+        start = datetime.date.today()
+        actions = entry.tracker.storage.next_actions(start.isoformat(), (start + datetime.timedelta(days=days)).isoformat())
+        return {"actions": actions}
+
+    def _analytics(self, entry, path, query, body):
+        return _analytics_data(entry.tracker.compute_analytics())
+
+    def _suggestions(self, entry, path, query, body):
+        report = entry.tracker.suggest_optimizations(output=None)
+        if report is False:
+            raise RequestError(500, entry.take_output().strip() or "could not compute suggestions")
+        entry.take_output()
+        return {"suggestions": report.rows("suggestions")}
+
+
+def _make_handler(service):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body are written separately; don't let Nagle's algorithm delay the body
+        disable_nagle_algorithm = True
+
+        def _serve(self, method):
+            status = 200
+            try:
+                parts = urllib.parse.urlsplit(self.path)
+                query = {key: values[-1] for key, values in urllib.parse.parse_qs(parts.query).items()}
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else {}
+                result = service.handle(method, parts.path, query, body)
+            except RequestError as e:
+                status, result = e.status, {"error": str(e)}
+            except ValueError as e:
+                status, result = 400, {"error": f"invalid request: {e}"}
+            except Exception as e:
+                status, result = 500, {"error": str(e)}
+            payload = json.dumps(result).encode('utf-8')
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            self._serve("GET")
+
+        def do_POST(self):
+            self._serve("POST")
+
+        def address_string(self):
+            # Unix socket peers have no address
+            return self.client_address[0] if self.client_address else "local"
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+class ThreadingUnixHTTPServer(ThreadingMixIn, UnixStreamServer):
+    """HTTP server on a Unix socket, one thread per connection."""
+
+    daemon_threads = True
+
+    def get_request(self):
+        request, _ = super().get_request()
+        # BaseHTTPRequestHandler expects a (host, port)-like client address
+        return request, ("local", 0)
+
+
+def make_server(service, host="127.0.0.1", port=0, unix_socket=None):
+    """Create an HTTP server for a service on a TCP port or a Unix socket (not started)."""
+    handler = _make_handler(service)
+    if unix_socket:
+        if os.path.exists(unix_socket):
+            os.remove(unix_socket)
+        # TCP_NODELAY doesn't apply to Unix sockets
+        handler = type("UnixHandler", (handler,), {"disable_nagle_algorithm": False})
+        return ThreadingUnixHTTPServer(unix_socket, handler)
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+class _UnixConnection(http.client.HTTPConnection):
+    def __init__(self, path, timeout=60):
+        super().__init__("localhost", timeout=timeout)
+        self._socket_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self._socket_path)
+
+
+class ServiceClient:
+    """Minimal client for a tracker service, keeping one connection open."""
+
+    def __init__(self, host="127.0.0.1", port=None, unix_socket=None, timeout=60):
+        if unix_socket:
+            self._connection = _UnixConnection(unix_socket, timeout=timeout)
+        else:
+            self._connection = http.client.HTTPConnection(host, port, timeout=timeout)
+
+    def request(self, method, path, data_dir=None, body=None, **params):
+        """Send a request and return (HTTP status, decoded JSON body)."""
+        if data_dir is not None:
+            params["dir"] = data_dir
+        if params:
+            path = f"{path}?{urllib.parse.urlencode(params)}"
+        payload = json.dumps(body).encode('utf-8') if body is not None else None
+        headers = {"Content-Type": "application/json"} if payload is not None else {}
+        self._connection.request(method, path, body=payload, headers=headers)
+        response = self._connection.getresponse()
+        return response.status, json.loads(response.read())
+
+    def close(self):
+        self._connection.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve many tracker data directories from one process.")
+    parser.add_argument("--root", required=True, help="Directory holding one data directory per student")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--socket", help="Listen on this Unix socket instead of a TCP port")
+    parser.add_argument("--backend", default="csv", choices=["csv", "sqlite"])
+    parser.add_argument("--max-memory", type=int, default=MAX_POOL_BYTES // 2**20,
+                        help="Estimated memory budget of the open trackers in MiB (default: %(default)s)")
+    parser.add_argument("--max-trackers", type=int, help="Maximum number of open trackers")
+    parser.add_argument("--flush-rows", type=int, default=FLUSH_ROWS, help="Buffered rows that trigger a flush")
+    parser.add_argument("--flush-interval", type=float, default=FLUSH_INTERVAL,
+                        help="Longest time in seconds a row stays buffered (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    pool = TrackerPool(args.root, max_bytes=args.max_memory * 2**20, max_trackers=args.max_trackers,
+                       flush_rows=args.flush_rows, backend=args.backend)
+    service = TrackerService(pool, flush_interval=args.flush_interval)
+    server = make_server(service, args.host, args.port, args.socket)
+    where = args.socket or "http://{}:{}".format(*server.server_address[:2])
+    print(f"Serving {args.root} on {where}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        if args.socket and os.path.exists(args.socket):
+            os.remove(args.socket)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
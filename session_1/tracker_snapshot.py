@@ -0,0 +1,330 @@
+"""Memory-mapped columnar snapshot of the CSV tables.
+
+Parsing a CSV file tokenizes every field of every row and builds a Python
+string per cell, even when a report needs three columns. The snapshot keeps
+each column of each table in its own binary file of fixed-width values:
+
+- text columns are dictionary encoded: int32 codes (-1 for blank) into a
+  list of distinct values stored alongside,
+- date columns are int64 nanoseconds since the epoch (pandas' ``NaT`` for
+  blank or unparseable dates),
+- numeric columns are float64 (NaN for blank).
+
+``ColumnarSnapshot.load`` memory-maps just the requested columns and wraps
+them in a DataFrame without parsing or copying the numeric and date data.
+Like the analytics cache, the snapshot follows the CSV files by byte offset:
+appended rows are parsed and appended to the column files, and a rewrite
+triggers a rebuild, except that in-place updates applied by the storage's
+compaction are patched in (``patch``) without re-reading the file.
+
+Column files are never truncated or modified in place below the rows a
+reader may have mapped: rebuilds and patches write new files (a new
+generation), and old files are unlinked, which keeps existing maps valid.
+
+The upcoming actions don't read the snapshot. Its columns are in row
+order, so a date window would be a scan of the whole "Next Action Date"
+column behind a pandas import. ``NextActionIndex`` is sorted by date and
+finds the window by binary search in the file.
+"""
+import json
+import os
+import uuid
+
+from tracker_index import parse_date
+from tracker_locking import FileLock, atomic_write
+from tracker_schema import TABLES, numeric_fields
+
+# Columns stored as int64 dates rather than dictionary-encoded text
+DATE_COLUMNS = {
+    "companies": ["Last Contact Date"],
+    "engagements": ["Date", "Next Action Date"],
+    "queries": ["Date Added"],
+}
+
+# Column kind -> NumPy dtype of its data file
+KIND_DTYPES = {"codes": "<i4", "float": "<f8", "date": "<i8"}
+
+# Rows parsed per chunk while appending to the snapshot
+SNAPSHOT_CHUNKSIZE = 100000
+
+# int64 value of pandas' NaT
+NAT = -(1 << 63)
+
+
+def column_kind(table, field):
+    """Return how a column is stored: "codes", "float" or "date"."""
+    if field in DATE_COLUMNS[table]:
+        return "date"
+    if field in numeric_fields(table):
+        return "float"
+    return "codes"
+
+
+def _date_value(value):
+    """Convert a date cell to int64 nanoseconds since the epoch (NAT if it isn't a date)."""
+    import numpy as np
+
+    iso = parse_date(value) if isinstance(value, str) else None
+    if iso is None:
+        return NAT
+    return int(np.datetime64(iso, "ns").astype("int64"))
+
+
+def _float_value(value):
+    try:
+        return float(value) if value not in (None, "") else float("nan")
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+class _Dictionary:
+    """Distinct values of a dictionary-encoded column, with their codes."""
+
+    def __init__(self, values=()):
+        self.values = list(values)
+        self.codes = {value: code for code, value in enumerate(self.values)}
+        self.grown = False
+
+    def code(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+            self.grown = True
+        return code
+
+
+class ColumnarSnapshot:
+    """Columnar, memory-mappable copy of a ``CsvStorage``'s tables."""
+
+    dir_name = "snapshot"
+    version = 1
+
+    def __init__(self, storage):
+        self.storage = storage
+        self.directory = os.path.join(storage.data_dir, self.dir_name)
+        os.makedirs(self.directory, exist_ok=True)
+        # Serializes snapshot writers across processes; taken after the
+        # storage's own lock where both are needed, never before it
+        self.lock = FileLock(os.path.join(self.directory, ".snapshot.lock"))
+        self._dictionaries = {}     # categories file -> (mtime_ns, values)
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _read_meta(self, table):
+        try:
+            with open(self._path(f"{table}.json"), 'r') as file:
+                meta = json.load(file)
+        except (OSError, ValueError):
+            return None
+        return meta if meta.get("version") == self.version else None
+
+    def _write_meta(self, table, meta):
+        with atomic_write(self._path(f"{table}.json"), fsync=False) as file:
+            json.dump(meta, file)
+        # Drop files of older generations and superseded patches
+        referenced = {f"{table}.json"}
+        for column in meta["columns"].values():
+            referenced.add(column["data"])
+            if "categories" in column:
+                referenced.add(column["categories"])
+        for name in os.listdir(self.directory):
+            if name.startswith(f"{table}.") and name not in referenced and not name.endswith(".tmp"):
+                try:
+                    os.remove(self._path(name))
+                except FileNotFoundError:
+                    pass
+
+    def _new_meta(self, table):
+        """Describe an empty snapshot of a table with fresh file names."""
+        generation = uuid.uuid4().hex[:8]
+        columns = {}
+        for position, field in enumerate(TABLES[table][1]):
+            kind = column_kind(table, field)
+            column = {"kind": kind, "data": f"{table}.{position}.{generation}.bin"}
+            if kind == "codes":
+                column["categories"] = f"{table}.{position}.{generation}.json"
+            columns[field] = column
+            open(self._path(column["data"]), 'wb').close()
+        return {"version": self.version, "rows": 0, "state": None, "columns": columns}
+
+    def _dictionary(self, column):
+        """Load a column's distinct values (cached until the file changes)."""
+        name = column["categories"]
+        try:
+            mtime = os.stat(self._path(name)).st_mtime_ns
+        except FileNotFoundError:
+            return []
+        cached = self._dictionaries.get(name)
+        if cached is None or cached[0] != mtime:
+            with open(self._path(name), 'r') as file:
+                cached = (mtime, json.load(file))
+            self._dictionaries[name] = cached
+        return cached[1]
+
+    def _save_dictionary(self, column, dictionary):
+        if dictionary.grown:
+            with atomic_write(self._path(column["categories"]), fsync=False) as file:
+                json.dump(dictionary.values, file)
+            dictionary.grown = False
+
+    def exists(self, table):
+        """Return True if a snapshot of the table has been built."""
+        return self._read_meta(table) is not None
+
+    def refresh(self, table):
+        """Bring a table's snapshot up to date with its CSV file.
+
+        Returns:
+            dict: The table's snapshot metadata
+        """
+        # Apply pending writes first: they need the storage lock, which must
+        # not be taken while holding the snapshot lock
+        self.storage.sync()
+        with self.lock.hold():
+            meta = self._read_meta(table)
+            change = self.storage._classify(table, meta and meta["state"])
+            if change == "unchanged":
+                return meta
+            if change == "appended":
+                offset = meta["state"]["offset"]
+            else:
+                meta = self._new_meta(table)
+                offset = None
+            frames, offset = self.storage.read_tail_chunks(table, offset, SNAPSHOT_CHUNKSIZE)
+            self._append(table, meta, frames)
+            meta["state"] = self.storage.tail_state(table, offset)
+            self._write_meta(table, meta)
+            return meta
+
+    def _append(self, table, meta, frames):
+        """Append parsed rows to the column files."""
+        import numpy as np
+        import pandas as pd
+
+        dictionaries = {
+            field: _Dictionary(self._dictionary(column))
+            for field, column in meta["columns"].items() if column["kind"] == "codes"
+        }
+        files = {}
+        try:
+            for field, column in meta["columns"].items():
+                file = open(self._path(column["data"]), 'r+b')
+                # Bytes past the recorded rows are left from an interrupted append
+                file.truncate(meta["rows"] * np.dtype(KIND_DTYPES[column["kind"]]).itemsize)
+                file.seek(0, os.SEEK_END)
+                files[field] = file
+
+            for frame in frames:
+                rows = len(frame)
+                for field, column in meta["columns"].items():
+                    kind = column["kind"]
+                    if field not in frame.columns:
+                        fill = {"codes": -1, "float": np.nan, "date": NAT}[kind]
+                        values = np.full(rows, fill, dtype=KIND_DTYPES[kind])
+                    elif kind == "float":
+                        values = frame[field].to_numpy(dtype="float64", na_value=np.nan)
+                    else:
+                        # Encode each distinct value once, then map the per-chunk codes
+                        local_codes, uniques = pd.factorize(frame[field])
+                        if kind == "codes":
+                            dictionary = dictionaries[field]
+                            mapping = [dictionary.code(str(value)) for value in uniques]
+                        else:
+                            mapping = [_date_value(value) for value in uniques]
+                        fill = -1 if kind == "codes" else NAT
+                        # Code -1 (missing) picks the appended fill value
+                        values = np.array(mapping + [fill], dtype=KIND_DTYPES[kind])[local_codes]
+                    files[field].write(np.ascontiguousarray(values, dtype=KIND_DTYPES[kind]).tobytes())
+                meta["rows"] += rows
+        finally:
+            for file in files.values():
+                file.close()
+        for field, dictionary in dictionaries.items():
+            self._save_dictionary(meta["columns"][field], dictionary)
+
+    def load(self, table, columns=None):
+        """Return a table's columns as a DataFrame backed by the memory-mapped snapshot.
+
+        The snapshot is refreshed first. Text columns come back as
+        categoricals, dates as ``datetime64[ns]`` and numbers as float64.
+
+        Args:
+            table (str): Table name
+            columns (list, optional): Columns to load, all by default
+
+        Returns:
+            tuple: (DataFrame, byte offset of the CSV file it covers)
+        """
+        import numpy as np
+        import pandas as pd
+
+        meta = self.refresh(table)
+        rows = meta["rows"]
+        data = {}
+        for field in TABLES[table][1] if columns is None else columns:
+            column = meta["columns"][field]
+            kind = column["kind"]
+            if rows:
+                values = np.memmap(self._path(column["data"]), dtype=KIND_DTYPES[kind], mode='r', shape=(rows,))
+            else:
+                values = np.empty(0, dtype=KIND_DTYPES[kind])
+            if kind == "codes":
+                values = pd.Categorical.from_codes(values, categories=self._dictionary(column), validate=False)
+            elif kind == "date":
+                values = values.view("datetime64[ns]")
+            data[field] = values
+        frame = pd.DataFrame(data, index=pd.RangeIndex(rows), copy=False)
+        return frame, meta["state"]["offset"]
+
+    def patch(self, table, rows, updates):
+        """Apply in-place row updates made by a rewrite of the table's file.
+
+        Call with the storage's write lock held, right after the rewrite, and
+        only if the snapshot was current before it. Each updated column gets
+        a new data file, so readers with the old one mapped are unaffected.
+
+        Args:
+            table (str): Table name
+            rows (int): Number of rows in the rewritten file
+            updates (list): (row position, changes dict) pairs, in the order they were applied
+        """
+        import numpy as np
+
+        with self.lock.hold():
+            meta = self._read_meta(table)
+            if meta is None:
+                return
+            if meta["rows"] != rows:
+                # The snapshot disagrees about the row count: rebuild it on the next load
+                os.remove(self._path(f"{table}.json"))
+                return
+
+            by_field = {}
+            for position, changes in updates:
+                for field, value in changes.items():
+                    if field in meta["columns"]:
+                        by_field.setdefault(field, []).append((position, value))
+
+            patch_id = uuid.uuid4().hex[:8]
+            for field, values in by_field.items():
+                column = meta["columns"][field]
+                kind = column["kind"]
+                data = np.fromfile(self._path(column["data"]), dtype=KIND_DTYPES[kind], count=rows)
+                if kind == "codes":
+                    dictionary = _Dictionary(self._dictionary(column))
+                    for position, value in values:
+                        data[position] = dictionary.code(str(value)) if value not in (None, "") else -1
+                    self._save_dictionary(column, dictionary)
+                else:
+                    convert = _float_value if kind == "float" else _date_value
+                    for position, value in values:
+                        data[position] = convert(value)
+                stem = column["data"].rsplit(".", 2)[0]
+                column["data"] = f"{stem}.{patch_id}.bin"
+                data.tofile(self._path(column["data"]))
+
+            size = os.path.getsize(self.storage.csv_path(table))
+            meta["state"] = self.storage.tail_state(table, size)
+            self._write_meta(table, meta)
@@ -0,0 +1,1286 @@
+"""Storage backends for the internship search tracker.
+
+The tracker talks to its data through a small storage interface so the same
+``InternshipSearchTracker`` API can run on plain CSV files (the original
+format, easy to open in a spreadsheet) or on an embedded SQLite database
+that keeps indexes on the lookup keys and updates rows in place.
+"""
+import bisect
+import csv
+import datetime
+import hashlib
+import io
+import os
+import shutil
+import sqlite3
+from contextlib import contextmanager
+
+from tracker_events import COMPACT_AFTER_BYTES, COMPACT_AFTER_SECONDS, UpdateLog, new_event
+from tracker_index import NextActionIndex, parse_date
+from tracker_journal import WriteJournal
+from tracker_locking import FileLock, atomic_write
+from tracker_queries import QueryIndex, QueryStats
+from tracker_schema import RECORD_TYPES, TABLES, apply_dtypes, as_record, numeric_fields
+from tracker_snapshot import ColumnarSnapshot
+from tracker_technologies import TechnologyIndex, normalize_technology, parse_technologies
+
+# Write buffer for bulk CSV appends
+APPEND_BUFFER_SIZE = 1 << 20
+
+# Bytes before a recorded offset that must be unchanged for a file to count as only appended to
+FINGERPRINT_BYTES = 256
+
+# Columns whose updates are compacted right away: they identify rows or
+# feed the next-action index, so later updates and lookups depend on them
+IMMEDIATE_COLUMNS = {"Company Name", "Contact Name", "Company", "Next Action", "Next Action Date"}
+
+# Lock file guarding writes to a CSV data directory
+LOCK_FILE_NAME = ".tracker.lock"
+
+# Seconds a SQLite connection waits for another process's write transaction
+SQLITE_BUSY_TIMEOUT = 30
+
+
+def _chunk_dtypes(table):
+    """Read dtypes for chunked parsing: numeric columns as text, coerced per chunk.
+
+    A chunk can't be re-read once a bad number fails the parse, so numbers
+    are always converted afterwards instead.
+    """
+    numeric = numeric_fields(table)
+    return {
+        field: ("str" if field in numeric else dtype)
+        for field, dtype in RECORD_TYPES[table].dtypes.items()
+    }
+
+
+def _complete_end(file, offset):
+    """Return the offset just past the last newline at or after ``offset`` (``offset`` if none)."""
+    pos = file.seek(0, os.SEEK_END)
+    while pos > offset:
+        start = max(offset, pos - 65536)
+        file.seek(start)
+        newline = file.read(pos - start).rfind(b'\n')
+        if newline >= 0:
+            return start + newline + 1
+        pos = start
+    return offset
+
+
+class _TailReader(io.RawIOBase):
+    """Read-only stream of a CSV header line followed by the file bytes in [offset, end).
+
+    Lets pandas parse the tail of a file in chunks without first loading the
+    tail into memory.
+    """
+
+    def __init__(self, path, header, offset, end):
+        super().__init__()
+        self._file = open(path, 'rb')
+        self._file.seek(offset)
+        self._prefix = header
+        self._remaining = end - offset
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if self._prefix:
+            size = min(len(buffer), len(self._prefix))
+            buffer[:size] = self._prefix[:size]
+            self._prefix = self._prefix[size:]
+            return size
+        size = min(len(buffer), self._remaining)
+        if size <= 0:
+            return 0
+        data = self._file.read(size)
+        buffer[:len(data)] = data
+        self._remaining -= len(data)
+        return len(data)
+
+    def close(self):
+        self._file.close()
+        super().close()
+
+
+class TrackerStorage:
+    """Interface shared by all tracker storage backends."""
+
+    name = None
+
+    # Metrics collecting rows and bytes of I/O while instrumentation is enabled (see tracker_metrics)
+    metrics = None
+
+    def __init__(self, data_dir):
+        self.data_dir = data_dir
+        if not os.path.exists(data_dir):
+            os.makedirs(data_dir)
+        self.updates = UpdateLog(data_dir)
+
+    def csv_path(self, table, directory=None):
+        """Return the CSV file path for a table inside ``directory`` (default: data_dir)."""
+        return os.path.join(directory or self.data_dir, TABLES[table][0])
+
+    def has_company(self, company_name):
+        """Return True if a company with this name is already tracked."""
+        raise NotImplementedError
+
+    def append_rows(self, table, rows, fsync=False):
+        """Append a list of row dicts to a table.
+
+        Args:
+            table (str): Table name
+            rows (list): Row dicts to append
+            fsync (bool): Force the data to disk before returning
+        """
+        with self.appender(table, fsync=fsync) as write:
+            for row in rows:
+                write(row)
+
+    @contextmanager
+    def appender(self, table, fsync=False):
+        """Open a buffered writer for appending many rows to a table.
+
+        Yields a ``write(row)`` function taking a record of the table's type
+        (or a dict, which is converted). Rows are guaranteed to be stored
+        once the ``with`` block exits.
+
+        Args:
+            table (str): Table name
+            fsync (bool): Force the data to disk when the block exits
+        """
+        raise NotImplementedError
+
+    def update_company(self, company_name, changes):
+        """Apply ``changes`` to the first company with this name.
+
+        Returns:
+            bool: True if a matching company was found
+        """
+        raise NotImplementedError
+
+    def update_companies(self, updates):
+        """Apply a batch of company updates.
+
+        Args:
+            updates (dict): Company name -> changes
+
+        Returns:
+            int: Number of companies found and updated
+        """
+        return sum(1 for company_name, changes in updates.items() if self.update_company(company_name, changes))
+
+    def update_latest_engagement(self, contact_name, company, changes):
+        """Apply ``changes`` to the most recent engagement with a contact at a company.
+
+        Returns:
+            bool: True if a matching engagement was found
+        """
+        raise NotImplementedError
+
+    def read_rows(self, table):
+        """Return all rows of a table as a list of dicts, in insertion order."""
+        raise NotImplementedError
+
+    def companies_using(self, technologies, match_all=True):
+        """Return the names of companies using the given technologies (any spelling or alias).
+
+        Args:
+            technologies (list): Technology names
+            match_all (bool): Require every technology (AND) instead of any of them (OR)
+        """
+        raise NotImplementedError
+
+    def technology_counts(self, n=None):
+        """Return (technology, number of companies) pairs, most used first, with aliases merged."""
+        raise NotImplementedError
+
+    def query_stats(self):
+        """Return effectiveness totals per platform and canonical search query (a ``QueryStats``).
+
+        This default implementation reads every query row; backends override
+        it to fold in only the rows added since the last call.
+        """
+        stats = QueryStats()
+        stats.add_rows(self.read_rows("queries"))
+        return stats
+
+    def update_history(self, include_pending=True):
+        """Return every status and response update made so far, oldest first (see ``tracker_events``)."""
+        return self.updates.history(include_pending)
+
+    def compact(self):
+        """Apply pending update events to the stored rows.
+
+        Returns:
+            int: Number of events applied
+        """
+        return 0
+
+    def next_actions(self, start=None, end=None):
+        """Return engagements whose next action falls in a date window, sorted by date.
+
+        This default implementation scans every engagement; backends override
+        it with an indexed lookup.
+
+        Args:
+            start (str, optional): First ISO date to include, unbounded if None
+            end (str, optional): Last ISO date to include, unbounded if None
+
+        Returns:
+            list: Dicts with "Next Action Date" (ISO), "Contact Name", "Company" and "Next Action"
+        """
+        actions = []
+        for row in self.read_rows("engagements"):
+            date = parse_date(row.get("Next Action Date"))
+            if date is None or (start and date < start) or (end and date > end):
+                continue
+            actions.append({
+                "Next Action Date": date,
+                "Contact Name": row.get("Contact Name", ""),
+                "Company": row.get("Company", ""),
+                "Next Action": row.get("Next Action", "")
+            })
+        actions.sort(key=lambda action: action["Next Action Date"])
+        return actions
+
+    def iter_next_actions(self, start=None, end=None):
+        """Yield the actions ``next_actions`` returns one at a time, as they are read.
+
+        Backends with an index or a cursor override this to avoid building
+        the whole list first.
+        """
+        return iter(self.next_actions(start, end))
+
+    def change_token(self, table, columns=None):
+        """Return a JSON-serializable value that changes whenever a table changes.
+
+        Updates still waiting in the CSV backend's update log don't count
+        until they are applied.
+
+        Args:
+            table (str): Table name
+            columns (set, optional): Only count in-place updates of these columns;
+                backends that can't tell updated columns apart ignore it
+
+        Returns:
+            Token to compare with a later call, or None if the backend can't
+            tell (callers should then assume the table changed)
+        """
+        return None
+
+    def read_frame(self, table):
+        """Return a table as a pandas DataFrame."""
+        raise NotImplementedError
+
+    def iter_frames(self, table, chunksize=None):
+        """Yield a table as DataFrames of at most ``chunksize`` rows (one frame if None).
+
+        Backends override this to stream from disk; this fallback loads the
+        whole table first.
+        """
+        frame = self.read_frame(table)
+        if not chunksize:
+            yield frame
+            return
+        for start in range(0, len(frame), chunksize):
+            yield frame.iloc[start:start + chunksize]
+
+    def import_csv(self, source_dir):
+        """Append the rows of the CSV files found in ``source_dir``.
+
+        Returns:
+            dict: Number of rows imported per table
+        """
+        imported = {}
+        for table in TABLES:
+            path = self.csv_path(table, source_dir)
+            if not os.path.exists(path):
+                continue
+            with open(path, 'r', newline='') as file:
+                rows = list(csv.DictReader(file))
+            if rows:
+                self.append_rows(table, rows)
+            imported[table] = len(rows)
+        return imported
+
+    def export_csv(self, target_dir=None):
+        """Write every table as a CSV file with the standard headers.
+
+        Returns:
+            list: Paths of the files written
+        """
+        target_dir = target_dir or self.data_dir
+        if not os.path.exists(target_dir):
+            os.makedirs(target_dir)
+        paths = []
+        for table, (_, fieldnames) in TABLES.items():
+            path = self.csv_path(table, target_dir)
+            with open(path, 'w', newline='') as file:
+                writer = csv.DictWriter(file, fieldnames=fieldnames, extrasaction='ignore')
+                writer.writeheader()
+                writer.writerows(self.read_rows(table))
+            paths.append(path)
+        return paths
+
+    def close(self):
+        """Release any resources held by the backend."""
+
+
+class CsvStorage(TrackerStorage):
+    """Store each table as a CSV file in the data directory.
+
+    Several processes can share the directory. Writes hold an exclusive
+    advisory lock (see ``tracker_locking``), whole-file rewrites are swapped
+    in atomically, and reads of whole files hold a shared lock. Appends that
+    find the lock busy are queued in a ``WriteJournal`` instead of waiting,
+    and queued rows are applied before the next read or write.
+    """
+
+    name = "csv"
+
+    def __init__(self, data_dir, compact_after_bytes=COMPACT_AFTER_BYTES, compact_after_seconds=COMPACT_AFTER_SECONDS,
+                 snapshot=False):
+        """
+        Args:
+            data_dir (str): Data directory
+            compact_after_bytes (int): Pending update log size that triggers compaction
+            compact_after_seconds (float, optional): Age of the oldest pending update that triggers compaction
+            snapshot (bool): Keep a memory-mapped columnar snapshot of the tables
+                (see ``tracker_snapshot``) for the analytics to read instead of re-parsing rewritten files
+        """
+        super().__init__(data_dir)
+        self.updates = UpdateLog(data_dir, compact_after_bytes, compact_after_seconds)
+        self._company_names = None
+        self._company_names_signature = None
+        self._appending = False
+        # (contact name, company) -> (status, date) of its latest engagement row
+        self._engagement_keys = {}
+        self._engagement_count = 0
+        self._engagement_state = None
+        self.lock = FileLock(os.path.join(data_dir, LOCK_FILE_NAME))
+        self.journal = WriteJournal(data_dir)
+        self._initialize_files()
+        self.next_action_index = NextActionIndex(self)
+        self.technology_index = TechnologyIndex(self)
+        self.query_index = QueryIndex(self)
+        self.snapshot = ColumnarSnapshot(self) if snapshot else None
+        # Indexes kept outside the storage that follow appends too (see ``follow``)
+        self._followers = []
+
+    def follow(self, index):
+        """Keep an outside index that follows appends in step with compaction rewrites.
+
+        The index has a ``tables`` tuple, a ``columns`` set and ``catch_up()``
+        and ``resync(table)`` methods, like ``EntityResolver``. Rewrites that
+        change none of its columns catch it up before and resync it after,
+        so it doesn't have to rebuild.
+        """
+        self._followers.append(index)
+
+    def _followers_kept(self, table, changed):
+        """Catch up the outside indexes over a table that a rewrite of ``changed`` columns keeps."""
+        kept = [index for index in self._followers if table in index.tables and not index.columns.intersection(changed)]
+        for index in kept:
+            index.catch_up()
+        return kept
+
+    def _initialize_files(self):
+        """Initialize tracking files if they don't exist."""
+        with self.lock.hold():
+            for table, (_, fieldnames) in TABLES.items():
+                path = self.csv_path(table)
+                if not os.path.exists(path):
+                    with atomic_write(path, newline='') as file:
+                        writer = csv.writer(file)
+                        writer.writerow(fieldnames)
+
+    @contextmanager
+    def _writing(self):
+        """Hold the exclusive write lock, with queued journal rows applied first so writes stay in order."""
+        with self.lock.hold():
+            self._apply_journal()
+            yield
+
+    def _sync_journal(self):
+        """Apply rows that other processes queued in the write journal."""
+        if self.lock.held or not self.journal.has_entries():
+            return
+        with self._writing():
+            pass
+
+    def sync(self):
+        """Bring the files up to date for reading: apply queued rows and pending update events."""
+        if self.lock.held or not (self.journal.has_entries() or self.updates.has_pending()):
+            return
+        with self._writing():
+            self._compact()
+
+    def _apply_journal(self):
+        """Append the journal's queued rows to the tables as one group commit (write lock held)."""
+        if not self.journal.claim():
+            return
+        entries, sizes = self.journal.read_claimed()
+        if sizes is None:
+            sizes = {table: os.path.getsize(self.csv_path(table)) for table in TABLES}
+            self.journal.record_sizes(sizes)
+        else:
+            # A previous apply was interrupted: drop the part of it that reached the files
+            for table, size in sizes.items():
+                os.truncate(self.csv_path(table), size)
+
+        for table in TABLES:
+            record_type = RECORD_TYPES[table]
+            rows = [values for entry_table, values in entries if entry_table == table]
+            if rows:
+                with self._append(table, fsync=True) as write:
+                    for values in rows:
+                        write(record_type(*values))
+        self.journal.finish()
+
+    def _header(self, table):
+        """Return the column names from the first line of a table's CSV file."""
+        with open(self.csv_path(table), 'r', newline='') as file:
+            return next(csv.reader(file), None) or list(TABLES[table][1])
+
+    def _file_signature(self, table):
+        stat = os.stat(self.csv_path(table))
+        return (stat.st_size, stat.st_mtime_ns)
+
+    def _company_index(self):
+        """Return the set of tracked company names.
+
+        The set is built once from the companies file and kept up to date by
+        our own appends; it is rebuilt if the file changed behind our back
+        (another process or a manual edit).
+        """
+        if self._appending and self._company_names is not None:
+            # Our own appender is mid-write; the set already includes its rows
+            return self._company_names
+        # Pending update events never change company names
+        self._sync_journal()
+        signature = self._file_signature("companies")
+        if self._company_names is None or signature != self._company_names_signature:
+            self._company_names = {
+                company.get("Company Name") for company in self.read_rows("companies")
+            }
+            self._company_names_signature = signature
+        return self._company_names
+
+    def has_company(self, company_name):
+        return company_name in self._company_index()
+
+    @contextmanager
+    def appender(self, table, fsync=False):
+        # Company appends wait for the lock, since duplicate checks need the
+        # current file; other rows go to the journal if another process is writing
+        if not self.lock.acquire(blocking=table == "companies"):
+            write, flush = self.journal.writer(table, fsync=fsync)
+            yield lambda row: write(as_record(table, row))
+            flush()
+            # Apply the batch now if the writer has finished in the meantime
+            if self.lock.acquire(blocking=False):
+                try:
+                    self._apply_journal()
+                finally:
+                    self.lock.release()
+            return
+        try:
+            self._apply_journal()
+            with self._append(table, fsync) as write:
+                yield write
+        finally:
+            self.lock.release()
+
+    @contextmanager
+    def _append(self, table, fsync=False):
+        """Append rows straight to a table's file (write lock held)."""
+        names = self._company_index() if table == "companies" else None
+        header = self._header(table)
+        # Files created by the tracker use the schema order; hand-made files
+        # may order their columns differently, so map through the header then
+        in_schema_order = header == TABLES[table][1]
+        self._appending = names is not None
+        try:
+            with open(self.csv_path(table), 'a', newline='', buffering=APPEND_BUFFER_SIZE) as file:
+                writer = csv.writer(file)
+                metrics = self.metrics
+                if metrics is not None:
+                    start = file.tell()
+                    written = [0]
+
+                def write(row):
+                    record = as_record(table, row)
+                    if metrics is not None:
+                        written[0] += 1
+                    if in_schema_order:
+                        writer.writerow(record.to_row())
+                    else:
+                        values = record.to_dict()
+                        writer.writerow([values.get(field, "") for field in header])
+                    if names is not None:
+                        names.add(record.company_name)
+
+                yield write
+                if fsync:
+                    file.flush()
+                    os.fsync(file.fileno())
+                if metrics is not None:
+                    metrics.record_io("write", table, written[0], file.tell() - start)
+        finally:
+            self._appending = False
+        if names is not None:
+            self._company_names_signature = self._file_signature("companies")
+
+    def _rewrite(self, table, fieldnames, rows):
+        """Replace a table's file atomically (write lock held)."""
+        with atomic_write(self.csv_path(table), newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(rows)
+        if self.metrics is not None:
+            self.metrics.record_io("write", table, len(rows), os.path.getsize(self.csv_path(table)))
+        if table == "companies" and self._company_names is not None:
+            # The rows are at hand (an update may have renamed a company)
+            self._company_names = {row.get("Company Name") for row in rows}
+            self._company_names_signature = self._file_signature("companies")
+
+    def _read_with_header(self, table):
+        self.sync()
+        with self.lock.hold(exclusive=False):
+            with open(self.csv_path(table), 'r', newline='') as file:
+                reader = csv.DictReader(file)
+                rows = list(reader)
+                if self.metrics is not None:
+                    self.metrics.record_io("read", table, len(rows), os.fstat(file.fileno()).st_size)
+                return reader.fieldnames, rows
+
+    def _engagement_index(self):
+        """Return the (contact name, company) -> (status, date) map of the latest engagements.
+
+        Like the company name set, it is built once and then follows appends;
+        it is rebuilt if the file was rewritten by someone else.
+        """
+        self._sync_journal()
+        change = self._classify("engagements", self._engagement_state)
+        if change == "unchanged":
+            return self._engagement_keys
+        if change == "rewritten":
+            self._engagement_keys = {}
+            self._engagement_count = 0
+            offset = None
+        else:
+            offset = self._engagement_state["offset"]
+        rows, offset = self.read_tail_rows("engagements", offset)
+        self._index_engagements(rows)
+        self._engagement_state = self.tail_state("engagements", offset)
+        return self._engagement_keys
+
+    def _index_engagements(self, rows):
+        for row in rows:
+            self._engagement_keys[(row.get("Contact Name"), row.get("Company"))] = (row.get("Status"), row.get("Date"))
+        self._engagement_count += len(rows)
+
+    def _log_update(self, *events):
+        """Log update events, compacting if they change key columns or the log is due."""
+        if not events:
+            return
+        self.updates.extend(events)
+        immediate = any(IMMEDIATE_COLUMNS.intersection(event["changes"]) for event in events)
+        if immediate or self.updates.due():
+            self.compact()
+
+    def update_company(self, company_name, changes):
+        if not self.has_company(company_name):
+            return False
+        self._log_update(new_event("companies", [company_name], changes))
+        return True
+
+    def update_companies(self, updates):
+        events = [
+            new_event("companies", [company_name], changes)
+            for company_name, changes in updates.items()
+            if self.has_company(company_name)
+        ]
+        self._log_update(*events)
+        return len(events)
+
+    def update_latest_engagement(self, contact_name, company, changes):
+        latest = self._engagement_index().get((contact_name, company))
+        if latest is None:
+            return False
+        status, date = latest
+        previous = {"status": status, "time": date} if status and date else None
+        self._log_update(new_event(
+            "engagements", [contact_name, company], changes,
+            rows=self._engagement_count, previous=previous
+        ))
+        return True
+
+    def compact(self):
+        with self._writing():
+            return self._compact()
+
+    def _refresh_snapshot(self, table):
+        """Bring a table's snapshot up to date before a rewrite so the rewrite can be patched in.
+
+        Returns:
+            bool: True if the table has a snapshot to patch after the rewrite
+        """
+        if self.snapshot is None or not self.snapshot.exists(table):
+            return False
+        self.snapshot.refresh(table)
+        return True
+
+    def _compact(self):
+        """Apply claimed update events with one rewrite per table (write lock held)."""
+        events = self.updates.claim()
+        if events is None:
+            return 0
+
+        company_events = [event for event in events if event["table"] == "companies"]
+        if company_events:
+            changed = set()
+            for event in company_events:
+                changed.update(event["changes"])
+            keeps_index = not TechnologyIndex.columns.intersection(changed)
+            if keeps_index:
+                # Make sure every current row is indexed so the index can follow the rewrite
+                self.technology_index.refresh()
+            followers = self._followers_kept("companies", changed)
+            patches_snapshot = self._refresh_snapshot("companies")
+            fieldnames, companies = self._read_with_header("companies")
+            first = None
+            applied = []
+            for event in company_events:
+                if first is None:
+                    first = {}
+                    for position in range(len(companies) - 1, -1, -1):
+                        first[companies[position]["Company Name"]] = position
+                position = first.get(event["key"][0])
+                if position is not None:
+                    companies[position].update(event["changes"])
+                    applied.append((position, event["changes"]))
+                    if "Company Name" in event["changes"]:
+                        first = None
+            self._rewrite("companies", fieldnames, companies)
+            if keeps_index:
+                self.technology_index.resync()
+            for index in followers:
+                index.resync("companies")
+            if patches_snapshot:
+                self.snapshot.patch("companies", len(companies), applied)
+
+        engagement_events = [event for event in events if event["table"] == "engagements"]
+        if engagement_events:
+            self._apply_engagement_events(engagement_events)
+
+        self.updates.finish(events)
+        return len(events)
+
+    def _apply_engagement_events(self, events):
+        changed = set()
+        for event in events:
+            changed.update(event["changes"])
+        keeps_index = not NextActionIndex.columns.intersection(changed)
+        if keeps_index:
+            # Make sure every current row is indexed so the index can follow the rewrite
+            self.next_action_index.refresh()
+
+        followers = self._followers_kept("engagements", changed)
+        patches_snapshot = self._refresh_snapshot("engagements")
+        fieldnames, engagements = self._read_with_header("engagements")
+        keys = {tuple(event["key"]) for event in events}
+        positions = None
+        applied = []
+        for event in events:
+            if positions is None:
+                positions = {}
+                for position, engagement in enumerate(engagements):
+                    key = (engagement["Contact Name"], engagement["Company"])
+                    if key in keys:
+                        positions.setdefault(key, []).append(position)
+            candidates = positions.get(tuple(event["key"]), [])
+            # Latest matching row among the rows that existed when the update was made
+            index = bisect.bisect_left(candidates, event.get("rows", len(engagements))) - 1
+            if index >= 0:
+                engagements[candidates[index]].update(event["changes"])
+                applied.append((candidates[index], event["changes"]))
+                if {"Contact Name", "Company"}.intersection(event["changes"]):
+                    keys.update((engagement["Contact Name"], engagement["Company"]) for engagement in engagements)
+                    positions = None
+        self._rewrite("engagements", fieldnames, engagements)
+
+        if keeps_index:
+            self.next_action_index.resync()
+        for index in followers:
+            index.resync("engagements")
+        if patches_snapshot:
+            self.snapshot.patch("engagements", len(engagements), applied)
+        # The rows are at hand, so re-key them here rather than re-reading the file
+        self._engagement_keys = {}
+        self._engagement_count = 0
+        self._index_engagements(engagements)
+        self._engagement_state = self.tail_state("engagements", os.path.getsize(self.csv_path("engagements")))
+
+    def next_actions(self, start=None, end=None):
+        return self.next_action_index.between(start, end)
+
+    def iter_next_actions(self, start=None, end=None):
+        return self.next_action_index.iter_between(start, end)
+
+    def companies_using(self, technologies, match_all=True):
+        return self.technology_index.companies_using(technologies, match_all)
+
+    def technology_counts(self, n=None):
+        return self.technology_index.counts(n)
+
+    def query_stats(self):
+        return self.query_index.current()
+
+    def read_rows(self, table):
+        return self._read_with_header(table)[1]
+
+    @staticmethod
+    def _parse_frame(source, table):
+        """Parse CSV data (path or file object) with the table's fixed dtypes."""
+        import pandas as pd
+
+        dtypes = RECORD_TYPES[table].dtypes
+        try:
+            return pd.read_csv(source, dtype=dtypes)
+        except ValueError:
+            # A non-numeric value in a numeric column: read those as text and coerce
+            if hasattr(source, "seek"):
+                source.seek(0)
+            numeric = numeric_fields(table)
+            frame = pd.read_csv(
+                source,
+                dtype={field: ("str" if field in numeric else dtype) for field, dtype in dtypes.items()}
+            )
+            return apply_dtypes(frame, table)
+
+    def read_frame(self, table):
+        self.sync()
+        with self.lock.hold(exclusive=False):
+            frame = self._parse_frame(self.csv_path(table), table)
+            if self.metrics is not None:
+                self.metrics.record_io("read", table, len(frame), os.path.getsize(self.csv_path(table)))
+            return frame
+
+    def read_header_line(self, table):
+        """Return the raw bytes of a table's header line, including the newline."""
+        with open(self.csv_path(table), 'rb') as file:
+            return file.readline()
+
+    def read_tail(self, table, offset=None):
+        """Parse the complete rows stored after a byte offset.
+
+        Only data up to the last newline is parsed, so a row that is still
+        being appended is left for the next read.
+
+        Args:
+            table (str): Table name
+            offset (int, optional): Byte offset to start from, defaults to the end of the header
+
+        Returns:
+            tuple: (DataFrame of the new rows, byte offset just past the last parsed row)
+        """
+        with open(self.csv_path(table), 'rb') as file:
+            header = file.readline()
+            if offset is None:
+                offset = len(header)
+            file.seek(offset)
+            data = file.read()
+        end = data.rfind(b'\n') + 1
+        frame = self._parse_frame(io.BytesIO(header + data[:end]), table)
+        if self.metrics is not None:
+            self.metrics.record_io("read", table, len(frame), end)
+        return frame, offset + end
+
+    def read_tail_chunks(self, table, offset=None, chunksize=100000):
+        """Stream the complete rows after a byte offset as DataFrames of ``chunksize`` rows.
+
+        Memory use is bounded by the chunk size rather than the file size.
+
+        Returns:
+            tuple: (iterator of DataFrames, byte offset just past the last row it yields)
+        """
+        import pandas as pd
+
+        with open(self.csv_path(table), 'rb') as file:
+            header = file.readline()
+            if offset is None:
+                offset = len(header)
+            end = _complete_end(file, offset)
+        stream = io.BufferedReader(_TailReader(self.csv_path(table), header, offset, end))
+        metrics = self.metrics
+
+        def frames():
+            with stream:
+                reader = pd.read_csv(stream, dtype=_chunk_dtypes(table), chunksize=chunksize)
+                for chunk in reader:
+                    if metrics is not None:
+                        metrics.record_io("read", table, len(chunk))
+                    yield apply_dtypes(chunk, table)
+            if metrics is not None:
+                metrics.record_io("read", table, 0, end - offset)
+
+        return frames(), end
+
+    def iter_frames(self, table, chunksize=None):
+        if not chunksize:
+            yield self.read_frame(table)
+            return
+        self.sync()
+        frames, _ = self.read_tail_chunks(table, None, chunksize)
+        yield from frames
+
+    def read_tail_rows(self, table, offset=None):
+        """Like ``read_tail`` but returns plain row dicts, without loading pandas.
+
+        Returns:
+            tuple: (list of row dicts, byte offset just past the last parsed row)
+        """
+        with open(self.csv_path(table), 'rb') as file:
+            header = file.readline()
+            if offset is None:
+                offset = len(header)
+            file.seek(offset)
+            data = file.read()
+        end = data.rfind(b'\n') + 1
+        text = (header + data[:end]).decode('utf-8')
+        rows = list(csv.DictReader(io.StringIO(text, newline='')))
+        if self.metrics is not None:
+            self.metrics.record_io("read", table, len(rows), end)
+        return rows, offset + end
+
+    def change_token(self, table, columns=None):
+        # Queued rows only: applying logged updates would defeat batching them
+        self._sync_journal()
+        stat = os.stat(self.csv_path(table))
+        return [stat.st_ino, stat.st_size, stat.st_mtime_ns]
+
+    def _fingerprint(self, table, offset):
+        start = max(0, offset - FINGERPRINT_BYTES)
+        with open(self.csv_path(table), 'rb') as file:
+            file.seek(start)
+            return hashlib.sha1(file.read(offset - start)).hexdigest()
+
+    def tail_state(self, table, offset):
+        """Snapshot a table file's identity after its rows were processed up to ``offset``.
+
+        Pass the snapshot to ``classify_change`` later to find out whether
+        only new rows were appended since.
+        """
+        stat = os.stat(self.csv_path(table))
+        return {
+            "inode": stat.st_ino,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "header": self.read_header_line(table).decode('utf-8', errors='replace'),
+            "offset": offset,
+            "fingerprint": self._fingerprint(table, offset)
+        }
+
+    def classify_change(self, table, state, apply_updates=True):
+        """Compare a table file against a ``tail_state`` snapshot.
+
+        Args:
+            table (str): Table name
+            state (dict): Snapshot from ``tail_state`` (None: never processed)
+            apply_updates (bool): Apply pending update events first. Indexes over
+                columns whose updates are never left pending (``IMMEDIATE_COLUMNS``)
+                pass False, so looking them up doesn't defeat batching the updates.
+
+        Returns:
+            str: "unchanged", "appended" (rows after the snapshot offset are new)
+            or "rewritten" (the file shrank, its mtime went backwards, or its
+            header, inode or the bytes before the offset changed)
+        """
+        if apply_updates:
+            self.sync()
+        else:
+            self._sync_journal()
+        return self._classify(table, state)
+
+    def _classify(self, table, state):
+        if not state:
+            return "rewritten"
+        stat = os.stat(self.csv_path(table))
+        header = self.read_header_line(table).decode('utf-8', errors='replace')
+        if (
+            state.get("inode") != stat.st_ino
+            or state.get("header") != header
+            or stat.st_size < state["offset"]
+            or stat.st_size < state["size"]
+            or stat.st_mtime_ns < state["mtime_ns"]
+            or state.get("fingerprint") != self._fingerprint(table, state["offset"])
+        ):
+            return "rewritten"
+        if stat.st_size == state["offset"] and stat.st_mtime_ns == state["mtime_ns"]:
+            return "unchanged"
+        return "appended"
+
+    def import_csv(self, source_dir):
+        if os.path.abspath(source_dir) == os.path.abspath(self.data_dir):
+            return {}
+        return super().import_csv(source_dir)
+
+    def export_csv(self, target_dir=None):
+        target_dir = target_dir or self.data_dir
+        if os.path.abspath(target_dir) == os.path.abspath(self.data_dir):
+            return [self.csv_path(table) for table in TABLES]
+        if not os.path.exists(target_dir):
+            os.makedirs(target_dir)
+        paths = []
+        self.sync()
+        with self.lock.hold(exclusive=False):
+            for table in TABLES:
+                path = self.csv_path(table, target_dir)
+                shutil.copyfile(self.csv_path(table), path)
+                paths.append(path)
+        return paths
+
+
+def _quote(column):
+    """Quote a column name for use in SQL (the schemas contain spaces and parentheses)."""
+    return '"' + column.replace('"', '""') + '"'
+
+
+class SqliteStorage(TrackerStorage):
+    """Store the tables in an embedded SQLite database with indexed lookup keys.
+
+    Updates touch a single row through the index instead of rewriting the
+    whole table. When the database is created in a directory that already
+    holds tracker CSV files, those files are imported so existing data
+    directories keep working.
+    """
+
+    name = "sqlite"
+    db_name = "tracker.db"
+    insert_batch_size = 5000
+
+    def __init__(self, data_dir, check_same_thread=True):
+        """
+        Args:
+            data_dir (str): Data directory
+            check_same_thread (bool): Refuse to use the connection outside the thread that
+                opened it; pass False only if the caller serializes every use of the storage
+        """
+        super().__init__(data_dir)
+        self.db_path = os.path.join(data_dir, self.db_name)
+        is_new = not os.path.exists(self.db_path)
+        self.conn = sqlite3.connect(self.db_path, timeout=SQLITE_BUSY_TIMEOUT, check_same_thread=check_same_thread)
+        # Query statistics folded in up to a rowid (the queries table is only appended to)
+        self._query_stats = QueryStats()
+        self._query_rowid = 0
+        self._create_schema()
+        if is_new:
+            self.import_csv(data_dir)
+
+    def _create_schema(self):
+        has_technologies = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'company_technologies'"
+        ).fetchone() is not None
+        with self.conn:
+            for table, (_, fieldnames) in TABLES.items():
+                columns = ", ".join(f"{_quote(field)} TEXT" for field in fieldnames)
+                self.conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({columns})")
+            self.conn.execute(
+                'CREATE INDEX IF NOT EXISTS idx_companies_name ON companies ("Company Name")'
+            )
+            self.conn.execute(
+                'CREATE INDEX IF NOT EXISTS idx_engagements_contact '
+                'ON engagements ("Contact Name", "Company")'
+            )
+            self.conn.execute(
+                'CREATE INDEX IF NOT EXISTS idx_engagements_next_action '
+                'ON engagements ("Next Action Date")'
+            )
+            # In-place updates per column, so readers can tell appends from changed rows
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS column_updates "
+                "(table_name TEXT, column_name TEXT, updates INTEGER NOT NULL, PRIMARY KEY (table_name, column_name))"
+            )
+            # Inverted technology index: one row per (company, normalized technology)
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS company_technologies (company_rowid INTEGER, tech TEXT, name TEXT)"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_company_technologies ON company_technologies (tech, company_rowid)"
+            )
+            if not has_technologies:
+                # Database from before the index existed
+                self._index_technologies(0)
+
+    def _index_technologies(self, after_rowid, last_rowid=None):
+        """Index the technologies of companies with after_rowid < rowid <= last_rowid (in a transaction)."""
+        rows = self.conn.execute(
+            'SELECT rowid, "Technologies" FROM companies WHERE rowid > ? AND rowid <= COALESCE(?, rowid) '
+            'ORDER BY rowid',
+            (after_rowid, last_rowid)
+        )
+        self.conn.executemany(
+            "INSERT INTO company_technologies (company_rowid, tech, name) VALUES (?, ?, ?)",
+            [
+                (rowid, key, name)
+                for rowid, technologies in rows.fetchall()
+                for key, name in parse_technologies(technologies)
+            ]
+        )
+
+    @staticmethod
+    def _value(value):
+        if value is None or value == "":
+            return None
+        return str(value)
+
+    def has_company(self, company_name):
+        cursor = self.conn.execute(
+            'SELECT 1 FROM companies WHERE "Company Name" = ? LIMIT 1', (company_name,)
+        )
+        return cursor.fetchone() is not None
+
+    @contextmanager
+    def appender(self, table, fsync=False):
+        # SQLite syncs on commit, so ``fsync`` needs no extra work here
+        fieldnames = TABLES[table][1]
+        columns = ", ".join(_quote(field) for field in fieldnames)
+        placeholders = ", ".join("?" for _ in fieldnames)
+        sql = f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"
+        batch = []
+        changes = self.conn.total_changes
+        with self.conn:
+            if table == "companies":
+                last_rowid = self.conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM companies").fetchone()[0]
+
+            def write(row):
+                batch.append([self._value(value) for value in as_record(table, row).to_row()])
+                if len(batch) >= self.insert_batch_size:
+                    self.conn.executemany(sql, batch)
+                    batch.clear()
+
+            yield write
+            if batch:
+                self.conn.executemany(sql, batch)
+            if self.metrics is not None:
+                self.metrics.record_io("write", table, self.conn.total_changes - changes)
+            if table == "companies":
+                self._index_technologies(last_rowid)
+
+    def _assign(self, table, rowid, changes):
+        """Assign column values to one row (inside the caller's transaction)."""
+        fieldnames = TABLES[table][1]
+        changes = {field: value for field, value in changes.items() if field in fieldnames}
+        if not changes:
+            return
+        assignments = ", ".join(f"{_quote(field)} = ?" for field in changes)
+        self.conn.execute(
+            f"UPDATE {table} SET {assignments} WHERE rowid = ?",
+            [self._value(value) for value in changes.values()] + [rowid]
+        )
+        self.conn.executemany(
+            "INSERT INTO column_updates (table_name, column_name, updates) VALUES (?, ?, 1) "
+            "ON CONFLICT (table_name, column_name) DO UPDATE SET updates = updates + 1",
+            [(table, field) for field in changes]
+        )
+
+    def _update_rowid(self, table, rowid, changes):
+        with self.conn:
+            self._assign(table, rowid, changes)
+
+    def _update_company_row(self, company_name, changes):
+        """Update the first company with this name (inside the caller's transaction); False if missing."""
+        row = self.conn.execute(
+            'SELECT MIN(rowid) FROM companies WHERE "Company Name" = ?', (company_name,)
+        ).fetchone()
+        if row[0] is None:
+            return False
+        self._assign("companies", row[0], changes)
+        if "Technologies" in changes:
+            self.conn.execute("DELETE FROM company_technologies WHERE company_rowid = ?", (row[0],))
+            self._index_technologies(row[0] - 1, row[0])
+        return True
+
+    def update_company(self, company_name, changes):
+        with self.conn:
+            if not self._update_company_row(company_name, changes):
+                return False
+        self.updates.record_applied([new_event("companies", [company_name], changes)])
+        return True
+
+    def update_companies(self, updates):
+        # One transaction for the whole batch
+        events = []
+        with self.conn:
+            for company_name, changes in updates.items():
+                if self._update_company_row(company_name, changes):
+                    events.append(new_event("companies", [company_name], changes))
+        self.updates.record_applied(events)
+        return len(events)
+
+    def update_latest_engagement(self, contact_name, company, changes):
+        row = self.conn.execute(
+            'SELECT rowid, "Status", "Date" FROM engagements WHERE "Contact Name" = ? AND "Company" = ? '
+            'ORDER BY rowid DESC LIMIT 1',
+            (contact_name, company)
+        ).fetchone()
+        if row is None:
+            return False
+        rowid, status, date = row
+        self._update_rowid("engagements", rowid, changes)
+        previous = {"status": status, "time": date} if status and date else None
+        self.updates.record_applied([new_event("engagements", [contact_name, company], changes, previous=previous)])
+        return True
+
+    def next_actions(self, start=None, end=None):
+        return list(self.iter_next_actions(start, end))
+
+    def iter_next_actions(self, start=None, end=None):
+        # Dates are compared as text, which orders ISO "YYYY-MM-DD" dates correctly
+        conditions = ['"Next Action Date" IS NOT NULL']
+        params = []
+        if start:
+            conditions.append('"Next Action Date" >= ?')
+            params.append(start)
+        if end:
+            # Bound by the following day so values with a time part still match the end date
+            conditions.append('"Next Action Date" < ?')
+            params.append((datetime.date.fromisoformat(end) + datetime.timedelta(days=1)).isoformat())
+        cursor = self.conn.execute(
+            'SELECT "Next Action Date", "Contact Name", "Company", "Next Action" FROM engagements '
+            f'WHERE {" AND ".join(conditions)} ORDER BY "Next Action Date", rowid',
+            params
+        )
+        for date, contact, company, action in cursor:
+            yield {
+                "Next Action Date": parse_date(date) or date,
+                "Contact Name": contact or "",
+                "Company": company or "",
+                "Next Action": action or ""
+            }
+
+    def companies_using(self, technologies, match_all=True):
+        keys = sorted({normalized[0] for normalized in map(normalize_technology, technologies) if normalized})
+        if not keys:
+            return []
+        placeholders = ", ".join("?" for _ in keys)
+        required = len(keys) if match_all else 1
+        rows = self.conn.execute(
+            f'SELECT "Company Name" FROM companies WHERE rowid IN ('
+            f'SELECT company_rowid FROM company_technologies WHERE tech IN ({placeholders}) '
+            f'GROUP BY company_rowid HAVING COUNT(DISTINCT tech) >= ?) ORDER BY rowid',
+            keys + [required]
+        )
+        return [name for (name,) in rows]
+
+    def technology_counts(self, n=None):
+        # SQLite takes the bare "name" column from the row picked by MIN(rowid): the first spelling seen
+        rows = self.conn.execute(
+            "SELECT name, MIN(rowid), COUNT(DISTINCT company_rowid) FROM company_technologies GROUP BY tech"
+        )
+        counts = sorted(((name, count) for name, _, count in rows), key=lambda item: (-item[1], item[0]))
+        return counts if n is None else counts[:n]
+
+    def query_stats(self):
+        last_rowid = self.conn.execute("SELECT MAX(rowid) FROM queries").fetchone()[0] or 0
+        if last_rowid < self._query_rowid:
+            # The table was recreated: start over
+            self._query_stats = QueryStats()
+            self._query_rowid = 0
+        fieldnames = TABLES["queries"][1]
+        columns = ", ".join(_quote(field) for field in fieldnames)
+        rows = self.conn.execute(
+            f"SELECT {columns} FROM queries WHERE rowid > ? AND rowid <= ? ORDER BY rowid",
+            (self._query_rowid, last_rowid)
+        )
+        self._query_stats.add_rows(dict(zip(fieldnames, row)) for row in rows)
+        self._query_rowid = last_rowid
+        return self._query_stats
+
+    def change_token(self, table, columns=None):
+        """Return [last rowid, row count, in-place updates of ``columns`` (all if None)].
+
+        Rows are only ever appended, so if the update count is unchanged and
+        the row count grew by as much as the last rowid, the rows after the
+        previous last rowid are the only change (see ``iter_rows_after``).
+        """
+        last_rowid, count = self.conn.execute(f"SELECT COALESCE(MAX(rowid), 0), COUNT(*) FROM {table}").fetchone()
+        sql = "SELECT COALESCE(SUM(updates), 0) FROM column_updates WHERE table_name = ?"
+        params = [table]
+        if columns is not None:
+            sql += f" AND column_name IN ({', '.join('?' for _ in columns)})"
+            params.extend(sorted(columns))
+        updates = self.conn.execute(sql, params).fetchone()[0]
+        return [last_rowid, count, updates]
+
+    def iter_rows_after(self, table, rowid):
+        """Yield the rows with a rowid above ``rowid`` as dicts, in rowid order."""
+        fieldnames = TABLES[table][1]
+        columns = ", ".join(_quote(field) for field in fieldnames)
+        cursor = self.conn.execute(f"SELECT {columns} FROM {table} WHERE rowid > ? ORDER BY rowid", (rowid,))
+        rows = 0
+        for row in cursor:
+            rows += 1
+            yield {field: ("" if value is None else value) for field, value in zip(fieldnames, row)}
+        if self.metrics is not None:
+            self.metrics.record_io("read", table, rows)
+
+    def _select_all(self, table):
+        columns = ", ".join(_quote(field) for field in TABLES[table][1])
+        return f"SELECT {columns} FROM {table} ORDER BY rowid"
+
+    def read_rows(self, table):
+        fieldnames = TABLES[table][1]
+        cursor = self.conn.execute(self._select_all(table))
+        rows = [
+            {field: ("" if value is None else value) for field, value in zip(fieldnames, row)}
+            for row in cursor
+        ]
+        if self.metrics is not None:
+            self.metrics.record_io("read", table, len(rows))
+        return rows
+
+    def read_frame(self, table):
+        import pandas as pd
+
+        frame = apply_dtypes(pd.read_sql_query(self._select_all(table), self.conn), table)
+        if self.metrics is not None:
+            self.metrics.record_io("read", table, len(frame))
+        return frame
+
+    def iter_frames(self, table, chunksize=None):
+        import pandas as pd
+
+        if not chunksize:
+            yield self.read_frame(table)
+            return
+        for chunk in pd.read_sql_query(self._select_all(table), self.conn, chunksize=chunksize):
+            if self.metrics is not None:
+                self.metrics.record_io("read", table, len(chunk))
+            yield apply_dtypes(chunk, table)
+
+    def close(self):
+        self.conn.close()
+
+
+STORAGE_BACKENDS = {
+    CsvStorage.name: CsvStorage,
+    SqliteStorage.name: SqliteStorage,
+}
+
+
+def open_storage(data_dir, backend="csv", **options):
+    """Create the storage backend for a data directory.
+
+    Args:
+        data_dir (str): Directory holding the tracker data
+        backend (str or TrackerStorage): Backend name ("csv" or "sqlite") or a ready instance
+        **options: Backend settings, e.g. ``compact_after_bytes`` for the CSV backend
+    """
+    if isinstance(backend, TrackerStorage):
+        return backend
+    if backend not in STORAGE_BACKENDS:
+        raise ValueError(f"Unknown storage backend: {backend}. Choose from {', '.join(STORAGE_BACKENDS)}")
+    return STORAGE_BACKENDS[backend](data_dir, **options)
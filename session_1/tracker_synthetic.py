@@ -0,0 +1,221 @@
+"""Seeded generator of realistic synthetic tracking data, for benchmarks and demos.
+
+Rows use the real table schemas (``TABLES``), with every column filled the
+way a student's tracker would be: engagements cluster on a minority of
+companies and contacts, statuses thin out along the funnel, response rates
+differ by platform, and about a third of the engagements have a follow-up
+scheduled around the current date. The same seed always produces the same
+rows (relative to ``today``; fix it too for byte-identical files), and each
+table has its own random stream, so generating one table never changes another.
+"""
+import datetime
+import random
+
+from tracker_analytics import FUNNEL_STATUSES
+from tracker_schema import TABLES
+
+INDUSTRIES = ["Software", "Finance", "Healthcare", "Retail", "Aerospace", "Consulting", "Gaming", "Education"]
+COMPANY_SIZES = ["1-50", "51-200", "201-1000", "1001-5000", "5000+"]
+TECHNOLOGIES = [
+    "Python", "Java", "C#", "AWS", "Azure", "Google Cloud", "Docker", "Kubernetes", "PostgreSQL",
+    "MySQL", "MongoDB", "Redis", "Kafka", "Django", "Flask", "Spring", ".NET", "Go", "TypeScript", "React"
+]
+FIRST_NAMES = ["Alex", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Jamie", "Avery", "Quinn", "Drew",
+               "Sam", "Robin", "Charlie", "Emerson", "Finley", "Harper", "Kendall", "Logan", "Parker", "Reese"]
+LAST_NAMES = ["Smith", "Johnson", "Lee", "Garcia", "Brown", "Davis", "Miller", "Wilson", "Moore", "Clark",
+              "Lewis", "Walker", "Hall", "Young", "King", "Wright", "Lopez", "Hill", "Scott", "Green"]
+POSITIONS = ["Engineering Manager", "Recruiter", "Team Lead", "Senior Engineer", "University Recruiter"]
+# Platform -> (share of engagements, response rate)
+PLATFORMS = {"LinkedIn": (0.6, 0.25), "Email": (0.25, 0.15), "Instagram": (0.1, 0.08), "Twitter": (0.05, 0.05)}
+ENGAGEMENT_TYPES = ["Comment", "Connection Request", "Direct Message", "Email", "Follow-up"]
+CONTENT = [
+    "Great insights on API design!",
+    "Enjoyed your post about scaling Python services.",
+    "Would love to hear how your team approaches code review.",
+    "Congrats on the launch!",
+    "Thanks for sharing the internship timeline.",
+]
+NEXT_ACTIONS = ["Follow up", "Send portfolio", "Schedule call", "Thank you note", "Check application status"]
+# Ways an engagement can spell a company or contact name differently from the companies table
+COMPANY_SUFFIXES = [", Inc.", " Inc", " LLC", ", Ltd.", " Corp.", " Co"]
+NAME_TITLES = ["Dr. ", "Mr. ", "Ms. "]
+QUERY_PLATFORMS = ["LinkedIn", "Google", "Instagram"]
+QUERY_TERMS = ['"software engineer intern"', '"backend intern"', "Python", "Java", "C#", '"summer 2026"',
+               "hiring", '"new grad"', "AWS", "remote", '"engineering manager"', "Missouri"]
+
+
+class SyntheticData:
+    """Generate companies, engagements and search queries from a seed."""
+
+    def __init__(self, seed=0, today=None, days=365):
+        """
+        Args:
+            seed (int): Seed for every table's random stream
+            today (datetime.date, optional): Date the data leads up to (default: today);
+                follow-up dates fall on either side of it
+            days (int): Number of days of history before ``today``
+        """
+        self.seed = seed
+        self.today = today or datetime.date.today()
+        self.days = days
+
+    def _random(self, table):
+        return random.Random(f"{self.seed}:{table}")
+
+    @staticmethod
+    def company_name(i):
+        return f"Company {i:06d}"
+
+    @staticmethod
+    def _person(rng):
+        return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+    @staticmethod
+    def _linkedin(name, suffix):
+        return f"https://www.linkedin.com/in/{name.lower().replace(' ', '-')}-{suffix}"
+
+    @staticmethod
+    def _typo(rng, name):
+        """Swap two adjacent letters of a name (never digits, so numbered names stay distinct)."""
+        positions = [i for i in range(len(name) - 1) if name[i].isalpha() and name[i + 1].isalpha()]
+        if not positions:
+            return name
+        i = rng.choice(positions)
+        return name[:i] + name[i + 1] + name[i] + name[i + 2:]
+
+    def company_variant(self, rng, name):
+        """Return another way of writing a company name: a legal suffix, other case or a typo."""
+        kind = rng.randrange(4)
+        if kind == 0:
+            return name + rng.choice(COMPANY_SUFFIXES)
+        if kind == 1:
+            return name.upper() if rng.random() < 0.5 else name.lower()
+        if kind == 2:
+            return "The " + name
+        return self._typo(rng, name)
+
+    def contact_variant(self, rng, name):
+        """Return another way of writing a person's name: a title, other case or a typo."""
+        kind = rng.randrange(3)
+        if kind == 0:
+            return rng.choice(NAME_TITLES) + name
+        if kind == 1:
+            return name.lower()
+        return self._typo(rng, name)
+
+    def _date(self, rng, days_before=None):
+        days_before = self.days if days_before is None else days_before
+        return self.today - datetime.timedelta(days=rng.randrange(days_before + 1))
+
+    def companies(self, n):
+        """Yield ``n`` company rows (dicts with every company column)."""
+        rng = self._random("companies")
+        fields = TABLES["companies"][1]
+        for i in range(n):
+            name = self.company_name(i)
+            manager, recruiter, lead = (self._person(rng) for _ in range(3))
+            status = FUNNEL_STATUSES[min(int(rng.expovariate(1.2)), len(FUNNEL_STATUSES) - 1)]
+            values = [
+                name,
+                rng.choice(INDUSTRIES),
+                rng.choice(COMPANY_SIZES),
+                f"https://careers.example.com/{i}/software-engineering-intern",
+                ", ".join(rng.sample(TECHNOLOGIES, rng.randint(2, 5))),
+                manager,
+                self._linkedin(manager, f"{i}m"),
+                recruiter if rng.random() < 0.8 else "",
+                self._linkedin(recruiter, f"{i}r"),
+                lead if rng.random() < 0.6 else "",
+                self._linkedin(lead, f"{i}t"),
+                str(rng.randint(0, 30)),
+                status,
+                self._date(rng).isoformat(),
+                "Met at career fair" if rng.random() < 0.1 else ""
+            ]
+            yield dict(zip(fields, values))
+
+    def engagements(self, n, companies=None, variants=0.0):
+        """Yield ``n`` engagement rows against ``companies`` companies (default: n // 5).
+
+        Company popularity is skewed (a few companies get most engagements),
+        and each company has a handful of contacts. A ``variants`` share of
+        the rows spell their company and contact names differently (see
+        ``company_variant``); the spellings come from a separate random
+        stream, so the rows are otherwise identical to those without variants.
+        """
+        rng = self._random("engagements")
+        variant_rng = self._random("variants")
+        fields = TABLES["engagements"][1]
+        companies = max(1, companies or n // 5)
+        platforms = list(PLATFORMS)
+        weights = [share for share, _ in PLATFORMS.values()]
+        for _ in range(n):
+            # Skewed towards low indexes: the top fifth of companies get about 60% of engagements
+            company = int(companies * rng.random() ** 3)
+            contact = rng.randrange(4)
+            platform = rng.choices(platforms, weights)[0]
+            date = self._date(rng)
+            responded = rng.random() < PLATFORMS[platform][1]
+            if responded:
+                stage = min(1 + int(rng.expovariate(1.0)), len(FUNNEL_STATUSES) - 1)
+            else:
+                stage = 0
+            scheduled = rng.random() < 0.35
+            values = [
+                f"Contact {company}-{contact}",
+                self.company_name(company),
+                POSITIONS[contact % len(POSITIONS)],
+                platform,
+                rng.choice(ENGAGEMENT_TYPES),
+                date.isoformat(),
+                rng.choice(CONTENT),
+                "Thanks for reaching out!" if responded else "",
+                str(round(rng.lognormvariate(3, 1), 1)) if responded else "",
+                rng.choice(NEXT_ACTIONS) if scheduled else "",
+                (self.today + datetime.timedelta(days=rng.randint(-14, 30))).isoformat() if scheduled else "",
+                FUNNEL_STATUSES[stage],
+                ""
+            ]
+            if variants and variant_rng.random() < variants:
+                if variant_rng.random() < 0.5:
+                    values[0] = self.contact_variant(variant_rng, values[0])
+                values[1] = self.company_variant(variant_rng, values[1])
+            yield dict(zip(fields, values))
+
+    def queries(self, n):
+        """Yield ``n`` search query rows."""
+        rng = self._random("queries")
+        fields = TABLES["queries"][1]
+        for _ in range(n):
+            terms = rng.sample(QUERY_TERMS, rng.randint(2, 4))
+            values = [
+                rng.choice(QUERY_PLATFORMS),
+                " AND ".join(terms),
+                self._date(rng).isoformat(),
+                str(int(rng.lognormvariate(4, 1.5))),
+                str(rng.randint(1, 5))
+            ]
+            yield dict(zip(fields, values))
+
+
+def populate(tracker, engagements, seed=0, companies=None, queries=None, variants=0.0):
+    """Fill a tracker with a synthetic dataset through its bulk ingest API.
+
+    Args:
+        tracker (InternshipSearchTracker): Tracker to fill
+        engagements (int): Number of engagements
+        seed (int): Generator seed
+        companies (int, optional): Number of companies (default: engagements // 5)
+        queries (int, optional): Number of search queries (default: engagements // 10)
+        variants (float): Share of engagements spelling their company and contact differently
+
+    Returns:
+        SyntheticData: The generator, e.g. for looking up generated names
+    """
+    data = SyntheticData(seed)
+    companies = max(1, engagements // 5) if companies is None else companies
+    queries = max(1, engagements // 10) if queries is None else queries
+    tracker.add_companies(data.companies(companies))
+    tracker.add_engagements(data.engagements(engagements, companies, variants))
+    tracker.add_search_queries(data.queries(queries))
+    return data
@@ -0,0 +1,158 @@
+"""Technology name normalization and the inverted technology index.
+
+Companies list their technologies as a comma-separated string, written by
+hand ("AWS", "aws", "Amazon Web Services"). Every name is reduced to a key
+(case-folded, whitespace collapsed, known aliases mapped to one canonical
+name) so spellings of the same technology are counted and queried together.
+Known technologies are shown by their canonical name, others by the first
+spelling seen.
+
+``TechnologyIndex`` maps each key to the sorted row ids of the companies
+using it, so "companies using Python and AWS" is an intersection of two
+posting lists and top-N counts are the list lengths; neither rescans the
+companies table.
+"""
+from functools import lru_cache
+
+from tracker_index import AppendIndex
+
+# Alias (case-folded) -> canonical name. Canonical names map to themselves so
+# their spelling is used whichever way a company wrote them.
+TECHNOLOGY_ALIASES = {
+    alias: canonical
+    for canonical, aliases in {
+        "AWS": ["aws", "amazon web services"],
+        "Azure": ["azure", "microsoft azure"],
+        "Google Cloud": ["google cloud", "gcp", "google cloud platform"],
+        "Python": ["python", "python3", "python 3"],
+        "Java": ["java"],
+        "C#": ["c#", "csharp", "c sharp"],
+        "C++": ["c++", "cpp"],
+        ".NET": [".net", "dotnet", ".net core"],
+        "JavaScript": ["javascript", "js"],
+        "TypeScript": ["typescript", "ts"],
+        "Node.js": ["node.js", "nodejs", "node"],
+        "Go": ["go", "golang"],
+        "Rust": ["rust"],
+        "Kotlin": ["kotlin"],
+        "Ruby": ["ruby"],
+        "SQL": ["sql"],
+        "PostgreSQL": ["postgresql", "postgres", "psql"],
+        "MySQL": ["mysql"],
+        "MongoDB": ["mongodb", "mongo"],
+        "Redis": ["redis"],
+        "Docker": ["docker"],
+        "Kubernetes": ["kubernetes", "k8s"],
+        "Terraform": ["terraform"],
+        "Kafka": ["kafka", "apache kafka"],
+        "Spark": ["spark", "apache spark"],
+        "Django": ["django"],
+        "Flask": ["flask"],
+        "FastAPI": ["fastapi"],
+        "Spring": ["spring", "spring boot"],
+        "React": ["react", "react.js", "reactjs"],
+        "GraphQL": ["graphql"],
+        "Linux": ["linux"],
+        "Git": ["git"],
+    }.items()
+    for alias in aliases
+}
+
+
+@lru_cache(maxsize=4096)
+def normalize_technology(name):
+    """Return (key, display name) for a technology name, or None if it is blank."""
+    collapsed = " ".join(name.split())
+    if not collapsed:
+        return None
+    folded = collapsed.casefold()
+    canonical = TECHNOLOGY_ALIASES.get(folded)
+    if canonical is not None:
+        return canonical.casefold(), canonical
+    return folded, collapsed
+
+
+def parse_technologies(text):
+    """Split a comma-separated technology list into unique (key, display name) pairs, in order."""
+    technologies = {}
+    for name in (text or "").split(','):
+        normalized = normalize_technology(name)
+        if normalized is not None:
+            technologies.setdefault(*normalized)
+    return list(technologies.items())
+
+
+class TechnologyIndex(AppendIndex):
+    """Inverted index from technology to the companies using it, for a ``CsvStorage``."""
+
+    table = "companies"
+    file_name = "technology_index.json"
+    version = 1
+
+    # Columns stored in the index; rewrites that change them need a rebuild
+    columns = {"Company Name", "Technologies"}
+
+    def __init__(self, storage):
+        super().__init__(storage)
+        self._postings = {}     # technology key -> sorted company row ids
+        self._names = {}        # technology key -> display name
+        self._companies = []    # row id -> company name
+
+    def _reset(self):
+        self._postings = {}
+        self._names = {}
+        self._companies = []
+
+    def _data(self):
+        return {"postings": self._postings, "names": self._names, "companies": self._companies}
+
+    def _restore(self, data):
+        self._postings = data["postings"]
+        self._names = data["names"]
+        self._companies = data["companies"]
+
+    def _add_rows(self, rows):
+        for row in rows:
+            row_id = self._row_count
+            self._row_count += 1
+            self._companies.append(row.get("Company Name", ""))
+            for key, name in parse_technologies(row.get("Technologies")):
+                self._names.setdefault(key, name)
+                self._postings.setdefault(key, []).append(row_id)
+
+    def companies_using(self, technologies, match_all=True):
+        """Return the names of companies using the given technologies, in the order they were added.
+
+        Args:
+            technologies (list): Technology names, in any spelling or alias
+            match_all (bool): Require every technology (AND) instead of any of them (OR)
+        """
+        self.refresh()
+        postings = []
+        for name in technologies:
+            normalized = normalize_technology(name)
+            if normalized is not None:
+                postings.append(self._postings.get(normalized[0], []))
+        if not postings:
+            return []
+
+        if match_all:
+            # Start from the shortest list; each step can only shrink the set
+            postings.sort(key=len)
+            row_ids = set(postings[0])
+            for posting in postings[1:]:
+                row_ids.intersection_update(posting)
+                if not row_ids:
+                    break
+        else:
+            row_ids = set().union(*postings)
+        return [self._companies[row_id] for row_id in sorted(row_ids)]
+
+    def counts(self, n=None):
+        """Return (technology, number of companies) pairs, most used first."""
+        self.refresh()
+        counts = sorted(
+            ((self._names[key], len(posting)) for key, posting in self._postings.items()),
+            key=lambda item: (-item[1], item[0])
+        )
+        return counts if n is None else counts[:n]
@@ -1,79 +1,79 @@
+import argparse
 import csv
+import json
 import os
+import sys
+import time
 import datetime
-import matplotlib.pyplot as plt
-import pandas as pd
-from rich.console import Console
-from rich.table import Table
+
+# pandas, matplotlib and rich are imported inside the methods that use them,
+# so quick commands (e.g. logging one engagement) don't pay for loading them
+from tracker_analytics import TrackerAggregates, stage_timings
+from tracker_schema import TABLES, Company, Engagement, SearchQuery
+from tracker_cache import AnalyticsCache
+from tracker_charts import ChartRenderer, wordcloud_available
+from tracker_entities import EntityResolver
+from tracker_metrics import Metrics, instrument, uninstrument
+from tracker_reports import OUTPUT_FORMATS, Report, write_report
+from tracker_storage import CsvStorage, open_storage
+
+# Methods that manage instrumentation and are never instrumented themselves
+METRICS_METHODS = ("enable_metrics", "disable_metrics", "show_metrics")
 
 class InternshipSearchTracker:
     """A tool for tracking and analyzing internship search activities and results."""
     
-    def __init__(self, data_dir="data"):
-        """Initialize the tracker with data directory."""
+    def __init__(self, data_dir="data", backend="csv", chunksize=None, **storage_options):
+        """Initialize the tracker with data directory.
+        
+        Args:
+            data_dir (str): Directory holding the tracking data
+            backend (str or TrackerStorage): Storage backend, "csv" (default) or "sqlite"
+            chunksize (int, optional): Default chunk size for streaming the tables (see compute_analytics)
+            **storage_options: Backend settings, e.g. ``compact_after_bytes`` and
+                ``compact_after_seconds`` for the CSV backend's update log, or
+                ``snapshot=True`` for its columnar snapshot
+        """
         self.data_dir = data_dir
-        self.console = Console()
+        self._console = None
         
-        # Ensure data directory exists
-        if not os.path.exists(data_dir):
-            os.makedirs(data_dir)
-            
-        # Initialize or load tracking files
+        # Tracking file locations (used by the CSV backend and for import/export)
         self.company_file = os.path.join(data_dir, "company_contacts.csv")
         self.engagement_file = os.path.join(data_dir, "engagement_tracker.csv")
         self.query_file = os.path.join(data_dir, "search_queries.csv")
         
-        self._initialize_files()
-    
-    def _initialize_files(self):
-        """Initialize tracking files if they don't exist."""
-        # Company contacts file
-        if not os.path.exists(self.company_file):
-            with open(self.company_file, 'w', newline='') as file:
-                writer = csv.writer(file)
-                writer.writerow([
-                    "Company Name",
-                    "Industry",
-                    "Company Size",
-                    "Job Posting URL",
-                    "Technologies",
-                    "Engineering Manager Name",
-                    "Engineering Manager LinkedIn",
-                    "Recruiter Name",
-                    "Recruiter LinkedIn",
-                    "Team Lead Name",
-                    "Team Lead LinkedIn",
-                    "Mutual Connections",
-                    "Contact Status",
-                    "Last Contact Date",
-                    "Notes"
-                ])
-        
-        # Engagement tracker file
-        if not os.path.exists(self.engagement_file):
-            with open(self.engagement_file, 'w', newline='') as file:
-                writer = csv.writer(file)
-                writer.writerow([
-                    "Contact Name",
-                    "Company",
-                    "Position",
-                    "Platform",
-                    "Engagement Type",
-                    "Date",
-                    "Content Sent",
-                    "Response Received",
-                    "Response Time (hours)",
-                    "Next Action",
-                    "Next Action Date",
-                    "Status",
-                    "Notes"
-                ])
-        
-        # Search queries file
-        if not os.path.exists(self.query_file):
-            with open(self.query_file, 'w', newline='') as file:
-                writer = csv.writer(file)
-                writer.writerow(["Platform", "Query", "Date Added", "Results Count", "Effectiveness Rating"])
+        # Open the storage backend (creates the data directory and files if needed)
+        self.storage = open_storage(data_dir, backend, **storage_options)
+        
+        # CSV files are mostly appended to, so their aggregates can be maintained incrementally
+        self.analytics_cache = AnalyticsCache(self.storage) if isinstance(self.storage, CsvStorage) else None
+        
+        # Rows per chunk when streaming the tables (None: whole tables at once)
+        self.chunksize = chunksize
+        
+        # Canonical ids joining spelling variants of company and contact names,
+        # kept in step with the CSV backend's rewrites like its own indexes
+        self.entities = EntityResolver(self.storage, chunksize=chunksize)
+        if isinstance(self.storage, CsvStorage):
+            self.storage.follow(self.entities)
+        
+        # Process pool size for rendering charts (None: one worker per CPU)
+        self.chart_workers = None
+        
+        # Timings and I/O counters, collected only after enable_metrics()
+        self.metrics = Metrics()
+    
+    @property
+    def console(self):
+        """Rich console used for all output (created on first use)."""
+        if self._console is None:
+            from rich.console import Console
+            self._console = Console()
+        return self._console
+    
+    @console.setter
+    def console(self, console):
+        self._console = console
     
     def add_company(self, company_data):
         """Add a new company to the tracking system.
@@ -81,61 +81,62 @@ class InternshipSearchTracker:
         Args:
             company_data (dict): Dictionary containing company information
         """
-        required_fields = ["Company Name", "Industry", "Technologies"]
-        for field in required_fields:
-            if field not in company_data:
-                self.console.print(f"[bold red]Error:[/bold red] Missing required field: {field}")
-                return False
-        
-        # Add current date if not provided
-        if "Last Contact Date" not in company_data:
-            company_data["Last Contact Date"] = datetime.datetime.now().strftime("%Y-%m-%d")
+        company = self._to_record(Company, company_data)
+        if company is None:
+            return False
         
-        # Read existing data to check for duplicates
-        companies = []
+        # Check for duplicates
         try:
-            with open(self.company_file, 'r', newline='') as file:
-                reader = csv.DictReader(file)
-                companies = list(reader)
+            if self.storage.has_company(company.company_name):
+                self.console.print(f"[bold yellow]Warning:[/bold yellow] Company {company.company_name} already exists. Use update_company instead.")
+                return False
         except Exception as e:
             self.console.print(f"[bold yellow]Warning:[/bold yellow] {str(e)}")
         
-        # Check for duplicates
-        for company in companies:
-            if company.get("Company Name") == company_data["Company Name"]:
-                self.console.print(f"[bold yellow]Warning:[/bold yellow] Company {company_data['Company Name']} already exists. Use update_company instead.")
-                return False
-        
-        # Write to file
-        with open(self.company_file, 'a', newline='') as file:
-            writer = csv.DictWriter(file, fieldnames=list(company_data.keys()))
-            writer.writerow(company_data)
+        # Write to storage
+        self.storage.append_rows("companies", [company])
         
-        self.console.print(f"[bold green]Success:[/bold green] Added {company_data['Company Name']} to tracking system")
+        self.console.print(f"[bold green]Success:[/bold green] Added {company.company_name} to tracking system")
         return True
     
+    def add_companies(self, companies):
+        """Add a batch of companies to the tracking system.
+        
+        Every company is validated and checked against the existing names and
+        the rest of the batch; the valid ones are written with a single file
+        open and one fsync.
+        
+        Args:
+            companies (iterable): Dictionaries containing company information
+        
+        Returns:
+            int: Number of companies added
+        """
+        batch_names = set()
+        
+        def is_new(company):
+            name = company.company_name
+            if name in batch_names or self.storage.has_company(name):
+                return False
+            batch_names.add(name)
+            return True
+        
+        return self._ingest(Company, companies, label="companies", accept=is_new)
+    
     def add_engagement(self, engagement_data):
         """Add a new engagement activity to the tracking system.
         
         Args:
             engagement_data (dict): Dictionary containing engagement information
         """
-        required_fields = ["Contact Name", "Company", "Platform", "Engagement Type"]
-        for field in required_fields:
-            if field not in engagement_data:
-                self.console.print(f"[bold red]Error:[/bold red] Missing required field: {field}")
-                return False
-        
-        # Add current date if not provided
-        if "Date" not in engagement_data:
-            engagement_data["Date"] = datetime.datetime.now().strftime("%Y-%m-%d")
+        engagement = self._to_record(Engagement, engagement_data)
+        if engagement is None:
+            return False
         
-        # Write to file
-        with open(self.engagement_file, 'a', newline='') as file:
-            writer = csv.DictWriter(file, fieldnames=list(engagement_data.keys()))
-            writer.writerow(engagement_data)
+        # Write to storage
+        self.storage.append_rows("engagements", [engagement])
         
-        self.console.print(f"[bold green]Success:[/bold green] Added engagement with {engagement_data['Contact Name']} to tracking system")
+        self.console.print(f"[bold green]Success:[/bold green] Added engagement with {engagement.contact_name} to tracking system")
         return True
     
     def add_search_query(self, query_data):
@@ -144,24 +145,145 @@ class InternshipSearchTracker:
         Args:
             query_data (dict): Dictionary containing query information
         """
-        required_fields = ["Platform", "Query"]
-        for field in required_fields:
-            if field not in query_data:
-                self.console.print(f"[bold red]Error:[/bold red] Missing required field: {field}")
-                return False
+        query = self._to_record(SearchQuery, query_data)
+        if query is None:
+            return False
         
-        # Add current date if not provided
-        if "Date Added" not in query_data:
-            query_data["Date Added"] = datetime.datetime.now().strftime("%Y-%m-%d")
+        # The same search in another spelling counts as another run of it
+        previous = self.storage.query_stats().lookup(query.platform, query.query)
         
-        # Write to file
-        with open(self.query_file, 'a', newline='') as file:
-            writer = csv.DictWriter(file, fieldnames=list(query_data.keys()))
-            writer.writerow(query_data)
+        # Write to storage
+        self.storage.append_rows("queries", [query])
         
-        self.console.print(f"[bold green]Success:[/bold green] Added search query for {query_data['Platform']} to tracking system")
+        self.console.print(f"[bold green]Success:[/bold green] Added search query for {query.platform} to tracking system")
+        if previous is not None:
+            same = "" if previous["query"] == query.query.strip() else f" (same as \"{previous['query']}\")"
+            self.console.print(f"[dim]Run {previous['runs'] + 1} of this query on {query.platform}{same}[/dim]")
         return True
     
+    def add_engagements(self, engagements):
+        """Add a batch of engagement activities to the tracking system.
+        
+        Args:
+            engagements (iterable): Dictionaries containing engagement information
+        
+        Returns:
+            int: Number of engagements added
+        """
+        return self._ingest(Engagement, engagements, label="engagements")
+    
+    def add_search_queries(self, queries):
+        """Add a batch of search queries to the tracking system.
+        
+        Args:
+            queries (iterable): Dictionaries containing query information
+        
+        Returns:
+            int: Number of search queries added
+        """
+        return self._ingest(SearchQuery, queries, label="search queries")
+    
+    def import_records(self, path, table, file_format=None):
+        """Stream records from a CSV or JSON Lines export into a tracking table.
+        
+        Args:
+            path (str): File to import
+            table (str): Target table: "companies", "engagements" or "queries"
+            file_format (str, optional): "csv" or "jsonl", detected from the file extension by default
+        
+        Returns:
+            int: Number of records added
+        """
+        ingest = {
+            "companies": self.add_companies,
+            "engagements": self.add_engagements,
+            "queries": self.add_search_queries
+        }
+        if table not in ingest:
+            self.console.print(f"[bold red]Error:[/bold red] Unknown table: {table}")
+            return 0
+        
+        file_format = (file_format or os.path.splitext(path)[1].lstrip('.')).lower()
+        if file_format not in ("csv", "jsonl", "ndjson"):
+            self.console.print(f"[bold red]Error:[/bold red] Unsupported import format: {file_format}")
+            return 0
+        
+        try:
+            with open(path, 'r', newline='') as file:
+                if file_format == "csv":
+                    records = csv.DictReader(file)
+                else:
+                    records = (json.loads(line) for line in file if line.strip())
+                # Blank cells count as missing so required-field checks still apply
+                records = (
+                    {key: value for key, value in record.items() if value not in ("", None)}
+                    for record in records
+                )
+                return ingest[table](records)
+        except Exception as e:
+            self.console.print(f"[bold red]Error importing {path}:[/bold red] {str(e)}")
+            return 0
+    
+    def _to_record(self, record_type, data):
+        """Validate a dict and convert it to a typed record.
+        
+        Missing columns are left blank and the record's date column defaults
+        to today. Prints an error and returns None if a required field is missing.
+        """
+        record = record_type.from_dict(data)
+        missing = record.missing_fields()
+        if missing:
+            self.console.print(f"[bold red]Error:[/bold red] Missing required field: {missing[0]}")
+            return None
+        
+        # Add current date if not provided
+        if not record.get(record_type.date_field):
+            record.set(record_type.date_field, datetime.datetime.now().strftime("%Y-%m-%d"))
+        return record
+    
+    def _ingest(self, record_type, records, label, accept=None):
+        """Validate and append a stream of records through one buffered writer.
+        
+        Args:
+            record_type (type): Record type of the target table (Company, Engagement or SearchQuery)
+            records (iterable): Record dictionaries
+            label (str): Plural name used in the summary message
+            accept (callable, optional): Extra check; records for which it returns False are skipped as duplicates
+        
+        Returns:
+            int: Number of records added
+        """
+        start = time.perf_counter()
+        today = datetime.datetime.now().strftime("%Y-%m-%d")
+        added = 0
+        missing = 0
+        duplicates = 0
+        
+        date_field = record_type.date_field
+        
+        with self.storage.appender(record_type.table, fsync=True) as write:
+            for data in records:
+                record = record_type.from_dict(data)
+                if record.missing_fields():
+                    missing += 1
+                    continue
+                if accept is not None and not accept(record):
+                    duplicates += 1
+                    continue
+                if not record.get(date_field):
+                    record.set(date_field, today)
+                write(record)
+                added += 1
+        
+        elapsed = time.perf_counter() - start
+        rate = added / elapsed if elapsed > 0 else 0
+        self.console.print(f"[bold green]Success:[/bold green] Added {added} {label} to tracking system in {elapsed:.2f}s ({rate:,.0f} rows/sec)")
+        if missing:
+            self.console.print(f"[bold yellow]Warning:[/bold yellow] Skipped {missing} {label} with missing required fields ({', '.join(record_type.required_fields)})")
+        if duplicates:
+            self.console.print(f"[bold yellow]Warning:[/bold yellow] Skipped {duplicates} {label} that already exist")
+        return added
+    
     def update_company_status(self, company_name, new_status, notes=None):
         """Update the status of a company in the tracking system.
         
@@ -170,38 +292,30 @@ class InternshipSearchTracker:
             new_status (str): New status value
             notes (str, optional): Additional notes to add
         """
-        companies = []
+        changes = {
+            "Contact Status": new_status,
+            "Last Contact Date": datetime.datetime.now().strftime("%Y-%m-%d")
+        }
+        if notes:
+            changes["Notes"] = notes
+        
+        # Find and update the company, by its exact name or else by a spelling variant of it
         try:
-            with open(self.company_file, 'r', newline='') as file:
-                reader = csv.DictReader(file)
-                fieldnames = reader.fieldnames
-                companies = list(reader)
+            target = company_name
+            found = self.storage.update_company(company_name, changes)
+            if not found:
+                target = self.entities.canonical_company(company_name)
+                found = target is not None and self.storage.update_company(target, changes)
         except Exception as e:
             self.console.print(f"[bold red]Error:[/bold red] {str(e)}")
             return False
         
-        # Find and update the company
-        found = False
-        for company in companies:
-            if company["Company Name"] == company_name:
-                company["Contact Status"] = new_status
-                company["Last Contact Date"] = datetime.datetime.now().strftime("%Y-%m-%d")
-                if notes:
-                    company["Notes"] = notes
-                found = True
-                break
-        
         if not found:
             self.console.print(f"[bold yellow]Warning:[/bold yellow] Company {company_name} not found in tracking system")
             return False
         
-        # Write updated data back to file
-        with open(self.company_file, 'w', newline='') as file:
-            writer = csv.DictWriter(file, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(companies)
-        
-        self.console.print(f"[bold green]Success:[/bold green] Updated status for {company_name} to {new_status}")
+        matched = f" (matched {target})" if target != company_name else ""
+        self.console.print(f"[bold green]Success:[/bold green] Updated status for {company_name}{matched} to {new_status}")
         return True
     
     def update_engagement_response(self, contact_name, company, response_text, response_time=None):
@@ -213,319 +327,763 @@ class InternshipSearchTracker:
             response_text (str): The response received
             response_time (float, optional): Response time in hours
         """
-        engagements = []
+        changes = {"Response Received": response_text}
+        if response_time:
+            changes["Response Time (hours)"] = str(response_time)
+        changes["Status"] = "Response received"
+        
+        # Find and update the most recent engagement with this contact/company, matching
+        # spelling variants of the names if there is no exact match
+        matched = ""
         try:
-            with open(self.engagement_file, 'r', newline='') as file:
-                reader = csv.DictReader(file)
-                fieldnames = reader.fieldnames
-                engagements = list(reader)
+            found = self.storage.update_latest_engagement(contact_name, company, changes)
+            if not found:
+                match = self.entities.latest_engagement(contact_name, company)
+                found = match is not None and self.storage.update_latest_engagement(*match, changes)
+                if found:
+                    matched = f" (matched {match[0]} at {match[1]})"
         except Exception as e:
             self.console.print(f"[bold red]Error:[/bold red] {str(e)}")
             return False
         
-        # Find the most recent engagement with this contact/company
-        target_engagement = None
-        for engagement in reversed(engagements):
-            if engagement["Contact Name"] == contact_name and engagement["Company"] == company:
-                target_engagement = engagement
-                break
-        
-        if not target_engagement:
+        if not found:
             self.console.print(f"[bold yellow]Warning:[/bold yellow] No engagement found for {contact_name} at {company}")
             return False
         
-        # Update the engagement
-        target_engagement["Response Received"] = response_text
-        if response_time:
-            target_engagement["Response Time (hours)"] = str(response_time)
-        target_engagement["Status"] = "Response received"
+        self.console.print(f"[bold green]Success:[/bold green] Updated engagement with {contact_name}{matched} to include response")
+        return True
+
+    def enrich_contacts(self, provider, concurrency=8, retries=3, overwrite=False, cache_ttl=None):
+        """Fill in contact details from the LinkedIn URLs on company rows.
+
+        Every distinct profile URL is looked up once through ``provider``, with
+        at most ``concurrency`` lookups in flight; responses are cached in the
+        data directory, so later runs only look up new or expired profiles.
+        All enriched fields are written back in one batched update.
+
+        Args:
+            provider: Profile provider (see tracker_enrichment), e.g. ``HttpProvider`` or ``MockProvider``
+            concurrency (int): Maximum lookups in flight
+            retries (int): Extra attempts for lookups that fail transiently
+            overwrite (bool): Replace contact names and mutual connection counts that are already set
+            cache_ttl (float, optional): Seconds a cached profile stays valid (default: one week)
+
+        Returns:
+            dict: Enrichment statistics, or None on error
+        """
+        import asyncio
+        from tracker_enrichment import CACHE_TTL, CONTACT_COLUMNS, Enricher, ResponseCache, cache_path, enrichment_changes
+
+        async def run(urls):
+            try:
+                return await enricher.enrich(urls)
+            finally:
+                await provider.close()
+
+        try:
+            companies = self.storage.read_rows("companies")
+            urls = [company[url_column] for company in companies for _, url_column in CONTACT_COLUMNS if company.get(url_column)]
+            cache = ResponseCache(cache_path(self.data_dir), ttl=cache_ttl or CACHE_TTL)
+            enricher = Enricher(provider, concurrency=concurrency, retries=retries, cache=cache)
+            profiles = asyncio.run(run(urls))
+
+            updates = enrichment_changes(companies, profiles, overwrite=overwrite)
+            updated = self.storage.update_companies(updates) if updates else 0
+        except Exception as e:
+            self.console.print(f"[bold red]Error enriching contacts:[/bold red] {str(e)}")
+            return None
+
+        stats = dict(enricher.stats, profiles=len(profiles), updated=updated)
+        self.console.print(
+            f"[bold green]Success:[/bold green] Enriched {updated} companies from {len(profiles)} profiles "
+            f"({stats['cache_hits']} cached, {stats['requests']} requests, {stats['retries']} retries) "
+            f"in {stats['seconds']:.2f}s"
+        )
+        if stats["failures"]:
+            self.console.print(f"[bold yellow]Warning:[/bold yellow] {stats['failures']} lookups failed; they will be retried on the next run")
+        return stats
+
+    def import_csv(self, source_dir):
+        """Import tracking CSV files from another data directory.
+
+        Args:
+            source_dir (str): Directory containing company_contacts.csv, engagement_tracker.csv and/or search_queries.csv
+        """
+        try:
+            imported = self.storage.import_csv(source_dir)
+        except Exception as e:
+            self.console.print(f"[bold red]Error importing CSV files:[/bold red] {str(e)}")
+            return False
+
+        summary = ", ".join(f"{count} {table}" for table, count in imported.items()) or "nothing"
+        self.console.print(f"[bold green]Success:[/bold green] Imported {summary} from {source_dir}")
+        return True
+
+    def export_csv(self, target_dir=None):
+        """Export all tracking tables as CSV files.
+
+        Args:
+            target_dir (str, optional): Output directory, defaults to the data directory
+        """
+        try:
+            paths = self.storage.export_csv(target_dir)
+        except Exception as e:
+            self.console.print(f"[bold red]Error exporting CSV files:[/bold red] {str(e)}")
+            return False
+
+        self.console.print(f"[bold green]Success:[/bold green] Exported {len(paths)} CSV files to {target_dir or self.data_dir}")
+        return True
+
+    def compute_analytics(self, use_cache=True, chunksize=None):
+        """Load each tracking table once and aggregate it for the reports.
+        
+        With the CSV backend the aggregates are kept in a persistent cache in
+        the data directory, and only rows appended since the last call are parsed.
+        
+        Args:
+            use_cache (bool): Use (and update) the incremental analytics cache when available
+            chunksize (int, optional): Stream the tables in chunks of this many rows, so
+                memory use is bounded by the chunk size instead of the file size. The
+                result is identical to loading each table at once, up to rounding in
+                the float sums. Defaults to the tracker's ``chunksize``.
         
-        # Write updated data back to file
-        with open(self.engagement_file, 'w', newline='') as file:
-            writer = csv.DictWriter(file, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(engagements)
+        Returns:
+            TrackerAggregates: Counts shared by generate_analytics, the charts and suggest_optimizations
+        """
+        chunksize = chunksize or self.chunksize
+        if use_cache and self.analytics_cache is not None:
+            return self.analytics_cache.load(chunksize=chunksize)
         
-        self.console.print(f"[bold green]Success:[/bold green] Updated engagement with {contact_name} to include response")
+        analytics = TrackerAggregates()
+        for table in TABLES:
+            for frame in self.storage.iter_frames(table, chunksize):
+                analytics.add_table(table, frame)
+        return analytics
+    
+    def compact(self):
+        """Apply pending status and response updates to the tracking files.
+        
+        Updates are logged as events and applied lazily (before the next read,
+        or once the log passes its size or age threshold); this applies them now.
+        """
+        try:
+            start = time.perf_counter()
+            applied = self.storage.compact()
+        except Exception as e:
+            self.console.print(f"[bold red]Error:[/bold red] {str(e)}")
+            return False
+        self.console.print(f"[bold green]Success:[/bold green] Applied {applied} pending updates in {time.perf_counter() - start:.2f}s")
         return True
     
-    def generate_analytics(self):
-        """Generate analytics from the tracking data and display visualizations."""
+    def stage_timings(self):
+        """Return the mean time between funnel stages, from the update history.
+        
+        Returns:
+            list: (from status, to status, transitions, mean hours) tuples, in funnel order
+        """
+        return stage_timings(self.storage.update_history())
+    
+    def enable_metrics(self, profile=(), trace_memory=()):
+        """Start collecting per-method timings, rows and bytes of I/O and chart render times.
+        
+        Public methods are wrapped with timers only while metrics are enabled,
+        so a tracker without metrics runs the plain methods.
+        
+        Args:
+            profile (iterable): Methods to run under cProfile, or "*" for every public method
+            trace_memory (iterable): Methods whose peak memory is measured with tracemalloc, or "*"
+        """
+        self.metrics.enabled = True
+        self.storage.metrics = self.metrics
+        uninstrument(self)
+        instrument(self, self.metrics, exclude=METRICS_METHODS, profile=profile, trace_memory=trace_memory)
+    
+    def disable_metrics(self):
+        """Stop collecting metrics; what was collected stays in ``self.metrics``."""
+        self.metrics.enabled = False
+        self.storage.metrics = None
+        uninstrument(self)
+    
+    def show_metrics(self, json_path=None, profile_lines=15):
+        """Print the collected metrics as rich tables, or write them as JSON.
+        
+        Args:
+            json_path (str, optional): Write the metrics to this JSON file instead of printing tables
+            profile_lines (int): Functions listed per profiled method
+        """
         try:
-            # Load data into pandas for analysis
-            companies_df = pd.read_csv(self.company_file)
-            engagements_df = pd.read_csv(self.engagement_file)
-            queries_df = pd.read_csv(self.query_file)
-            
-            # Create analytics console output
-            self.console.print("\n[bold blue]===== INTERNSHIP SEARCH ANALYTICS =====[/bold blue]\n")
-            
-            # Company statistics
-            self.console.print("[bold]Company Statistics:[/bold]")
-            company_count = len(companies_df)
-            industry_counts = companies_df['Industry'].value_counts()
-            tech_counts = companies_df['Technologies'].str.split(',').explode().str.strip().value_counts()
-            
-            table = Table(title="Company Breakdown by Industry")
-            table.add_column("Industry", style="cyan")
-            table.add_column("Count", style="magenta")
-            table.add_column("Percentage", style="green")
-            
-            for industry, count in industry_counts.items():
-                percentage = f"{count/company_count*100:.1f}%"
-                table.add_row(industry, str(count), percentage)
-            
-            self.console.print(table)
-            
-            # Engagement statistics
-            self.console.print("\n[bold]Engagement Statistics:[/bold]")
-            platform_counts = engagements_df['Platform'].value_counts()
-            type_counts = engagements_df['Engagement Type'].value_counts()
-            response_rate = len(engagements_df[engagements_df['Response Received'].notna()]) / len(engagements_df) * 100
-            
-            table = Table(title="Engagement Breakdown by Platform")
-            table.add_column("Platform", style="cyan")
-            table.add_column("Count", style="magenta")
-            table.add_column("Response Rate", style="green")
-            
-            for platform in platform_counts.index:
-                platform_df = engagements_df[engagements_df['Platform'] == platform]
-                platform_response_rate = len(platform_df[platform_df['Response Received'].notna()]) / len(platform_df) * 100
-                table.add_row(platform, str(platform_counts[platform]), f"{platform_response_rate:.1f}%")
+            if json_path:
+                self.metrics.to_json(json_path)
+                self.console.print(f"[bold green]Success:[/bold green] Wrote metrics to {json_path}")
+                return True
             
-            self.console.print(table)
-            self.console.print(f"Overall Response Rate: [bold green]{response_rate:.1f}%[/bold green]")
+            self.console.print("\n[bold blue]===== METRICS =====[/bold blue]\n")
+            for table in self.metrics.summary_tables():
+                self.console.print(table)
+            for name in self.metrics.profiles:
+                self.console.print(f"\n[bold]Profile of {name}:[/bold]")
+                self.console.print(self.metrics.print_stats(name, profile_lines), markup=False, highlight=False, soft_wrap=True)
+            return True
+        except Exception as e:
+            self.console.print(f"[bold red]Error showing metrics:[/bold red] {str(e)}")
+            return False
+    
+    def generate_analytics(self, analytics=None, chunksize=None, output="rich", file=None, offset=0, limit=None, charts=None):
+        """Generate analytics from the tracking data and display visualizations.
+        
+        Args:
+            analytics (TrackerAggregates, optional): Precomputed result of compute_analytics
+            chunksize (int, optional): Stream the data in chunks of this many rows (see compute_analytics)
+            output (str, optional): "rich" to display the tables, "jsonl" or "csv" to stream
+                them to ``file``, or None to only return the report
+            file (file, optional): Destination of a streamed output (default: standard output)
+            offset (int): Skip this many rows of each table
+            limit (int, optional): Keep at most this many rows of each table
+            charts (bool, optional): Render the charts (default: only with rich output)
+        
+        Returns:
+            Report: Summary counts and the tables "industries", "platforms", "statuses",
+            "query_platforms" and "stage_timings", or False on error
+        """
+        try:
+            if analytics is None:
+                analytics = self.compute_analytics(chunksize=chunksize)
             
-            # Status breakdown
-            status_counts = engagements_df['Status'].value_counts()
-            self.console.print("\n[bold]Status Breakdown:[/bold]")
-            for status, count in status_counts.items():
-                self.console.print(f"  {status}: [bold]{count}[/bold] ({count/len(engagements_df)*100:.1f}%)")
+            # Tables are timed separately from the charts
+            with self.metrics.timer("analytics.tables"):
+                company_count = analytics.company_count
+                engagement_count = analytics.engagement_count
+                report = Report("analytics", "INTERNSHIP SEARCH ANALYTICS", {
+                    "companies": company_count,
+                    "engagements": engagement_count,
+                    "queries": analytics.query_count,
+                    "response_rate": analytics.response_rate(),
+                    "average_response_time": analytics.average_response_time()
+                })
+                report.add_table("industries", ["industry", "count", "percentage"], [
+                    {"industry": industry, "count": count, "percentage": count / company_count * 100}
+                    for industry, count in analytics.industry_breakdown()
+                ], title="Company Breakdown by Industry")
+                report.add_table("platforms", ["platform", "count", "response_rate"], [
+                    {"platform": platform, "count": analytics.platform_counts[platform], "response_rate": rate}
+                    for platform, rate in analytics.platform_response_rates().items()
+                ], title="Engagement Breakdown by Platform")
+                report.add_table("statuses", ["status", "count", "percentage"], [
+                    {"status": status, "count": count, "percentage": count / engagement_count * 100}
+                    for status, count in analytics.status_breakdown()
+                ], title="Status Breakdown")
+                
+                # Search query effectiveness, from the running per-query totals
+                platforms = sorted(self.storage.query_stats().platforms().items(), key=lambda item: -item[1]["runs"])
+                report.add_table("query_platforms", ["platform", "runs", "queries", "average_results", "average_rating"], [
+                    dict({"platform": platform}, **totals) for platform, totals in platforms
+                ], title="Search Query Statistics")
+                
+                # Time between funnel stages, from the status update history
+                timings = self.stage_timings()
+                report.add_table("stage_timings", ["from", "to", "transitions", "mean_hours"], [
+                    {"from": source, "to": target, "transitions": transitions, "mean_hours": mean_hours}
+                    for source, target, transitions, mean_hours in timings
+                ], title="Funnel Stage Timings")
+                
+                self._present(report, output, file, offset, limit, self._render_analytics)
             
             # Generate visualizations
-            self._generate_visualizations(companies_df, engagements_df, queries_df)
-            
-            return True
+            if charts or (charts is None and output == "rich"):
+                self._generate_visualizations(analytics, timings=timings)
             
+            return report
+        
         except Exception as e:
             self.console.print(f"[bold red]Error generating analytics:[/bold red] {str(e)}")
             return False
     
-    def _generate_visualizations(self, companies_df, engagements_df, queries_df):
+    def _render_analytics(self, report):
+        from rich.table import Table
+        
+        # Create analytics console output
+        self.console.print(f"\n[bold blue]===== {report.title} =====[/bold blue]\n")
+        
+        # Company statistics
+        self.console.print("[bold]Company Statistics:[/bold]")
+        table = Table(title=report.tables["industries"].title)
+        table.add_column("Industry", style="cyan")
+        table.add_column("Count", style="magenta")
+        table.add_column("Percentage", style="green")
+        for row in report.rows("industries"):
+            table.add_row(row["industry"], str(row["count"]), f"{row['percentage']:.1f}%")
+        self.console.print(table)
+        
+        # Engagement statistics
+        self.console.print("\n[bold]Engagement Statistics:[/bold]")
+        table = Table(title=report.tables["platforms"].title)
+        table.add_column("Platform", style="cyan")
+        table.add_column("Count", style="magenta")
+        table.add_column("Response Rate", style="green")
+        for row in report.rows("platforms"):
+            table.add_row(row["platform"], str(row["count"]), f"{row['response_rate']:.1f}%")
+        self.console.print(table)
+        self.console.print(f"Overall Response Rate: [bold green]{report.summary['response_rate']:.1f}%[/bold green]")
+        
+        # Status breakdown
+        self.console.print("\n[bold]Status Breakdown:[/bold]")
+        for row in report.rows("statuses"):
+            self.console.print(f"  {row['status']}: [bold]{row['count']}[/bold] ({row['percentage']:.1f}%)")
+        
+        query_platforms = report.rows("query_platforms")
+        if query_platforms:
+            self.console.print("\n[bold]Search Query Statistics:[/bold]")
+            for row in query_platforms:
+                rating = "" if row["average_rating"] is None else f", average rating {row['average_rating']:.2f}"
+                self.console.print(f"  {row['platform']}: [bold]{row['runs']}[/bold] runs of {row['queries']} distinct queries{rating}")
+        
+        timings = report.rows("stage_timings")
+        if timings:
+            table = Table(title=report.tables["stage_timings"].title)
+            table.add_column("From", style="cyan")
+            table.add_column("To", style="cyan")
+            table.add_column("Transitions", style="magenta")
+            table.add_column("Mean Time", style="green")
+            for row in timings:
+                table.add_row(row["from"], row["to"], str(row["transitions"]), f"{row['mean_hours']:.1f}h")
+            self.console.print(table)
+    
+    def _present(self, report, output, file, offset, limit, render):
+        """Page a report and present it.
+        
+        Args:
+            report (Report): Report to present
+            output (str): "rich" (render with ``render``), "jsonl" or "csv" (stream the
+                rows to ``file``, standard output by default) or None (keep the rows only)
+            file (file): Destination of a streamed output
+            offset (int): Rows of each table to skip
+            limit (int): Rows of each table to keep at most
+            render (callable): Rich presentation of the report
+        """
+        report.page(offset, limit)
+        if output == "rich":
+            report.materialize()
+            render(report)
+        elif output is None:
+            report.materialize()
+        elif file is not None:
+            write_report(report, file, output)
+        else:
+            try:
+                write_report(report, sys.stdout, output)
+            except BrokenPipeError:
+                # The reader stopped early (e.g. piped to head); that's not an error
+                devnull = os.open(os.devnull, os.O_WRONLY)
+                os.dup2(devnull, sys.stdout.fileno())
+        return report
+    
+    def _generate_visualizations(self, analytics, force=False, timings=None):
         """Generate visualization charts from the tracking data.
         
+        Charts render headless and in parallel; charts whose data hasn't
+        changed since the last run are left as they are.
+        
         Args:
-            companies_df (DataFrame): Companies data
-            engagements_df (DataFrame): Engagements data
-            queries_df (DataFrame): Search queries data
+            analytics (TrackerAggregates): Aggregated tracking data
+            force (bool): Re-render every chart even if its data is unchanged
+            timings (list, optional): Funnel stage timings, shown on the funnel chart
         """
-        # Create figures directory if it doesn't exist
         figures_dir = os.path.join(self.data_dir, "figures")
-        if not os.path.exists(figures_dir):
-            os.makedirs(figures_dir)
-        
-        # Figure 1: Response rates by platform
-        plt.figure(figsize=(10, 6))
-        platforms = engagements_df['Platform'].unique()
-        response_rates = []
-        
-        for platform in platforms:
-            platform_df = engagements_df[engagements_df['Platform'] == platform]
-            response_rate = len(platform_df[platform_df['Response Received'].notna()]) / len(platform_df) * 100
-            response_rates.append(response_rate)
-        
-        plt.bar(platforms, response_rates, color='skyblue')
-        plt.xlabel('Platform')
-        plt.ylabel('Response Rate (%)')
-        plt.title('Response Rates by Platform')
-        plt.grid(axis='y', linestyle='--', alpha=0.7)
-        plt.savefig(os.path.join(figures_dir, 'response_rates_by_platform.png'))
-        
-        # Figure 2: Engagement status funnel
-        plt.figure(figsize=(12, 6))
-        status_order = ['Initial Contact', 'Response Received', 'In Conversation', 'Meeting Scheduled', 'Interview Opportunity']
-        status_counts = []
-        
-        for status in status_order:
-            count = len(engagements_df[engagements_df['Status'] == status])
-            status_counts.append(count)
-        
-        plt.bar(status_order, status_counts, color='lightgreen')
-        plt.xlabel('Status')
-        plt.ylabel('Count')
-        plt.title('Engagement Funnel')
-        plt.xticks(rotation=45)
-        plt.grid(axis='y', linestyle='--', alpha=0.7)
-        plt.tight_layout()
-        plt.savefig(os.path.join(figures_dir, 'engagement_funnel.png'))
-        
-        # Figure 3: Technologies word cloud (if wordcloud package is available)
-        try:
-            from wordcloud import WordCloud
-            
-            # Combine all technologies
-            all_techs = ' '.join(companies_df['Technologies'].dropna())
-            
-            # Generate word cloud
-            wordcloud = WordCloud(width=800, height=400, background_color='white').generate(all_techs)
-            
-            plt.figure(figsize=(10, 5))
-            plt.imshow(wordcloud, interpolation='bilinear')
-            plt.axis('off')
-            plt.title('Technologies Word Cloud')
-            plt.tight_layout()
-            plt.savefig(os.path.join(figures_dir, 'technologies_wordcloud.png'))
-            
-        except ImportError:
+        renderer = ChartRenderer(figures_dir, max_workers=self.chart_workers)
+        with self.metrics.timer("analytics.charts"):
+            statuses = renderer.render(analytics, force=force, timings=timings)
+        if self.metrics.enabled:
+            for name, (seconds, savefig_seconds) in renderer.render_times.items():
+                chart = os.path.splitext(name)[0]
+                self.metrics.add_time(f"chart.{chart}", seconds)
+                self.metrics.add_time(f"savefig.{chart}", savefig_seconds)
+        
+        if not wordcloud_available():
             self.console.print("[yellow]Note:[/yellow] WordCloud package not available. Skipping word cloud visualization.")
         
-        self.console.print(f"\n[bold green]Success:[/bold green] Generated visualizations in {figures_dir}")
+        rendered = sum(1 for status in statuses.values() if status == "rendered")
+        unchanged = len(statuses) - rendered
+        self.console.print(f"\n[bold green]Success:[/bold green] Generated visualizations in {figures_dir} ({rendered} rendered, {unchanged} unchanged)")
     
-    def get_upcoming_actions(self, days=7):
+    def get_upcoming_actions(self, days=7, start=None, end=None, overdue=False, output="rich", file=None, offset=0, limit=None):
         """Get a list of upcoming actions for the next specified days.
         
+        Actions are looked up through a date index, so only the rows in the
+        window are read. A streamed output writes each action as it is read.
+        
         Args:
             days (int): Number of days to look ahead
+            start (str or date, optional): First day of the window (default: today)
+            end (str or date, optional): Last day of the window (default: start + days)
+            overdue (bool): Show actions dated before today instead
+            output (str, optional): "rich" to display a table, "jsonl" or "csv" to stream
+                the actions to ``file``, or None to only return the report
+            file (file, optional): Destination of a streamed output (default: standard output)
+            offset (int): Skip this many actions
+            limit (int, optional): Keep at most this many actions
+        
+        Returns:
+            Report: Table "actions" with "Next Action Date", "Contact Name", "Company" and
+            "Next Action", sorted by date, or False on error
         """
         try:
-            # Load engagement data
-            engagements_df = pd.read_csv(self.engagement_file)
-            
-            # Filter for rows with next action date
-            actions_df = engagements_df[engagements_df['Next Action Date'].notna()]
-            
-            # Convert dates to datetime
-            actions_df['Next Action Date'] = pd.to_datetime(actions_df['Next Action Date'])
-            
-            # Get current date and future cutoff
-            today = datetime.datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-            cutoff = today + datetime.timedelta(days=days)
-            
-            # Filter for upcoming actions
-            upcoming_df = actions_df[(actions_df['Next Action Date'] >= today) & 
-                                    (actions_df['Next Action Date'] <= cutoff)]
+            # Get current date and window boundaries
+            today = datetime.date.today()
+            if overdue:
+                window_start, window_end = None, today - datetime.timedelta(days=1)
+                title = "OVERDUE ACTIONS"
+            else:
+                window_start = self._as_date(start) if start else today
+                window_end = self._as_date(end) if end else window_start + datetime.timedelta(days=days)
+                if start or end:
+                    title = f"ACTIONS ({window_start.isoformat()} to {window_end.isoformat()})"
+                else:
+                    title = f"UPCOMING ACTIONS (Next {days} Days)"
             
-            # Sort by date
-            upcoming_df = upcoming_df.sort_values('Next Action Date')
-            
-            # Display upcoming actions
-            self.console.print(f"\n[bold blue]===== UPCOMING ACTIONS (Next {days} Days) =====[/bold blue]\n")
-            
-            if len(upcoming_df) == 0:
-                self.console.print("[yellow]No upcoming actions scheduled[/yellow]")
-                return True
+            report = Report("overdue" if overdue else "upcoming", title)
+            report.add_table("actions", ["Next Action Date", "Contact Name", "Company", "Next Action"], self.storage.iter_next_actions(
+                window_start.isoformat() if window_start else None,
+                window_end.isoformat()
+            ))
+            return self._present(report, output, file, offset, limit, self._render_actions)
+        
+        except Exception as e:
+            self.console.print(f"[bold red]Error getting upcoming actions:[/bold red] {str(e)}")
+            return False
+    
+    def _render_actions(self, report):
+        from rich.table import Table
+        
+        upcoming = report.rows("actions")
+        
+        # Display upcoming actions
+        self.console.print(f"\n[bold blue]===== {report.title} =====[/bold blue]\n")
+        
+        if len(upcoming) == 0:
+            self.console.print("[yellow]No overdue actions[/yellow]" if report.name == "overdue" else "[yellow]No upcoming actions scheduled[/yellow]")
+            return
+        
+        table = Table()
+        table.add_column("Date", style="cyan")
+        table.add_column("Contact", style="green")
+        table.add_column("Company", style="magenta")
+        table.add_column("Action", style="yellow")
+        
+        for action in upcoming:
+            table.add_row(
+                action['Next Action Date'],
+                action['Contact Name'],
+                action['Company'],
+                action['Next Action']
+            )
+        
+        self.console.print(table)
+    
+    def companies_using(self, technologies, match_all=True):
+        """Return the names of companies using the given technologies.
+        
+        Technologies are matched in any spelling or alias ("aws", "Amazon Web
+        Services"), through an inverted index instead of a table scan.
+        
+        Args:
+            technologies (list): Technology names
+            match_all (bool): Require every technology (AND) instead of any of them (OR)
+        
+        Returns:
+            list: Company names, in the order they were added
+        """
+        return self.storage.companies_using(technologies, match_all)
+    
+    def top_technologies(self, n=10):
+        """Return the most used technologies as (technology, number of companies) pairs."""
+        return self.storage.technology_counts(n)
+    
+    def show_technologies(self, technologies=None, match_all=True, top=10, output="rich", file=None, offset=0, limit=None):
+        """Display the companies using some technologies, or the most used technologies.
+        
+        Args:
+            technologies (list, optional): Technology names to look up; shows the top technologies if empty
+            match_all (bool): Require every technology (AND) instead of any of them (OR)
+            top (int): Number of technologies to show when none are given
+            output (str, optional): "rich", "jsonl", "csv" or None (see get_upcoming_actions)
+            file (file, optional): Destination of a streamed output (default: standard output)
+            offset (int): Skip this many rows
+            limit (int, optional): Keep at most this many rows
+        
+        Returns:
+            Report: Table "technologies" (technology, companies) when no technologies are
+            given, else table "companies" (company), or False on error
+        """
+        try:
+            if not technologies:
+                report = Report("technologies", f"TOP {top} TECHNOLOGIES")
+                report.add_table("technologies", ["technology", "companies"], (
+                    {"technology": technology, "companies": count} for technology, count in self.top_technologies(top)
+                ))
+            else:
+                joiner = " AND " if match_all else " OR "
+                report = Report("technologies", f"COMPANIES USING {joiner.join(technologies)}")
+                report.add_table("companies", ["company"], (
+                    {"company": company} for company in self.companies_using(technologies, match_all)
+                ))
+            return self._present(report, output, file, offset, limit, self._render_technologies)
+        
+        except Exception as e:
+            self.console.print(f"[bold red]Error querying technologies:[/bold red] {str(e)}")
+            return False
+    
+    def _render_technologies(self, report):
+        from rich.table import Table
+        
+        self.console.print(f"\n[bold blue]===== {report.title} =====[/bold blue]\n")
+        if "technologies" in report.tables:
+            counts = report.rows("technologies")
+            if not counts:
+                self.console.print("[yellow]No technologies tracked yet[/yellow]")
+                return
             
             table = Table()
-            table.add_column("Date", style="cyan")
-            table.add_column("Contact", style="green")
-            table.add_column("Company", style="magenta")
-            table.add_column("Action", style="yellow")
-            
-            for _, row in upcoming_df.iterrows():
-                date_str = row['Next Action Date'].strftime("%Y-%m-%d")
-                table.add_row(
-                    date_str,
-                    row['Contact Name'],
-                    row['Company'],
-                    row['Next Action']
-                )
-            
+            table.add_column("Technology", style="cyan")
+            table.add_column("Companies", style="magenta")
+            for row in counts:
+                table.add_row(row["technology"], str(row["companies"]))
             self.console.print(table)
-            return True
-            
+            return
+        
+        companies = report.rows("companies")
+        if not companies:
+            self.console.print("[yellow]No matching companies[/yellow]")
+            return
+        
+        for row in companies:
+            self.console.print(f"  {row['company']}")
+        self.console.print(f"\n[bold]{len(companies)}[/bold] companies")
+    
+    def best_queries(self, k=10, platform=None, by="rating", min_runs=1):
+        """Return the most effective search queries, counting every spelling of a query together.
+        
+        Args:
+            k (int): Number of queries
+            platform (str, optional): Only queries run on this platform
+            by (str): Rank by average "rating", average "results" count or number of "runs"
+            min_runs (int): Ignore queries run fewer times
+        
+        Returns:
+            list: Dicts with "platform", "query", "canonical", "runs", "average_results",
+            "average_rating" and "last_run", best first
+        """
+        return self.storage.query_stats().best(k, platform=platform, by=by, min_runs=min_runs)
+    
+    def show_query_rankings(self, top=10, platform=None, by="rating", min_runs=1, output="rich", file=None, offset=0, limit=None):
+        """Display search query effectiveness per platform and the best queries.
+        
+        Args:
+            top (int): Number of queries to list
+            platform (str, optional): Only queries run on this platform
+            by (str): Rank by average "rating", average "results" count or number of "runs"
+            min_runs (int): Ignore queries run fewer times
+            output (str, optional): "rich", "jsonl", "csv" or None (see get_upcoming_actions)
+            file (file, optional): Destination of a streamed output (default: standard output)
+            offset (int): Skip this many rows of each table
+            limit (int, optional): Keep at most this many rows of each table
+        
+        Returns:
+            Report: Tables "platforms" (totals per platform) and "queries" (best first),
+            or False on error
+        """
+        try:
+            stats = self.storage.query_stats()
+            title = f"Top {top} Queries by {by.capitalize()}" + (f" on {platform}" if platform else "")
+            report = Report("queries", "SEARCH QUERY EFFECTIVENESS")
+            report.add_table("platforms", ["platform", "runs", "queries", "average_results", "average_rating"], [
+                dict({"platform": name}, **totals)
+                for name, totals in sorted(stats.platforms().items(), key=lambda item: -item[1]["runs"])
+            ], title="Search Queries by Platform")
+            report.add_table(
+                "queries", ["platform", "query", "canonical", "runs", "average_results", "average_rating", "last_run"],
+                stats.best(top, platform=platform, by=by, min_runs=min_runs), title=title
+            )
+            return self._present(report, output, file, offset, limit, self._render_query_rankings)
+        
         except Exception as e:
-            self.console.print(f"[bold red]Error getting upcoming actions:[/bold red] {str(e)}")
+            self.console.print(f"[bold red]Error ranking search queries:[/bold red] {str(e)}")
+            return False
+    
+    def _render_query_rankings(self, report):
+        from rich.table import Table
+        
+        def number(value, digits):
+            return "-" if value is None else f"{value:.{digits}f}"
+        
+        self.console.print(f"\n[bold blue]===== {report.title} =====[/bold blue]\n")
+        platforms = report.rows("platforms")
+        if not platforms:
+            self.console.print("[yellow]No search queries logged yet[/yellow]")
+            return
+        
+        table = Table(title=report.tables["platforms"].title)
+        table.add_column("Platform", style="cyan")
+        table.add_column("Runs", style="magenta")
+        table.add_column("Distinct Queries", style="magenta")
+        table.add_column("Avg Results", style="green")
+        table.add_column("Avg Rating", style="green")
+        for row in platforms:
+            table.add_row(row["platform"], str(row["runs"]), str(row["queries"]),
+                          number(row["average_results"], 1), number(row["average_rating"], 2))
+        self.console.print(table)
+        
+        table = Table(title=report.tables["queries"].title)
+        table.add_column("#", style="dim")
+        table.add_column("Platform", style="cyan")
+        table.add_column("Query", style="white")
+        table.add_column("Runs", style="magenta")
+        table.add_column("Avg Results", style="green")
+        table.add_column("Avg Rating", style="green")
+        for rank, row in enumerate(report.rows("queries"), 1):
+            table.add_row(str(rank), row["platform"], row["query"], str(row["runs"]),
+                          number(row["average_results"], 1), number(row["average_rating"], 2))
+        self.console.print(table)
+    
+    def show_company_variants(self, limit=20, output="rich", file=None, offset=0):
+        """Display the companies whose names are spelled more than one way across the tables.
+        
+        Updates and the per-industry analysis treat the spellings as one company.
+        
+        Args:
+            limit (int, optional): Maximum number of companies to list, most spellings first
+            output (str, optional): "rich", "jsonl", "csv" or None (see get_upcoming_actions)
+            file (file, optional): Destination of a streamed output (default: standard output)
+            offset (int): Skip this many companies
+        
+        Returns:
+            Report: Table "variants" (company, spellings), or False on error
+        """
+        try:
+            variants = self.entities.variants()
+            ordered = sorted(variants.items(), key=lambda item: (-len(item[1]), item[0]))
+            report = Report("variants", "COMPANY NAME VARIANTS", {"companies": len(variants)})
+            report.add_table("variants", ["company", "spellings"], (
+                {"company": company, "spellings": spellings} for company, spellings in ordered
+            ))
+            return self._present(report, output, file, offset, limit, self._render_company_variants)
+        
+        except Exception as e:
+            self.console.print(f"[bold red]Error resolving companies:[/bold red] {str(e)}")
             return False
     
-    def suggest_optimizations(self):
-        """Analyze tracking data and suggest optimizations for the search strategy."""
+    def _render_company_variants(self, report):
+        from rich.table import Table
+        
+        self.console.print(f"\n[bold blue]===== {report.title} =====[/bold blue]\n")
+        if not report.summary["companies"]:
+            self.console.print("[yellow]Every company is spelled one way[/yellow]")
+            return
+        
+        table = Table()
+        table.add_column("Company", style="cyan")
+        table.add_column("Spellings", style="magenta")
+        for row in report.rows("variants"):
+            table.add_row(row["company"], ", ".join(row["spellings"]))
+        self.console.print(table)
+        self.console.print(f"\n[bold]{report.summary['companies']}[/bold] companies with variant spellings")
+    
+    @staticmethod
+    def _as_date(value):
+        """Accept a date, datetime or "YYYY-MM-DD" string."""
+        if isinstance(value, datetime.datetime):
+            return value.date()
+        if isinstance(value, datetime.date):
+            return value
+        return datetime.date.fromisoformat(value)
+    
+    def suggest_optimizations(self, analytics=None, chunksize=None, output="rich", file=None, offset=0, limit=None):
+        """Analyze tracking data and suggest optimizations for the search strategy.
+        
+        Args:
+            analytics (TrackerAggregates, optional): Precomputed result of compute_analytics
+            chunksize (int, optional): Stream the data in chunks of this many rows (see compute_analytics)
+            output (str, optional): "rich", "jsonl", "csv" or None (see get_upcoming_actions)
+            file (file, optional): Destination of a streamed output (default: standard output)
+            offset (int): Skip this many suggestions
+            limit (int, optional): Keep at most this many suggestions
+        
+        Returns:
+            Report: Table "suggestions" (number, category, suggestion), or False on error
+        """
         try:
-            # Load data
-            companies_df = pd.read_csv(self.company_file)
-            engagements_df = pd.read_csv(self.engagement_file)
-            queries_df = pd.read_csv(self.query_file)
+            if analytics is None:
+                analytics = self.compute_analytics(chunksize=chunksize)
             
             suggestions = []
             
-            # 1. Platform effectiveness
-            platform_response_rates = {}
-            for platform in engagements_df['Platform'].unique():
-                platform_df = engagements_df[engagements_df['Platform'] == platform]
-                if len(platform_df) >= 5:  # Only consider platforms with enough data
-                    response_rate = len(platform_df[platform_df['Response Received'].notna()]) / len(platform_df) * 100
-                    platform_response_rates[platform] = response_rate
+            # 1. Platform effectiveness (only platforms with enough data)
+            platform_response_rates = analytics.platform_response_rates(min_count=5)
             
             if platform_response_rates:
                 best_platform = max(platform_response_rates.items(), key=lambda x: x[1])
                 worst_platform = min(platform_response_rates.items(), key=lambda x: x[1])
                 
                 if best_platform[1] > 1.5 * worst_platform[1]:  # If best is 50% better than worst
-                    suggestions.append(f"Focus more on {best_platform[0]} which has a {best_platform[1]:.1f}% response rate compared to {worst_platform[0]}'s {worst_platform[1]:.1f}%")
+                    suggestions.append(("platform", f"Focus more on {best_platform[0]} which has a {best_platform[1]:.1f}% response rate compared to {worst_platform[0]}'s {worst_platform[1]:.1f}%"))
             
-            # 2. Engagement type effectiveness
-            type_response_rates = {}
-            for eng_type in engagements_df['Engagement Type'].unique():
-                type_df = engagements_df[engagements_df['Engagement Type'] == eng_type]
-                if len(type_df) >= 5:  # Only consider types with enough data
-                    response_rate = len(type_df[type_df['Response Received'].notna()]) / len(type_df) * 100
-                    type_response_rates[eng_type] = response_rate
+            # 2. Engagement type effectiveness (only types with enough data)
+            type_response_rates = analytics.type_response_rates(min_count=5)
             
             if type_response_rates:
                 best_type = max(type_response_rates.items(), key=lambda x: x[1])
-                suggestions.append(f"'{best_type[0]}' engagement type has the highest response rate at {best_type[1]:.1f}%. Consider using this approach more frequently.")
+                suggestions.append(("engagement_type", f"'{best_type[0]}' engagement type has the highest response rate at {best_type[1]:.1f}%. Consider using this approach more frequently."))
             
-            # 3. Industry focus
-            if 'Industry' in companies_df.columns and 'Contact Status' in companies_df.columns:
-                industry_success = {}
-                for industry in companies_df['Industry'].unique():
-                    industry_df = companies_df[companies_df['Industry'] == industry]
-                    if len(industry_df) >= 3:  # Only consider industries with enough data
-                        success_rate = len(industry_df[industry_df['Contact Status'].isin(['In Conversation', 'Meeting Scheduled', 'Interview Opportunity'])]) / len(industry_df) * 100
-                        industry_success[industry] = success_rate
-                
-                if industry_success:
-                    best_industry = max(industry_success.items(), key=lambda x: x[1])
-                    if best_industry[1] > 0:  # Only suggest if there's some success
-                        suggestions.append(f"Companies in the {best_industry[0]} industry show higher engagement rates ({best_industry[1]:.1f}%). Consider focusing more on this sector.")
+            # 3. Industry focus (only industries with enough data), counting each company
+            # once and crediting it with engagements logged under any spelling of its name
+            industry_success = analytics.company_success_rates(self.entities.company_ids(chunksize), min_count=3)
+            
+            if industry_success:
+                best_industry = max(industry_success.items(), key=lambda x: x[1])
+                if best_industry[1] > 0:  # Only suggest if there's some success
+                    suggestions.append(("industry", f"Companies in the {best_industry[0]} industry show higher engagement rates ({best_industry[1]:.1f}%). Consider focusing more on this sector."))
             
             # 4. Technology focus
-            if 'Technologies' in companies_df.columns:
-                # Extract all technologies
-                all_techs = companies_df['Technologies'].str.split(',').explode().str.strip()
-                tech_counts = all_techs.value_counts()
-                
-                if not tech_counts.empty:
-                    top_tech = tech_counts.index[0]
-                    suggestions.append(f"{top_tech} appears most frequently in job requirements. Ensure your portfolio highlights projects using this technology.")
+            top_techs = analytics.top_technologies(1)
+            if top_techs:
+                top_tech = top_techs[0][0]
+                suggestions.append(("technology", f"{top_tech} appears most frequently in job requirements. Ensure your portfolio highlights projects using this technology."))
             
             # 5. Response time analysis
-            if 'Response Time (hours)' in engagements_df.columns:
-                response_times = pd.to_numeric(engagements_df['Response Time (hours)'], errors='coerce')
-                if not response_times.empty and not response_times.isna().all():
-                    avg_response_time = response_times.mean()
-                    suggestions.append(f"Average response time is {avg_response_time:.1f} hours. Plan to follow up if no response within {max(48, 2*avg_response_time):.0f} hours.")
-            
-            # Display suggestions
-            self.console.print("\n[bold blue]===== STRATEGY OPTIMIZATION SUGGESTIONS =====[/bold blue]\n")
-            
-            if not suggestions:
-                self.console.print("[yellow]Not enough data yet to make optimization suggestions. Continue collecting more engagement data.[/yellow]")
-                return True
+            avg_response_time = analytics.average_response_time()
+            if avg_response_time is not None:
+                suggestions.append(("response_time", f"Average response time is {avg_response_time:.1f} hours. Plan to follow up if no response within {max(48, 2*avg_response_time):.0f} hours."))
             
-            for i, suggestion in enumerate(suggestions, 1):
-                self.console.print(f"[bold]{i}.[/bold] {suggestion}")
+            # 6. Search query effectiveness (only queries run more than once)
+            best_queries = self.best_queries(1, min_runs=2)
+            if best_queries:
+                best_query = best_queries[0]
+                suggestions.append(("search_query", f"Your most effective search is '{best_query['query']}' on {best_query['platform']} (rated {best_query['average_rating']:.1f} on average over {best_query['runs']} runs). Reuse it and try variations of it on other platforms."))
             
-            return True
+            report = Report("suggestions", "STRATEGY OPTIMIZATION SUGGESTIONS")
+            report.add_table("suggestions", ["number", "category", "suggestion"], [
+                {"number": i, "category": category, "suggestion": suggestion}
+                for i, (category, suggestion) in enumerate(suggestions, 1)
+            ])
+            return self._present(report, output, file, offset, limit, self._render_suggestions)
             
         except Exception as e:
             self.console.print(f"[bold red]Error generating optimization suggestions:[/bold red] {str(e)}")
             return False
-
-# Example usage
-if __name__ == "__main__":
-    tracker = InternshipSearchTracker()
     
-    # Add example data for demonstration
+    def _render_suggestions(self, report):
+        # Display suggestions
+        self.console.print(f"\n[bold blue]===== {report.title} =====[/bold blue]\n")
+        
+        suggestions = report.rows("suggestions")
+        if not suggestions:
+            self.console.print("[yellow]Not enough data yet to make optimization suggestions. Continue collecting more engagement data.[/yellow]")
+            return
+        
+        for row in suggestions:
+            self.console.print(f"[bold]{row['number']}.[/bold] {row['suggestion']}")
+
+def run_demo(tracker):
+    """Add example data for demonstration and print every report."""
     tracker.add_company({
         "Company Name": "Example Tech",
         "Industry": "Software",
@@ -550,5 +1108,206 @@ if __name__ == "__main__":
     
     # Generate reports
     tracker.get_upcoming_actions()
-    tracker.generate_analytics()
-    tracker.suggest_optimizations()
+    analytics = tracker.compute_analytics()
+    tracker.generate_analytics(analytics)
+    return tracker.suggest_optimizations(analytics)
+
+
+def _parse_fields(pairs):
+    """Turn repeated --field "Column=Value" options into a dict."""
+    fields = {}
+    for pair in pairs or []:
+        column, sep, value = pair.partition("=")
+        if not sep:
+            raise argparse.ArgumentTypeError(f"--field expects COLUMN=VALUE, got {pair!r}")
+        fields[column.strip()] = value
+    return fields
+
+
+def _record_from_args(args, options):
+    """Build a record dict from CLI options mapped to column names, plus any --field values."""
+    record = {column: getattr(args, dest) for dest, column in options.items() if getattr(args, dest) is not None}
+    record.update(_parse_fields(args.field))
+    return record
+
+
+# CLI option -> column name
+COMPANY_OPTIONS = {
+    "name": "Company Name",
+    "industry": "Industry",
+    "technologies": "Technologies",
+    "size": "Company Size",
+    "url": "Job Posting URL",
+    "status": "Contact Status",
+    "notes": "Notes"
+}
+
+ENGAGEMENT_OPTIONS = {
+    "contact": "Contact Name",
+    "company": "Company",
+    "platform": "Platform",
+    "type": "Engagement Type",
+    "position": "Position",
+    "date": "Date",
+    "content": "Content Sent",
+    "next_action": "Next Action",
+    "next_action_date": "Next Action Date",
+    "status": "Status",
+    "notes": "Notes"
+}
+
+
+def build_parser():
+    """Build the command line parser."""
+    parser = argparse.ArgumentParser(description="Track and analyze internship search activities.")
+    parser.add_argument("--data-dir", default="data", help="Directory holding the tracking data (default: data)")
+    parser.add_argument("--backend", default="csv", choices=["csv", "sqlite"], help="Storage backend (default: csv)")
+    parser.add_argument("--metrics", nargs="?", const="-", metavar="FILE",
+                        help="Report timings and I/O counters after the command, as JSON if FILE is given")
+    parser.add_argument("--profile", action="store_true", help="Profile the command with cProfile (implies --metrics)")
+    parser.add_argument("--trace-memory", action="store_true", help="Measure peak memory with tracemalloc (implies --metrics)")
+    parser.add_argument("--snapshot", action="store_true",
+                        help="Keep a memory-mapped columnar snapshot for the analytics (CSV backend)")
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+    
+    field_help = 'Any other column, as "Column Name=value" (repeatable)'
+    
+    command = commands.add_parser("add-company", help="Add a company to track")
+    command.add_argument("--name", required=True, help="Company name")
+    command.add_argument("--industry", required=True)
+    command.add_argument("--technologies", required=True, help='Comma-separated, e.g. "Python, AWS"')
+    command.add_argument("--size")
+    command.add_argument("--url", help="Job posting URL")
+    command.add_argument("--status", help="Contact status")
+    command.add_argument("--notes")
+    command.add_argument("--field", action="append", help=field_help)
+    
+    command = commands.add_parser("add-engagement", help="Log an engagement with a contact")
+    command.add_argument("--contact", required=True, help="Contact name")
+    command.add_argument("--company", required=True)
+    command.add_argument("--platform", required=True, help="e.g. LinkedIn, Email")
+    command.add_argument("--type", required=True, help="Engagement type, e.g. Comment")
+    command.add_argument("--position")
+    command.add_argument("--date", help="Engagement date (default: today)")
+    command.add_argument("--content", help="Content sent")
+    command.add_argument("--next-action")
+    command.add_argument("--next-action-date", help="YYYY-MM-DD")
+    command.add_argument("--status")
+    command.add_argument("--notes")
+    command.add_argument("--field", action="append", help=field_help)
+    
+    command = commands.add_parser("update-status", help="Update the contact status of a company")
+    command.add_argument("company", help="Company name")
+    command.add_argument("status", help="New status")
+    command.add_argument("--notes")
+    
+    # Output options shared by the report commands
+    report_options = argparse.ArgumentParser(add_help=False)
+    report_options.add_argument("--format", default="rich", choices=OUTPUT_FORMATS,
+                                help="rich tables, or rows streamed as JSON Lines or CSV (default: rich)")
+    report_options.add_argument("--offset", type=int, default=0, help="Skip this many rows of each table")
+    report_options.add_argument("--limit", type=int, help="Show at most this many rows of each table")
+    
+    command = commands.add_parser("upcoming", help="Show upcoming actions", parents=[report_options])
+    command.add_argument("--days", type=int, default=7, help="Number of days to look ahead (default: 7)")
+    command.add_argument("--start", help="First day of the window, YYYY-MM-DD (default: today)")
+    command.add_argument("--end", help="Last day of the window, YYYY-MM-DD (default: start + days)")
+    command.add_argument("--overdue", action="store_true", help="Show actions dated before today instead")
+    
+    command = commands.add_parser("technologies", help="Show the top technologies, or the companies using some", parents=[report_options])
+    command.add_argument("names", nargs="*", metavar="TECHNOLOGY", help='e.g. Python AWS (any spelling or alias)')
+    command.add_argument("--any", action="store_true", help="Match companies using any of the technologies instead of all")
+    command.add_argument("--top", type=int, default=10, help="Number of technologies to show (default: 10)")
+    
+    command = commands.add_parser("queries", help="Rank search queries by effectiveness", parents=[report_options])
+    command.add_argument("--top", type=int, default=10, help="Number of queries to show (default: 10)")
+    command.add_argument("--platform", help="Only queries run on this platform")
+    command.add_argument("--by", default="rating", choices=["rating", "results", "runs"], help="Ranking (default: rating)")
+    command.add_argument("--min-runs", type=int, default=1, help="Ignore queries run fewer times (default: 1)")
+    
+    command = commands.add_parser("entities", help="Show companies whose names are spelled several ways", parents=[report_options])
+    
+    command = commands.add_parser("enrich", help="Fill in contact details from the LinkedIn URLs on company rows")
+    provider = command.add_mutually_exclusive_group(required=True)
+    provider.add_argument("--provider-url", help="Profile service endpoint, queried as URL?url=<profile url>")
+    provider.add_argument("--mock", action="store_true", help="Use the offline mock provider")
+    command.add_argument("--concurrency", type=int, default=8, help="Maximum lookups in flight (default: 8)")
+    command.add_argument("--overwrite", action="store_true", help="Replace details that are already filled in")
+    
+    chunk_help = "Stream the data in chunks of this many rows to bound memory use"
+    command = commands.add_parser("analytics", help="Print analytics and generate charts", parents=[report_options])
+    command.add_argument("--chunksize", type=int, help=chunk_help)
+    command.add_argument("--charts", action=argparse.BooleanOptionalAction,
+                         help="Render the charts (default: only with rich output)")
+    command = commands.add_parser("suggest", help="Suggest strategy optimizations", parents=[report_options])
+    command.add_argument("--chunksize", type=int, help=chunk_help)
+    commands.add_parser("compact", help="Apply pending status and response updates to the tracking files")
+    commands.add_parser("demo", help="Add example data and print every report (default)")
+    return parser
+
+
+def main(argv=None):
+    """Run the command line interface.
+    
+    Returns:
+        int: Process exit code
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    
+    try:
+        if args.command == "add-company":
+            record = _record_from_args(args, COMPANY_OPTIONS)
+        elif args.command == "add-engagement":
+            record = _record_from_args(args, ENGAGEMENT_OPTIONS)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+    
+    if args.snapshot and args.backend != "csv":
+        parser.error("--snapshot requires the csv backend")
+    storage_options = {"snapshot": True} if args.snapshot else {}
+    tracker = InternshipSearchTracker(data_dir=args.data_dir, backend=args.backend, **storage_options)
+    report_metrics = args.metrics or args.profile or args.trace_memory
+    if report_metrics:
+        tracker.enable_metrics(profile="*" if args.profile else (), trace_memory="*" if args.trace_memory else ())
+    
+    if hasattr(args, "format"):
+        report = {"output": args.format, "offset": args.offset, "limit": args.limit}
+    
+    if args.command == "add-company":
+        ok = tracker.add_company(record)
+    elif args.command == "add-engagement":
+        ok = tracker.add_engagement(record)
+    elif args.command == "update-status":
+        ok = tracker.update_company_status(args.company, args.status, args.notes)
+    elif args.command == "upcoming":
+        ok = tracker.get_upcoming_actions(days=args.days, start=args.start, end=args.end, overdue=args.overdue, **report)
+    elif args.command == "technologies":
+        ok = tracker.show_technologies(args.names, match_all=not args.any, top=args.top, **report)
+    elif args.command == "queries":
+        ok = tracker.show_query_rankings(top=args.top, platform=args.platform, by=args.by, min_runs=args.min_runs, **report)
+    elif args.command == "entities":
+        ok = tracker.show_company_variants(limit=20 if args.limit is None else args.limit, output=args.format, offset=args.offset)
+    elif args.command == "enrich":
+        from tracker_enrichment import HttpProvider, MockProvider
+        if args.mock:
+            provider = MockProvider()
+        else:
+            provider = HttpProvider(args.provider_url, pool_size=args.concurrency)
+        ok = tracker.enrich_contacts(provider, concurrency=args.concurrency, overwrite=args.overwrite) is not None
+    elif args.command == "analytics":
+        ok = tracker.generate_analytics(chunksize=args.chunksize, charts=args.charts, **report)
+    elif args.command == "suggest":
+        ok = tracker.suggest_optimizations(chunksize=args.chunksize, **report)
+    elif args.command == "compact":
+        ok = tracker.compact()
+    else:
+        ok = run_demo(tracker)
+    
+    if report_metrics:
+        tracker.show_metrics(json_path=None if args.metrics in (None, "-") else args.metrics)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())